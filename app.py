@@ -10,13 +10,9 @@ import uuid
 from flask import Flask, jsonify, render_template, request
 
 from dubito.player import Player
-from dubito.handlers import GameHandler, generate_player_data
-from dubito.game_data import (
-    TurnOutput, TurnData,
-    GameStartEvent, CardsPlayedEvent, DoubtResolvedEvent, DiscardEvent, PlayerWonEvent,
-)
-from dubito.core_game import initialize
-import bots  # noqa: F401 — populates BotBase.registry
+from dubito.game_data import TurnOutput, TurnData
+from dubito.core_game import DubitoGame, initialize
+from dubito.observers import GameObserver
 from bots.base import BotBase
 
 app = Flask(__name__)
@@ -43,7 +39,87 @@ class HumanPlayer(Player):
     def add_cards(self, cards: list[int]) -> None:
         # Append in arrival order — no sorting, so the player sees exactly
         # which cards they just picked up.
-        self.cards.hand.extend(cards)
+        self.cards.hand = self.cards.hand + cards
+
+
+# ── Animation frames ──────────────────────────────────────────────────────────
+
+class FrameRecorder(GameObserver):
+    """Turns engine events into the animation frames consumed by the web UI."""
+
+    def __init__(self, session: "GameSession") -> None:
+        self.session = session
+        self.frames: list[dict] = []
+
+    def drain(self) -> list[dict]:
+        frames, self.frames = self.frames, []
+        for f in frames:
+            self.session.messages.append(f["msg"])
+        return frames
+
+    def _frame(self, msg: str, event_type: str, actor_id, target_id, **extra) -> None:
+        self.frames.append({
+            "msg":        msg,
+            "event_type": event_type,
+            "actor_id":   actor_id,
+            "target_id":  target_id,
+            **extra,
+            **self.session.snap(),
+        })
+
+    def on_turn(self, gh, player, turn_data, output) -> None:
+        if output.doubt:   # snapshot before the pile moves
+            lbl = self.session._lbl
+            you = isinstance(player, HumanPlayer)
+            prev = self.session.prev_player
+            self._frame(f"{'You doubt' if you else lbl(player) + ' doubts'} {lbl(prev)}!",
+                        "doubt", player.id, prev.id)
+
+    def on_play(self, gh, player, event) -> None:
+        lbl = self.session._lbl
+        n = event.n_cards
+        if isinstance(player, HumanPlayer):
+            msg = (f"You play {n} card(s) and declare {cln(event.declared_number)}s."
+                   if gh.n_cards_board() == n else
+                   f"You play {n} card(s) claiming {cln(event.declared_number)}s.")
+        else:
+            msg = (f"{lbl(player)} plays {n} card(s), declares {cln(event.declared_number)}s."
+                   if gh.n_cards_board() == n else
+                   f"{lbl(player)} plays {n} card(s) claiming {cln(event.declared_number)}s.")
+        self._frame(msg, "play", player.id, None)
+
+    def on_doubt(self, gh, doubter, target, event) -> None:
+        lbl = self.session._lbl
+        revealed = ', '.join(cn(c) for c in event.latest_cards)
+        n = len(event.board_cards)
+        if event.jokers_discarded:
+            takes = "take" if isinstance(doubter, HumanPlayer) else "takes"
+            self._frame(
+                f"Joker! {lbl(target)} played [{revealed}] — protected. "
+                f"{lbl(doubter)} {takes} {n} card(s).",
+                "joker", doubter.id, doubter.id, revealed_cards=event.latest_cards)
+        elif not event.correct:
+            self._frame(
+                f"{lbl(target)} was honest — played [{revealed}]. "
+                f"{lbl(doubter)} takes {n} card(s). Ouch.",
+                "take_honest", doubter.id, doubter.id, revealed_cards=event.latest_cards)
+        else:
+            self._frame(
+                f"{lbl(target)} was bluffing — actually played [{revealed}]. "
+                f"They take {n} card(s). Free turn for {lbl(doubter)}!",
+                "take_bluff", doubter.id, target.id, revealed_cards=event.latest_cards)
+
+    def on_discard(self, gh, player, event) -> None:
+        self._frame(f"{self.session._lbl(player)} discards four {cn(event.card_number)}s.",
+                    "discard", player.id, player.id)
+
+    def on_win(self, gh, player, event) -> None:
+        lbl = self.session._lbl
+        self._frame(f"{lbl(player)} wins!", "win", player.id, player.id)
+        if gh.n_playing_players() == 2:
+            losers = gh.playing_players()
+            self._frame(f"Game over — {lbl(losers[0])} and {lbl(losers[1])} lose!",
+                        "game_over", None, None)
 
 
 # ── In-memory session store ───────────────────────────────────────────────────
@@ -58,18 +134,22 @@ class GameSession:
 
     def __init__(self, all_players: list[Player], show_names: bool) -> None:
         self.id           = str(uuid.uuid4())[:8]
-        self.gh           = GameHandler(all_players=all_players, deck_size=14)
+        self.recorder     = FrameRecorder(self)
+        self.game         = DubitoGame(all_players, deck_size=14, observers=[self.recorder])
+        self.gh           = self.game.game_handler
         self.human        = next(p for p in all_players if isinstance(p, HumanPlayer))
         self.all_players  = all_players
-        self.prev_player  = all_players[-1]
-        self.this_player  = all_players[0]
         self.show_names   = show_names
         self.messages: list[str] = []
-        self._correct_doubt = False
-        self.gh.append_event(GameStartEvent(
-            player_ids=[p.id for p in all_players],
-            initial_card_counts={p.id: len(p.cards) for p in all_players},
-        ))
+        self.result: dict | None = None      # dubito's game_result, once the game is over
+
+    @property
+    def prev_player(self) -> Player:
+        return self.game.prev_player or self.all_players[-1]
+
+    @property
+    def this_player(self) -> Player:
+        return self.game.this_player or self.all_players[0]
 
     # ── Label helpers ─────────────────────────────────────────────────────────
 
@@ -98,143 +178,6 @@ class GameSession:
             "human_hand":       list(self.human.cards.hand),
         }
 
-    # ── Output resolution ─────────────────────────────────────────────────────
-
-    def process_output(
-        self, output: TurnOutput, this_player: Player, prev_player: Player
-    ) -> tuple[list[dict], bool]:
-        """
-        Apply a TurnOutput to the game state.
-
-        Returns:
-            resolve_events: frame dicts for doubt resolution, discards, and wins.
-            correct_doubt:  True when the doubter was right (they earn a free turn).
-        """
-        gh = self.gh
-        resolve_events: list[dict] = []
-        correct_doubt = False
-
-        if output.doubt:
-            latest_cards  = list(gh.get_latest_played_cards())
-            board_snap    = list(gh.get_board())
-            declared_snap = gh.get_current_number()
-            revealed = ', '.join(cn(c) for c in latest_cards)
-            jokers = gh.jokers_in_latest()
-            takes = "take" if isinstance(this_player, HumanPlayer) else "takes"
-
-            if gh.is_honest() and jokers:
-                rest = [c for c in gh.get_board() if c != 0]
-                this_player.add_cards(rest)
-                gh.reset_board()
-                gh.append_event(DoubtResolvedEvent(
-                    doubter_id=this_player.id, target_id=prev_player.id, correct=False,
-                    latest_cards=latest_cards, board_cards=rest,
-                    declared_number=declared_snap, jokers_discarded=len(jokers),
-                ))
-                resolve_events.append({
-                    "msg": (
-                        f"Joker! {self._lbl(prev_player)} played [{revealed}] — protected. "
-                        f"{self._lbl(this_player)} {takes} {len(rest)} card(s)."
-                    ),
-                    "event_type": "joker",
-                    "actor_id":   this_player.id,
-                    "target_id":  this_player.id,
-                    "revealed_cards": latest_cards,
-                    **self.snap(),
-                })
-            elif gh.is_honest():
-                n = gh.n_cards_board()
-                this_player.add_cards(gh.get_board())
-                gh.reset_board()
-                gh.append_event(DoubtResolvedEvent(
-                    doubter_id=this_player.id, target_id=prev_player.id, correct=False,
-                    latest_cards=latest_cards, board_cards=board_snap,
-                    declared_number=declared_snap,
-                ))
-                resolve_events.append({
-                    "msg": (
-                        f"{self._lbl(prev_player)} was honest — played [{revealed}]. "
-                        f"{self._lbl(this_player)} takes {n} card(s). Ouch."
-                    ),
-                    "event_type": "take_honest",
-                    "actor_id":   this_player.id,
-                    "target_id":  this_player.id,
-                    "revealed_cards": latest_cards,
-                    **self.snap(),
-                })
-            else:
-                n = gh.n_cards_board()
-                correct_doubt = True
-                prev_player.add_cards(gh.get_board())
-                gh.reset_board()
-                gh.append_event(DoubtResolvedEvent(
-                    doubter_id=this_player.id, target_id=prev_player.id, correct=True,
-                    latest_cards=latest_cards, board_cards=board_snap,
-                    declared_number=declared_snap,
-                ))
-                resolve_events.append({
-                    "msg": (
-                        f"{self._lbl(prev_player)} was bluffing — actually played [{revealed}]. "
-                        f"They take {n} card(s). Free turn for {self._lbl(this_player)}!"
-                    ),
-                    "event_type": "take_bluff",
-                    "actor_id":   this_player.id,
-                    "target_id":  prev_player.id,
-                    "revealed_cards": latest_cards,
-                    **self.snap(),
-                })
-        else:
-            if gh.is_first_hand():
-                val = output.number or 1
-                if val == 0:
-                    pool = gh.board.availables or output.cards
-                    val = random.choice(pool)
-                gh.set_current_number(val)
-            gh.set_board_cards(output.cards)
-            gh.append_event(CardsPlayedEvent(
-                player_id=this_player.id,
-                declared_number=gh.get_current_number(),
-                n_cards=len(output.cards),
-            ))
-
-        # Discard phase
-        for p in gh.playing_players():
-            disc = p.discard_cards()
-            if disc:
-                gh.set_discarded_cards(disc)
-                for number in disc:
-                    gh.append_event(DiscardEvent(player_id=p.id, card_number=number))
-                    resolve_events.append({
-                        "msg":        f"{self._lbl(p)} discards four {cn(number)}s.",
-                        "event_type": "discard",
-                        "actor_id":   p.id,
-                        "target_id":  p.id,
-                        **self.snap(),
-                    })
-
-        # Win check
-        for winner in [p for p in gh.playing_players() if p.has_no_cards()]:
-            gh.set_winners(winner)
-            gh.append_event(PlayerWonEvent(player_id=winner.id, position=gh.n_winners_players()))
-            resolve_events.append({
-                "msg":        f"{self._lbl(winner)} wins!",
-                "event_type": "win",
-                "actor_id":   winner.id,
-                "target_id":  winner.id,
-                **self.snap(),
-            })
-        if gh.n_playing_players() == 2:
-            losers = gh.playing_players()
-            resolve_events.append({
-                "msg":        f"Game over — {self._lbl(losers[0])} and {self._lbl(losers[1])} lose!",
-                "event_type": "game_over",
-                "actor_id":   None,
-                "target_id":  None,
-                **self.snap(),
-            })
-
-        return resolve_events, correct_doubt
-
     # ── Bot auto-play ─────────────────────────────────────────────────────────
 
     def advance_bots(self) -> list[dict]:
@@ -242,120 +185,33 @@ class GameSession:
         Auto-play all consecutive bot turns until it's the human's turn (or game over).
         Returns animation frames, one per game event.
         """
-        gh = self.gh
-        all_frames: list[dict] = []
-
-        while True:
-            if gh.n_playing_players() <= 2 or gh.turn.counter >= 1000:
-                break
-
-            if self._correct_doubt:
-                self._correct_doubt = False
-            else:
-                self.prev_player, self.this_player = gh.next_turn()
-
-            this_player = self.this_player
+        game = self.game
+        while not game.is_over():
+            this_player, ip = game.next_turn()
             if isinstance(this_player, HumanPlayer):
                 break
-
-            ip = generate_player_data(gh)
-            is_first = gh.is_first_hand()
-            output = this_player.play(ip)
-
-            if output.doubt:
-                pre_snap = self.snap()
-                resolve_events, correct_doubt = self.process_output(output, this_player, self.prev_player)
-                doubt_msg = f"{self._lbl(this_player)} doubts {self._lbl(self.prev_player)}!"
-                self.messages.append(doubt_msg)
-                all_frames.append({
-                    "msg":        doubt_msg,
-                    "event_type": "doubt",
-                    "actor_id":   this_player.id,
-                    "target_id":  self.prev_player.id,
-                    **pre_snap,
-                })
-            else:
-                resolve_events, correct_doubt = self.process_output(output, this_player, self.prev_player)
-                play_msg = (
-                    f"{self._lbl(this_player)} plays {len(output.cards)} card(s), "
-                    f"declares {cln(output.number)}s."
-                    if is_first else
-                    f"{self._lbl(this_player)} plays {len(output.cards)} card(s) "
-                    f"claiming {cln(gh.board.number)}s."
-                )
-                self.messages.append(play_msg)
-                all_frames.append({
-                    "msg":        play_msg,
-                    "event_type": "play",
-                    "actor_id":   this_player.id,
-                    "target_id":  None,
-                    **self.snap(),
-                })
-
-            for e in resolve_events:
-                self.messages.append(e["msg"])
-                all_frames.append(e)
-
-            self._correct_doubt = correct_doubt
-
-        return all_frames
+            game.apply(this_player.play(ip))
+        if game.is_over() and self.result is None:
+            self.result, _ = game.finish()
+        return self.recorder.drain()
 
     # ── Human actions ─────────────────────────────────────────────────────────
 
     def play_cards(self, card_indices: list[int], number: int | None) -> list[dict]:
         """Execute a human play. Returns all animation frames."""
-        gh = self.gh
-        is_first = gh.is_first_hand()
-
-        cards = [self.human.cards.hand[i] for i in card_indices]
-        for i in sorted(card_indices, reverse=True):
-            self.human.cards.hand.pop(i)
+        cards = self.human.cards.pick_idx(card_indices)
 
-        if is_first:
-            play_msg = f"You play {len(cards)} card(s) and declare {cln(number)}s."
-            output = TurnOutput(doubt=False, number=number, cards=cards)
+        if self.gh.is_first_hand():
+            output = TurnOutput(doubt=False, number=number or 1, cards=cards)
         else:
-            play_msg = f"You play {len(cards)} card(s) claiming {cln(gh.board.number)}s."
             output = TurnOutput(doubt=False, number=None, cards=cards)
-
-        resolve_events, correct_doubt = self.process_output(output, self.human, self.prev_player)
-
-        self.messages.append(play_msg)
-        frames: list[dict] = [{
-            "msg":        play_msg,
-            "event_type": "play",
-            "actor_id":   self.human.id,
-            "target_id":  None,
-            **self.snap(),
-        }]
-        for e in resolve_events:
-            self.messages.append(e["msg"])
-            frames.append(e)
-
-        self._correct_doubt = correct_doubt
-        return frames + self.advance_bots()
+        self.game.apply(output)
+        return self.recorder.drain() + self.advance_bots()
 
     def call_doubt(self) -> list[dict]:
         """Execute a human doubt. Returns all animation frames."""
-        pre_snap  = self.snap()
-        doubt_msg = f"You doubt {self._lbl(self.prev_player)}!"
-        output    = TurnOutput(doubt=True, number=None, cards=None)
-        resolve_events, correct_doubt = self.process_output(output, self.human, self.prev_player)
-
-        self.messages.append(doubt_msg)
-        frames: list[dict] = [{
-            "msg":        doubt_msg,
-            "event_type": "doubt",
-            "actor_id":   self.human.id,
-            "target_id":  self.prev_player.id,
-            **pre_snap,
-        }]
-        for e in resolve_events:
-            self.messages.append(e["msg"])
-            frames.append(e)
-
-        self._correct_doubt = correct_doubt
-        return frames + self.advance_bots()
+        self.game.apply(TurnOutput(doubt=True, number=None, cards=None))
+        return self.recorder.drain() + self.advance_bots()
 
     # ── Serialization ─────────────────────────────────────────────────────────
 
@@ -364,7 +220,7 @@ class GameSession:
         gh      = self.gh
         playing = gh.playing_players()
         winners = gh.get_winners()
-        is_over = gh.n_playing_players() <= 2 or gh.turn.counter >= 1000
+        is_over = self.game.is_over()
 
         players_info = [
             {
@@ -407,7 +263,7 @@ class GameSession:
             "players":          players_info,
             "messages":         self.messages,
             "standings":        standings,
-            "timed_out":        gh.turn.counter >= 1000,
+            "timed_out":        self.result is not None and self.result["timeout"],
         }
 
 
@@ -1 +1,22 @@
-from bots import manual, llms  # noqa: F401 — populates BotBase.registry
+# Where every built-in bot lives. BotBase.registry imports a bot's module the first time
+# the bot is looked up, so `import bots` costs nothing and a run only pays for the bots it
+# plays. A new bot gets a line here (any BotBase subclass still registers itself when its
+# module is imported, listed or not).
+MANIFEST: dict[str, str] = {
+    'HonestBot':          'bots.manual.honest_bot',
+    'TrustingBot':        'bots.manual.trusting_bot',
+    'AlwaysBluffBot':     'bots.manual.always_bluff_bot',
+    'RandomBot':          'bots.manual.random_bot',
+    'AlwaysDoubtBot':     'bots.manual.always_doubt_bot',
+    'TacticalDoubtBot':   'bots.manual.tactical_doubt_bot',
+    'AdaptiveBot':        'bots.manual.adaptive_bot',
+    'SuspicionBot':       'bots.manual.suspicion_bot',
+    'BalancedBot':        'bots.manual.balanced_bot',
+    'RiskAwareBot':       'bots.manual.risk_aware_bot',
+    'ClaudeBot':          'bots.llms.claude',
+    'ChatGPTBot':         'bots.llms.chatgpt',
+    'ChatGPTThinkingBot': 'bots.llms.chatgpt_thinking',
+    'GeminiBot':          'bots.llms.gemini',
+    'ClaudeFableBot':     'bots.llms.claude_fable',
+    'MonteCarloBot':      'bots.search.monte_carlo',
+}
@@ -1,14 +1,63 @@
+import importlib
 from abc import abstractmethod
+from collections.abc import MutableMapping
+from bots import MANIFEST
 from dubito.player import PlayerAI
 from dubito.game_data import TurnData, TurnOutput
 
 
+class BotRegistry(MutableMapping):
+    """
+    Bot name → class. Classes register themselves when their module is imported; a name
+    from the manifest (bots/__init__.py) imports its module on first lookup. Iterating
+    the names imports nothing, while values() and items() import every listed bot.
+    """
+
+    def __init__(self, manifest: dict[str, str]) -> None:
+        self._manifest = dict(manifest)
+        self._classes: dict[str, type] = {}
+
+    def __getitem__(self, name: str) -> type:
+        if name not in self._classes and name in self._manifest:
+            importlib.import_module(self._manifest[name])
+        return self._classes[name]
+
+    def __setitem__(self, name: str, cls: type) -> None:
+        self._classes[name] = cls
+
+    def __delitem__(self, name: str) -> None:
+        if name not in self:
+            raise KeyError(name)
+        self._classes.pop(name, None)
+        self._manifest.pop(name, None)
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._classes or name in self._manifest
+
+    def __iter__(self):
+        yield from list(self._manifest)
+        yield from [name for name in self._classes if name not in self._manifest]
+
+    def __len__(self) -> int:
+        return len(self._manifest.keys() | self._classes.keys())
+
+    def copy(self) -> dict[str, type]:
+        return dict(self.items())
+
+
 class BotBase(PlayerAI):
-    registry: dict[str, type] = {}
+    registry = BotRegistry(MANIFEST)
 
-    def __init_subclass__(cls, **kwargs):
+    def __init_subclass__(cls, register: bool = True, **kwargs):
         super().__init_subclass__(**kwargs)
-        BotBase.registry[cls.__name__] = cls
+        if register:                    # sweep variants (experiments/sweep.py) stay out
+            BotBase.registry[cls.__name__] = cls
+
+    @classmethod
+    def preload(cls) -> None:
+        """Load the read-only resources every instance shares (a model, a table). Runs
+        that fork worker processes call it first, so the workers inherit one copy
+        instead of each loading its own (see RLBot)."""
 
     """
     Structured abstract base for all bots.
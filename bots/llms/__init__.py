@@ -1 +0,0 @@
-from bots.llms import claude, chatgpt, chatgpt_thinking, gemini, claude_fable
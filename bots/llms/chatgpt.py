@@ -12,6 +12,12 @@ class ChatGPTBot(BotBase):
     - Exploiting low-doubt opponents
     """
 
+    DOUBT_THRESHOLD = 0.72       # doubt when the estimated bluff rate reaches this...
+    THRESHOLD_STEP = 0.08        # ...raised per risk factor (big board, few cards left)
+    BLUFF_IF_ONE = 0.38          # bluff holding 1 matching card below this next-player doubt rate
+    BLUFF_IF_TWO = 0.22          # ... holding 2
+    CAUTIOUS_DOUBT = 0.65        # next-player doubt rate above which plays stay small
+
     def __init__(self, id: int) -> None:
         super().__init__(id)
 
@@ -117,13 +123,13 @@ class ChatGPTBot(BotBase):
         if prev_cards >= 15:
             bluff_rate += 0.08
 
-        threshold = 0.72
+        threshold = self.DOUBT_THRESHOLD
         if p.board_cards >= 10:
-            threshold += 0.08
+            threshold += self.THRESHOLD_STEP
         if p.board_cards >= 16:
-            threshold += 0.08
+            threshold += self.THRESHOLD_STEP
         if len(p.my_cards) <= 3:
-            threshold += 0.08
+            threshold += self.THRESHOLD_STEP
 
         return bluff_rate >= threshold
 
@@ -152,10 +158,10 @@ class ChatGPTBot(BotBase):
             return True
 
         if matching == 1:
-            return next_doubt < 0.38
+            return next_doubt < self.BLUFF_IF_ONE
 
         if matching == 2:
-            return next_doubt < 0.22
+            return next_doubt < self.BLUFF_IF_TWO
 
         return False
 
@@ -179,7 +185,7 @@ class ChatGPTBot(BotBase):
             return True
 
         next_doubt = self._next_doubt_rate(p)
-        if next_doubt >= 0.65:
+        if next_doubt >= self.CAUTIOUS_DOUBT:
             return False
 
         return True
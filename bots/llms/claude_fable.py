@@ -42,32 +42,6 @@ from dubito.game_data import (
 )
 
 
-# ── Tunable constants ──────────────────────────────────────────────────────────
-
-# Beta priors (pseudo-observations). Field averages: ~45% of doubted plays are
-# bluffs, ~30% of doubt opportunities are taken.
-BLUFF_PRIOR = (1.0, 1.2)        # (caught, verified-honest)
-DOUBT_PRIOR = (1.0, 2.3)        # (doubts, declined opportunities)
-
-# Context multipliers on the bluff prior (odds space).
-BLUFF_K_MULT = {1: 0.85, 2: 1.15, 3: 1.45}   # more cards claimed → more suspicious
-BLUFF_OPENER_MULT = 0.70                      # opener picked their own number
-WINNER_DUMP_BLUFF = 0.80                      # prior that a winning dump was a bluff
-
-# How much the next player's doubt rate reacts to my play size.
-DOUBT_K_REACT = {1: 0.85, 2: 1.10, 3: 1.45}
-
-# EV weights (rough "card units").
-REPLAY_BONUS = 1.9        # correct doubt → free opener (tempo + a safe dump)
-TEMPO_LOSS = 0.4          # wrong doubt → the player after me opens fresh
-REPLAY_GIFT = 0.8         # my caught bluff hands the next player a free opener
-REPUTATION_COST = 0.25    # each caught bluff makes adaptive opponents doubt me more
-JOKER_SPEND_COST = 0.7    # a joker kept is insurance for a forced-bluff emergency
-REACH3_BONUS = 2.8        # play leaves me at ≤3 cards → guaranteed win next turn
-REACH3_CONTESTED = 1.6    # ...but a rival is also at ≤3 and acts before me
-REACH4_BONUS = 0.6
-
-
 def _beta_rate(hits: int, misses: int, prior: tuple[float, float]) -> float:
     a, b = prior
     return (hits + a) / (hits + misses + a + b)
@@ -94,6 +68,31 @@ def _hyper_at_least(pop: int, succ: int, draws: int, needed: int) -> float:
 
 class ClaudeFableBot(BotBase):
 
+    # ── Tunable constants (class attributes, see experiments/sweep.py) ──────────
+
+    # Beta priors (pseudo-observations). Field averages: ~45% of doubted plays are
+    # bluffs, ~30% of doubt opportunities are taken.
+    BLUFF_PRIOR = (1.0, 1.2)        # (caught, verified-honest)
+    DOUBT_PRIOR = (1.0, 2.3)        # (doubts, declined opportunities)
+
+    # Context multipliers on the bluff prior (odds space).
+    BLUFF_K_MULT = {1: 0.85, 2: 1.15, 3: 1.45}   # more cards claimed → more suspicious
+    BLUFF_OPENER_MULT = 0.70                      # opener picked their own number
+    WINNER_DUMP_BLUFF = 0.80                      # prior that a winning dump was a bluff
+
+    # How much the next player's doubt rate reacts to my play size.
+    DOUBT_K_REACT = {1: 0.85, 2: 1.10, 3: 1.45}
+
+    # EV weights (rough "card units").
+    REPLAY_BONUS = 1.9        # correct doubt → free opener (tempo + a safe dump)
+    TEMPO_LOSS = 0.4          # wrong doubt → the player after me opens fresh
+    REPLAY_GIFT = 0.8         # my caught bluff hands the next player a free opener
+    REPUTATION_COST = 0.25    # each caught bluff makes adaptive opponents doubt me more
+    JOKER_SPEND_COST = 0.7    # a joker kept is insurance for a forced-bluff emergency
+    REACH3_BONUS = 2.8        # play leaves me at ≤3 cards → guaranteed win next turn
+    REACH3_CONTESTED = 1.6    # ...but a rival is also at ≤3 and acts before me
+    REACH4_BONUS = 0.6
+
     def __init__(self, id: int) -> None:
         super().__init__(id)
         self._reset_tracking()
@@ -166,11 +165,11 @@ class ClaudeFableBot(BotBase):
 
     def _bluff_rate(self, pid: int) -> float:
         caught, honest = self._bluff.get(pid, (0, 0))
-        return _beta_rate(caught, honest, BLUFF_PRIOR)
+        return _beta_rate(caught, honest, self.BLUFF_PRIOR)
 
     def _doubt_rate(self, pid: int) -> float:
         doubts, declined = self._doubtc.get(pid, (0, 0))
-        return _beta_rate(doubts, declined, DOUBT_PRIOR)
+        return _beta_rate(doubts, declined, self.DOUBT_PRIOR)
 
     def _claim_feasibility(self, p: TurnData, target_id: int, target_hand_now: int,
                            number: int, n_claimed: int) -> float:
@@ -206,16 +205,16 @@ class ClaudeFableBot(BotBase):
         play = self._last_play
         attributed = play is not None and play.player_id == p.prev_player_id
         if attributed:
-            prior = self._bluff_rate(p.prev_player_id) * BLUFF_K_MULT.get(p.n_cards_played, 1.0)
+            prior = self._bluff_rate(p.prev_player_id) * self.BLUFF_K_MULT.get(p.n_cards_played, 1.0)
             if p.n_cards_played == p.board_cards:      # they opened and chose the number
-                prior *= BLUFF_OPENER_MULT
+                prior *= self.BLUFF_OPENER_MULT
             hand_now = p.player_card_counts.get(p.prev_player_id, 1)
             target = p.prev_player_id
         else:
             # The last play was a winning dump (its player already left the game). The
             # engine resolves a doubt here against those cards, but charges an innocent
             # player — for us, only P(that dump was a bluff) matters.
-            prior = WINNER_DUMP_BLUFF
+            prior = self.WINNER_DUMP_BLUFF
             hand_now = 0
             target = play.player_id if play is not None else p.prev_player_id
         prior = min(max(prior, 0.02), 0.98)
@@ -252,9 +251,9 @@ class ClaudeFableBot(BotBase):
             rivals_close = any(
                 c <= 3 for pid, c in p.player_card_counts.items() if pid != self.id
             )
-            return REACH3_CONTESTED if rivals_close else REACH3_BONUS
+            return self.REACH3_CONTESTED if rivals_close else self.REACH3_BONUS
         if n_after == 4:
-            return REACH4_BONUS
+            return self.REACH4_BONUS
         return 0.0
 
     def _doubt_ev(self, p: TurnData) -> float:
@@ -262,8 +261,8 @@ class ClaudeFableBot(BotBase):
         pile = p.board_cards
         opp_relief = 1.0 / max(2, p.n_players - 1)
         prev_count = p.player_card_counts.get(p.prev_player_id, 8)
-        gain = pile * opp_relief * self._threat_mult(prev_count) + REPLAY_BONUS
-        loss = pile * self._me_eat_factor() + TEMPO_LOSS
+        gain = pile * opp_relief * self._threat_mult(prev_count) + self.REPLAY_BONUS
+        loss = pile * self._me_eat_factor() + self.TEMPO_LOSS
         return p_b * gain - (1.0 - p_b) * loss
 
     # ── Play candidates ────────────────────────────────────────────────────────
@@ -294,12 +293,12 @@ class ClaudeFableBot(BotBase):
             ev = k + self._reach_bonus(p, n_after)
             ev += d_base * (p.board_cards + k) * opp_relief * 0.6   # their wrong doubt feeds them
             if spends_joker and n_after > 3:
-                ev -= JOKER_SPEND_COST
+                ev -= self.JOKER_SPEND_COST
             return ev
         my_rep = self._my_caught * 0.07
-        d_k = min(0.97, max(0.02, d_base * DOUBT_K_REACT.get(k, 1.0) + my_rep))
+        d_k = min(0.97, max(0.02, d_base * self.DOUBT_K_REACT.get(k, 1.0) + my_rep))
         win_part = k + self._reach_bonus(p, n_after)
-        lose_part = (p.board_cards + k) * self._me_eat_factor() + REPLAY_GIFT + REPUTATION_COST
+        lose_part = (p.board_cards + k) * self._me_eat_factor() + self.REPLAY_GIFT + self.REPUTATION_COST
         return (1.0 - d_k) * win_part - d_k * lose_part
 
     def _emit(self, p: TurnData, cards: list[int], number: int | None) -> TurnOutput:
@@ -1,12 +0,0 @@
-from bots.manual import (
-    honest_bot,
-    trusting_bot,
-    always_bluff_bot,
-    random_bot,
-    always_doubt_bot,
-    tactical_doubt_bot,
-    adaptive_bot,
-    suspicion_bot,
-    balanced_bot,
-    risk_aware_bot,
-)
@@ -12,6 +12,13 @@ class AdaptiveBot(BotBase):
 
     def __init__(self, id: int) -> None:
         super().__init__(id)
+        self._reset_estimates()
+
+    def reset(self) -> None:
+        super().reset()
+        self._reset_estimates()
+
+    def _reset_estimates(self) -> None:
         self.prev_honesty_prob = 0.5  # higher → prev tends to be honest
         self.next_doubt_prob = 0.5    # higher → next tends to doubt a lot
 
@@ -11,10 +11,18 @@ class RiskAwareBot(BotBase):
     Risk is computed from board state and the next player's card count.
     """
 
+    FIRST_HAND_SCALE = 30    # first hand: risk = 1 − next_cards² / scale
+    BOARD_SCALE = 40         # regular turn: risk = board_cards² / scale
+    MAX_RISK = 0.99
+
     def __init__(self, id: int) -> None:
         super().__init__(id)
         self.risk = 0.01
 
+    def reset(self) -> None:
+        super().reset()
+        self.risk = 0.01
+
     def play(self, input_player: TurnData) -> dict:
         self._update_risk(input_player, first_turn=self.is_first_turn(input_player))
         return super().play(input_player)
@@ -36,6 +44,6 @@ class RiskAwareBot(BotBase):
                 self.risk = 1.0
             else:
                 next_cards = p.player_card_counts.get(p.next_player_id, 0)
-                self.risk = max(0, min(0.99, -(1 / 30) * next_cards ** 2 + 1))
+                self.risk = max(0, min(self.MAX_RISK, -(1 / self.FIRST_HAND_SCALE) * next_cards ** 2 + 1))
         else:
-            self.risk = max(0, min(0.99, (1 / 40) * p.board_cards ** 2))
+            self.risk = max(0, min(self.MAX_RISK, (1 / self.BOARD_SCALE) * p.board_cards ** 2))
@@ -0,0 +1,103 @@
+"""
+Vectorized versions of the stateless manual bots, for the lockstep engine (dubito/lockstep.py).
+
+Each class restates one bot's A–E hooks over a batch of games (see VectorRules), with
+random.random() and random.choice([True, False]) replaced by Turns.random() and
+Turns.coin(). Keep them in step with the bot they mirror: experiments.runner.play_lockstep
+only accepts bots listed in RULES.
+"""
+import numpy as np
+
+from dubito.lockstep import Turns, VectorRules
+
+
+class HonestRules(VectorRules):
+    def bluff_first_hand(self, t: Turns):    return False
+    def maximize_first_hand(self, t: Turns): return True
+    def should_doubt(self, t: Turns):        return ~t.can_play_truthfully()
+    def bluff_regular(self, t: Turns):       return False
+    def maximize_regular(self, t: Turns):    return True
+
+
+class AlwaysBluffRules(VectorRules):
+    def bluff_first_hand(self, t: Turns):    return True
+    def maximize_first_hand(self, t: Turns): return True
+    def should_doubt(self, t: Turns):        return False
+    def bluff_regular(self, t: Turns):       return True
+    def maximize_regular(self, t: Turns):    return True
+
+
+class AlwaysDoubtRules(VectorRules):
+    def bluff_first_hand(self, t: Turns):    return t.coin()
+    def maximize_first_hand(self, t: Turns): return True
+    def should_doubt(self, t: Turns):        return True
+    def bluff_regular(self, t: Turns):       return True
+    def maximize_regular(self, t: Turns):    return True
+
+
+class TrustingRules(VectorRules):
+    def bluff_first_hand(self, t: Turns):    return False
+    def maximize_first_hand(self, t: Turns): return True
+    def should_doubt(self, t: Turns):        return False
+    def bluff_regular(self, t: Turns):       return False
+    def maximize_regular(self, t: Turns):    return True
+
+
+class RandomRules(VectorRules):
+    def bluff_first_hand(self, t: Turns):    return t.coin()
+    def maximize_first_hand(self, t: Turns): return False
+
+    def should_doubt(self, t: Turns):
+        return np.where(t.can_play_truthfully(), t.random() < 1 / 3, t.coin())
+
+    def bluff_regular(self, t: Turns):       return t.coin()
+    def maximize_regular(self, t: Turns):    return False
+
+
+class TacticalDoubtRules(VectorRules):
+    def bluff_first_hand(self, t: Turns):    return t.coin()
+    def maximize_first_hand(self, t: Turns): return True
+
+    def should_doubt(self, t: Turns):
+        return t.prev_player_started_turn() | (t.n_cards_played == 3)
+
+    def bluff_regular(self, t: Turns):       return t.coin()
+    def maximize_regular(self, t: Turns):    return True
+
+
+class RiskAwareRules(VectorRules):
+    """RiskAwareBot recomputes its risk at the start of every play(), so the hooks can
+    recompute it from the same fields."""
+
+    def _first_hand_risk(self, t: Turns) -> np.ndarray:
+        risk = np.clip(1 - t.next_cards ** 2 / self.bot.FIRST_HAND_SCALE, 0, self.bot.MAX_RISK)
+        return np.where(t.all_equal(), 1.0, risk)
+
+    def _risk(self, t: Turns) -> np.ndarray:
+        return np.clip(t.board_cards.astype(float) ** 2 / self.bot.BOARD_SCALE, 0, self.bot.MAX_RISK)
+
+    def bluff_first_hand(self, t: Turns):    return t.random() < self._first_hand_risk(t)
+    def maximize_first_hand(self, t: Turns): return True
+
+    def should_doubt(self, t: Turns):
+        return (t.prev_cards == 0) | ((t.random() >= self._risk(t)) & ~t.can_play_truthfully())
+
+    def bluff_regular(self, t: Turns):       return t.random() < self._risk(t)
+    def maximize_regular(self, t: Turns):    return True
+
+
+RULES: dict[str, type[VectorRules]] = {
+    'HonestBot': HonestRules,
+    'AlwaysBluffBot': AlwaysBluffRules,
+    'AlwaysDoubtBot': AlwaysDoubtRules,
+    'TrustingBot': TrustingRules,
+    'RandomBot': RandomRules,
+    'TacticalDoubtBot': TacticalDoubtRules,
+    'RiskAwareBot': RiskAwareRules,
+}
+
+
+def rules_for(bot: type) -> VectorRules | None:
+    """The lockstep rules of a registry bot, or None if it has none."""
+    rules = RULES.get(bot.__name__)
+    return None if rules is None else rules(bot)
@@ -0,0 +1,2 @@
+# Search bots spend CPU per decision: they only play when listed explicitly.
+SEARCH_BOTS = {'MonteCarloBot'}
@@ -0,0 +1,87 @@
+"""
+Build an OpeningBook from simulated games.
+
+Games are dealt and played on GameState by the fast rollout policy. At every first-hand
+decision each abstract opener available to the player to move is applied and rolled out
+`--rollouts` times; the mean score (1 hard win, 0.5 soft win, 0 loss) is recorded under
+the position's features. The game then continues with the policy's own move.
+
+    python -m bots.search.build_opening_book --games 5000 --rollouts 4 --workers 4 --out opening_book.json
+
+Running again with the same --out keeps refining the existing book.
+"""
+import argparse
+import random
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+
+from dubito.game_data import TurnOutput
+from dubito.state import GameState
+
+from .opening_book import OpeningBook, features, openers, realize, key
+from .rollout import heuristic_policy, rollout
+
+
+def simulate_openers(n_games: int, rollouts: int, seats: list[int], seed: int) -> dict:
+    """Play `n_games` and return {features: {opener key: [total score, samples]}}."""
+    rng = random.Random(seed)
+    random.seed(seed)   # GameState.deal draws from the module RNG
+    sums: dict[str, dict[str, list]] = {}
+    for _ in range(n_games):
+        state = GameState.deal(rng.choice(seats))
+        while not state.is_over():
+            seat = state.this
+            if state.board_n == 0 and state.sizes[seat] > 3:
+                hand = state.hands[seat]
+                counts = Counter({n: c for n, c in enumerate(hand) if c})
+                feats = features(counts, len(state.playing), state.sizes[state.next])
+                for opener in openers(counts):
+                    concrete = realize(opener, counts, state.availables())
+                    if concrete is None:
+                        continue
+                    number, cards = concrete
+                    action = TurnOutput(doubt=False, number=number, cards=cards)
+                    cell = sums.setdefault(feats, {}).setdefault(key(opener), [0.0, 0])
+                    for _ in range(rollouts):
+                        child = state.clone()
+                        child.apply(action)
+                        cell[0] += rollout(child, seat, heuristic_policy, rng)
+                        cell[1] += 1
+            state.apply(heuristic_policy(state, rng))
+    return sums
+
+
+def build(book: OpeningBook, n_games: int, rollouts: int, seats: list[int],
+          workers: int = 1, seed: int = 0) -> OpeningBook:
+    shards = max(1, workers)
+    per_shard = [n_games // shards + (i < n_games % shards) for i in range(shards)]
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(simulate_openers, per_shard, [rollouts] * shards,
+                                    [seats] * shards, [seed + i for i in range(shards)]))
+    else:
+        results = [simulate_openers(per_shard[0], rollouts, seats, seed)]
+    for sums in results:
+        for feats, cells in sums.items():
+            for opener, (total, n) in cells.items():
+                book.record(feats, opener, total, n)
+    book.finalize()
+    return book
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Simulate openers and store the best per position type.')
+    parser.add_argument('--games', type=int, default=1_000)
+    parser.add_argument('--rollouts', type=int, default=4, help='rollouts per opener per decision')
+    parser.add_argument('--players', type=int, nargs='+', default=[3, 4, 5, 6, 7])
+    parser.add_argument('--workers', type=int, default=1)
+    parser.add_argument('--min-samples', type=int, default=20)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--out', default='opening_book.json')
+    args = parser.parse_args()
+
+    book = OpeningBook.load(args.out, min_samples=args.min_samples)
+    build(book, args.games, args.rollouts, args.players, args.workers, args.seed)
+    book.save(args.out)
+    confident = sum(e['best'] is not None for e in book.entries.values())
+    print(f'{len(book.entries):,} position types, {confident:,} with a confident opener ({args.out})')
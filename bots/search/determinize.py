@@ -0,0 +1,201 @@
+"""
+Determinization — turning one seat's view of the table into full GameStates.
+
+A search bot sees its own hand, every card count, the declared number and the public
+event log. Everything else is hidden, but heavily constrained:
+
+    - pile pickups are public (DoubtResolvedEvent.board_cards): whoever lost the doubt
+      certainly holds those cards until they play some face-down;
+    - discards are public: four of that number are gone for good, jokers revealed in a
+      doubt are discarded too;
+    - the seat knows its own contributions to the current pile.
+
+CardTracker folds the log into those constraints incrementally; sample() deals the
+remaining unseen cards into a GameState that agrees with everything the seat knows.
+"""
+from __future__ import annotations
+import random
+from collections import Counter
+
+from dubito.game_data import (
+    TurnData, GameStartEvent, CardsPlayedEvent, DoubtResolvedEvent, DiscardEvent, PlayerWonEvent,
+)
+from dubito.state import GameState, N_NUMBERS, _counts
+
+BLUFF_PRIOR = (1.0, 1.2)     # (caught, verified honest) pseudo-observations
+WINNER_DUMP_BLUFF = 0.8      # a winning dump is usually whatever was left in hand
+MAX_REDEALS = 20             # retries to avoid dealing an opponent four of a kind
+
+
+class CardTracker:
+
+    def __init__(self, my_id: int) -> None:
+        self.my_id = my_id
+        self.reset()
+
+    def reset(self) -> None:
+        self._idx = 0                              # history events already ingested
+        self.seats: list[int] = []                 # player ids in turn order
+        self.n_jokers = 0                          # jokers dealt at the start
+        self.turns = 0
+        self.winners: list[int] = []
+        self.known: dict[int, Counter] = {}        # pid → cards they certainly hold
+        self.gone = Counter()                      # number → copies permanently discarded
+        self.my_pile = Counter()                   # my cards currently in the pile
+        self.bluffs: dict[int, list[int]] = {}     # pid → [caught, verified honest]
+        self.last_play: CardsPlayedEvent | None = None
+
+    # ── Log ingestion ─────────────────────────────────────────────────────────
+
+    def ingest(self, history: list) -> None:
+        if self._idx > len(history):   # new game, instance reused without reset
+            self.reset()
+        for e in history[self._idx:]:
+            if isinstance(e, GameStartEvent):
+                self.reset()
+                self.seats = list(e.player_ids)
+                self.n_jokers = max(0, sum(e.initial_card_counts.values()) - 4 * (N_NUMBERS - 1))
+            elif isinstance(e, CardsPlayedEvent):
+                self.turns += 1
+                self.last_play = e
+                k = self.known.get(e.player_id)
+                if k:
+                    for num in list(k):
+                        k[num] -= e.n_cards
+                        if k[num] <= 0:
+                            del k[num]
+            elif isinstance(e, DoubtResolvedEvent):
+                self.turns += 0 if e.correct else 1   # a correct doubt is replayed, not a new turn
+                if self.last_play is not None and self.last_play.player_id == e.target_id:
+                    self.bluffs.setdefault(e.target_id, [0, 0])[0 if e.correct else 1] += 1
+                loser = e.loser_id
+                if loser != self.my_id:
+                    self.known.setdefault(loser, Counter()).update(e.board_cards)
+                self.gone[0] += e.jokers_discarded
+                self.my_pile.clear()
+                self.last_play = None
+            elif isinstance(e, DiscardEvent):
+                self.gone[e.card_number] = 4
+                for k in self.known.values():
+                    k.pop(e.card_number, None)
+            elif isinstance(e, PlayerWonEvent):
+                self.winners.append(e.player_id)
+        self._idx = len(history)
+
+    def record_play(self, cards: list[int]) -> None:
+        """Remember my own face-down contribution to the pile."""
+        self.my_pile.update(cards)
+
+    def bluff_rate(self, pid: int) -> float:
+        caught, honest = self.bluffs.get(pid, (0, 0))
+        a, b = BLUFF_PRIOR
+        return (caught + a) / (caught + honest + a + b)
+
+    # ── Sampling ──────────────────────────────────────────────────────────────
+
+    def unseen(self, p: TurnData) -> Counter:
+        """Cards whose exact location I do not know (opponents' hands + others' pile cards)."""
+        pool = Counter({n: 4 - self.gone[n] for n in range(1, N_NUMBERS) if self.gone[n] < 4})
+        pool[0] = self.n_jokers - self.gone[0]
+        pool.subtract(p.my_cards)
+        pool.subtract(self.my_pile)
+        return +pool
+
+    def sample(self, p: TurnData, rng: random.Random, horizon: int | None = None) -> GameState | None:
+        """
+        Deal one full GameState consistent with my view, positioned on my decision.
+
+        The previous play is dealt honest or bluffed according to the player's smoothed
+        bluff rate, so doubt rollouts face a realistic mix. Returns None when the log and
+        the table disagree (e.g. the bot joined mid-game), so callers can fall back.
+        """
+        pool = self.unseen(p)
+        opponents = [pid for pid in self.seats if pid in p.player_card_counts and pid != p.my_player_id]
+        pile_unknown = p.board_cards - sum(self.my_pile.values())
+        need = sum(p.player_card_counts[pid] for pid in opponents) + pile_unknown
+        if not self.seats or pile_unknown < 0 or sum(pool.values()) != need:
+            return None
+
+        for _ in range(MAX_REDEALS):
+            hands, pile = self._deal(p, pool.copy(), opponents, pile_unknown, rng)
+            if all(c < 4 for h in hands.values() for n, c in h.items() if n):
+                break
+        return self._build(p, hands, pile, horizon)
+
+    def _deal(self, p: TurnData, pool: Counter, opponents: list[int], pile_unknown: int,
+              rng: random.Random) -> tuple[dict[int, Counter], tuple[list[int], list[int]]]:
+        latest: list[int] = []
+        k = min(p.n_cards_played, pile_unknown)
+        if k:
+            latest = self._deal_latest(p, pool, k, rng)
+
+        hands = {pid: Counter() for pid in opponents}
+        for pid in opponents:
+            for num, c in self.known.get(pid, {}).items():
+                take = min(c, pool[num], p.player_card_counts[pid] - sum(hands[pid].values()))
+                if take > 0:
+                    hands[pid][num] += take
+                    pool[num] -= take
+
+        rest = list(pool.elements())
+        rng.shuffle(rest)
+        for pid in opponents:
+            missing = p.player_card_counts[pid] - sum(hands[pid].values())
+            hands[pid].update(rest[:missing])
+            rest = rest[missing:]
+        return hands, (latest, rest)
+
+    def _deal_latest(self, p: TurnData, pool: Counter, k: int, rng: random.Random) -> list[int]:
+        number = p.current_number
+        play = self.last_play
+        if play is not None and play.player_id == p.prev_player_id:
+            q = self.bluff_rate(p.prev_player_id)
+        else:
+            q = WINNER_DUMP_BLUFF
+        matching = [number] * pool[number] + [0] * pool[0]
+        others = [n for n in pool.elements() if n != number and n != 0]
+        if (rng.random() >= q or not others) and len(matching) >= k:
+            latest = rng.sample(matching, k)
+        else:
+            latest = [rng.choice(others)]
+            left = list((pool - Counter(latest)).elements())
+            latest += rng.sample(left, k - 1)
+        pool.subtract(latest)
+        return latest
+
+    def _build(self, p: TurnData, hands: dict[int, Counter], pile: tuple[list[int], list[int]],
+               horizon: int | None) -> GameState:
+        latest, rest = pile
+        ids = self.seats
+        seat = {pid: i for i, pid in enumerate(ids)}
+        state = GameState.__new__(GameState)
+        state.ids = tuple(ids)
+        state.hands = [[0] * N_NUMBERS for _ in ids]
+        state.sizes = [0] * len(ids)
+        for pid, cards in hands.items():
+            for num, c in cards.items():
+                state.hands[seat[pid]][num] = c
+            state.sizes[seat[pid]] = p.player_card_counts[pid]
+        me = seat[p.my_player_id]
+        state.hands[me] = _counts(p.my_cards)
+        state.sizes[me] = len(p.my_cards)
+        state.board = _counts(latest + rest + list(self.my_pile.elements()))
+        state.board_n = p.board_cards
+        state.latest = tuple(latest)
+        state.number = p.current_number
+        state.avail = sum(1 << n for n in p.playing_cards)
+        state.streak = p.streak
+        state.turn = self.turns + 1
+        state.playing = [seat[pid] for pid in ids if pid in p.player_card_counts]
+        state.winners = [seat[pid] for pid in self.winners]
+        state.pos = state.playing.index(me)
+        state.prev = seat[p.prev_player_id]
+        state.this = me
+        state.next = seat[p.next_player_id]
+        state.replay = False
+        state.max_turns = 1_000 if horizon is None else state.turn + horizon
+        state.stall_turns = float('inf')              # dubito() has no stall rule by default
+        state.progress_turn = state.turn               # the window restarts at the sample
+        state.stalled = False
+        state.history = None
+        return state
@@ -0,0 +1,203 @@
+"""
+EndgameSolver — perfect-information max^n search over 3-player GameStates.
+
+With three players left the game ends at the next win, so an endgame is a pure race:
+exactly one of the three escapes. The solver searches every line (each player picks
+the move that makes *them* the winner, the max^n rule) and memoizes the result in a
+transposition table, so once warm a lookup is a single dict access.
+
+Canonical encoding. Two positions share a table entry when they differ only by
+    - which seat is which: seats are rotated so the player to move comes first;
+    - which number is which: face values are interchangeable, so the per-number
+      columns (hand counts, pile count, copies in the last play, "is the declared
+      number") are sorted. Jokers keep their own column.
+Turn counter, streak and already-finished players do not affect who wins the race.
+
+Exactness. Search is cut by depth, by repetition (a position already on the current
+line — doubts hand the same cards back and forth) and by a node budget. A cut value is
+a hand-size heuristic, marked inexact; only exact results are written to the table:
+a node is exact when it has an exact winning move for the mover, or when every move
+was searched exactly. Ties between losing moves go to the first move in order, so
+"exact" means exact under that fixed tie-break.
+
+Scope. Openers only declare a number the mover holds (bluff openers still play any
+cards under it); declaring a number nobody holds is never better in perfect
+information and would multiply the branching by up to 13.
+
+    python -m bots.search.warm_endgame --positions 2000 --out endgame.pkl   # warm a table
+"""
+from __future__ import annotations
+import os
+import pickle
+
+from dubito.game_data import TurnOutput
+from dubito.state import GameState, N_NUMBERS, _multisets
+
+DOUBT = TurnOutput(doubt=True, number=None, cards=None)
+
+
+def canonical(state: GameState) -> tuple[tuple, list[int]]:
+    """Return (key, order): `order` lists the playing seats mover-first; table values
+    are indexes into it."""
+    playing = state.playing
+    i = playing.index(state.this)
+    order = playing[i:] + playing[:i]
+    hands = [state.hands[s] for s in order]
+    latest = state.latest
+    jokers = tuple(h[0] for h in hands) + (state.board[0], latest.count(0))
+    columns = sorted(
+        (tuple(h[n] for h in hands) + (state.board[n], latest.count(n), n == state.number)
+         for n in range(1, N_NUMBERS)
+         if state.board[n] or any(h[n] for h in hands)),
+        reverse=True,
+    )
+    prev = order.index(state.prev) if state.prev in order else -1
+    return (jokers, tuple(columns), prev), order
+
+
+class EndgameSolver:
+
+    def __init__(self, max_cards: int = 6, max_depth: int = 40, node_budget: int = 20_000) -> None:
+        """
+        Args:
+            max_cards (int): Largest hand any of the three players may hold for a position
+                to be in scope. Defaults to 6 — 7+ card races often exhaust the budget.
+            max_depth (int): Plies searched before a line is cut. Defaults to 40.
+            node_budget (int): Nodes expanded per solve() call before the rest is cut.
+                Defaults to 20_000 (a few seconds).
+        """
+        self.max_cards = max_cards
+        self.max_depth = max_depth
+        self.node_budget = node_budget
+        self.table: dict[tuple, int] = {}
+        self._nodes = 0
+
+    # ── Persistence ───────────────────────────────────────────────────────────
+
+    @classmethod
+    def load(cls, path: str, **kwargs) -> EndgameSolver:
+        """Solver backed by the table at `path` (empty if the file does not exist yet)."""
+        solver = cls(**kwargs)
+        if os.path.exists(path):
+            with open(path, 'rb') as f:
+                solver.table = pickle.load(f)
+        return solver
+
+    def save(self, path: str) -> None:
+        tmp = f'{path}.tmp'
+        with open(tmp, 'wb') as f:
+            pickle.dump(self.table, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, path)
+
+    # ── Queries ───────────────────────────────────────────────────────────────
+
+    def in_scope(self, state: GameState) -> bool:
+        return (len(state.playing) == 3
+                and all(state.sizes[s] <= self.max_cards for s in state.playing))
+
+    def lookup(self, state: GameState) -> int | None:
+        """Seat that wins the endgame with best play, if the table already knows. O(1)."""
+        if len(state.playing) != 3:
+            return None
+        key, order = canonical(state)
+        hit = self.table.get(key)
+        return None if hit is None else order[hit]
+
+    def solve(self, state: GameState) -> int | None:
+        """Search the position (filling the table) and return the winning seat, or None
+        when the position is out of scope or could not be solved exactly in budget."""
+        if not self.in_scope(state):
+            return None
+        hit = self.lookup(state)
+        if hit is not None:
+            return hit
+        self._nodes = 0
+        root = state.clone()
+        root.max_turns = float('inf')
+        root.stall_turns = float('inf')
+        values, exact = self._search(root, self.max_depth, set())
+        return max(root.playing, key=values.__getitem__) if exact else None
+
+    def best_action(self, state: GameState) -> TurnOutput | None:
+        """A move that wins the endgame for the player to move, if one exists."""
+        if self.solve(state) != state.this:
+            return None
+        for action in self._actions(state):
+            child = state.clone()
+            child.apply(action)
+            if self._winner(child) == state.this:
+                return action
+        return None
+
+    # ── Search ────────────────────────────────────────────────────────────────
+
+    def _winner(self, state: GameState) -> int | None:
+        if len(state.playing) < 3:
+            return state.winners[-1]
+        return self.lookup(state)
+
+    def _actions(self, state: GameState) -> list[TurnOutput]:
+        """Moves in search order: the hand dump, a doubt of a bluff, honest plays, the rest."""
+        seat = state.this
+        hand = state.hands[seat]
+        plays = [cards for k in range(min(3, state.sizes[seat]), 0, -1) for cards in _multisets(hand[:], k)]
+        if state.board_n == 0:
+            held = [n for n in range(1, N_NUMBERS) if hand[n]] or state.availables()[:1]
+            return sorted(
+                (TurnOutput(doubt=False, number=n, cards=cards) for cards in plays for n in held),
+                key=lambda a: not all(c in (0, a.number) for c in a.cards),
+            )
+        number = state.number
+        honest = [c for c in plays if all(x in (0, number) for x in c)]
+        bluffs = [c for c in plays if not all(x in (0, number) for x in c)]
+        actions = [TurnOutput(doubt=False, number=None, cards=c) for c in honest + bluffs]
+        doubt_pos = 0 if not state.is_honest() else len(actions)
+        actions.insert(doubt_pos, DOUBT)
+        return actions
+
+    def _heuristic(self, state: GameState) -> list[float]:
+        values = [0.0] * len(state.ids)
+        weights = {s: 1.0 / max(1, state.sizes[s]) for s in state.playing}
+        total = sum(weights.values())
+        for s, w in weights.items():
+            values[s] = w / total
+        return values
+
+    def _onehot(self, state: GameState, seat: int) -> list[float]:
+        values = [0.0] * len(state.ids)
+        values[seat] = 1.0
+        return values
+
+    def _search(self, state: GameState, depth: int, path: set) -> tuple[list[float], bool]:
+        if len(state.playing) < 3:
+            return self._onehot(state, state.winners[-1]), True
+        key, order = canonical(state)
+        hit = self.table.get(key)
+        if hit is not None:
+            return self._onehot(state, order[hit]), True
+        mover = state.this
+        if state.sizes[mover] <= 3:              # hand-emptying play: an immediate win
+            self.table[key] = 0
+            return self._onehot(state, mover), True
+        if depth == 0 or key in path or self._nodes >= self.node_budget:
+            return self._heuristic(state), False
+
+        self._nodes += 1
+        path.add(key)
+        best, all_exact, won = None, True, False
+        for action in self._actions(state):
+            child = state.clone()
+            child.apply(action)
+            values, exact = self._search(child, depth - 1, path)
+            all_exact &= exact
+            if best is None or values[mover] > best[mover]:
+                best = values
+            if exact and values[mover] == 1.0:
+                won = True
+                break
+        path.discard(key)
+
+        if won or all_exact:
+            self.table[key] = order.index(max(order, key=best.__getitem__))
+            return best, True
+        return best, False
@@ -0,0 +1,230 @@
+"""
+MonteCarloBot — determinized Monte Carlo search over the compact GameState engine.
+
+Every other bot scores at most one step ahead. This one looks to the end of the game:
+
+1. **Determinize.** A CardTracker (bots/search/determinize.py) folds the public log —
+   pile pickups, discards, card counts, my own pile contributions — into constraints
+   on the hidden cards, and deals the rest at random into a full GameState. The last
+   play is dealt honest or bluffed according to its author's smoothed bluff rate.
+
+2. **Candidates.** The same small action set ClaudeFableBot weighs: doubt, honest max,
+   honest + joker, a lone joker, and bluffs of 1–3 of the least useful cards. Openers
+   add one honest opener per number held.
+
+3. **Rollouts.** Each candidate is applied to each determinization and played out with
+   a fast default policy (bots/search/rollout.py). Score = 1 hard win, 0.5 soft win,
+   0 loss — the experiments' Score metric. Highest mean wins. With `endgame_table` set,
+   a rollout stops at the first 3-player endgame the solver's table has already solved
+   (bots/search/endgame.py) and takes the exact result. With `opening_book` set, openers
+   the book is confident about are played straight from it (bots/search/opening_book.py).
+
+Budget is per decision: `rollouts` determinizations (each evaluates every candidate),
+optionally capped by `time_budget` seconds. With `workers` > 1 the determinizations are
+batched across a shared ProcessPoolExecutor. The bot is excluded from the default
+experiment and RL pools (bots.search.SEARCH_BOTS) — add it to `bots:` explicitly.
+"""
+from __future__ import annotations
+import atexit
+import random
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+
+from bots.base import BotBase
+from dubito.game_data import TurnData, TurnOutput
+
+from .determinize import CardTracker
+from .opening_book import OpeningBook
+from .rollout import simulate
+
+
+_POOLS: dict[int, ProcessPoolExecutor] = {}
+_BOOKS: dict[str, OpeningBook] = {}
+
+
+def _pool(workers: int) -> ProcessPoolExecutor:
+    """One executor per worker count, shared by every MonteCarloBot in the process."""
+    if workers not in _POOLS:
+        _POOLS[workers] = ProcessPoolExecutor(max_workers=workers)
+    return _POOLS[workers]
+
+
+@atexit.register
+def _shutdown_pools() -> None:
+    for pool in _POOLS.values():
+        pool.shutdown(cancel_futures=True)
+    _POOLS.clear()
+
+
+class MonteCarloBot(BotBase):
+
+    rollouts: int = 200                 # determinizations per decision
+    time_budget: float | None = None    # seconds per decision; None = rollouts only
+    workers: int = 1                    # >1 batches rollouts across processes
+    batch_size: int = 25                # determinizations per worker task
+    rollout_policy: str = 'heuristic'   # key of bots.search.rollout.POLICIES
+    horizon: int = 400                  # rollout turn cap (remaining players lose)
+    endgame_table: str | None = None    # warmed EndgameSolver table (see bots/search/endgame.py)
+    opening_book: str | None = None     # OpeningBook JSON consulted before searching an opener
+
+    def __init__(self, id: int, rollouts: int | None = None, time_budget: float | None = None,
+                 workers: int | None = None, seed: int | None = None) -> None:
+        super().__init__(id)
+        if rollouts is not None:
+            self.rollouts = rollouts
+        if time_budget is not None:
+            self.time_budget = time_budget
+        if workers is not None:
+            self.workers = workers
+        self.rng = random.Random(seed)
+        self.tracker = CardTracker(id)
+
+    def reset(self) -> None:
+        super().reset()
+        self.tracker.reset()
+
+    # ── Candidates ────────────────────────────────────────────────────────────
+
+    def _trash(self, counts: Counter, protect: int) -> list[int]:
+        """Bluff material, least useful first: loose cards of mostly-gone numbers, then
+        bigger sets. Never jokers, never `protect`."""
+        gone = self.tracker.gone
+        order = sorted(
+            (n for n in counts if n != 0 and n != protect),
+            key=lambda n: (counts[n], -(gone[n] + counts[n])),
+        )
+        return [n for n in order for _ in range(counts[n])]
+
+    def candidates(self, p: TurnData) -> list[TurnOutput]:
+        counts = self.cards.count_all()
+        jokers = counts[0]
+        size = len(self.cards)
+        actions = []
+        if p.board_cards == 0:
+            numbers = sorted((n for n in counts if n != 0), key=lambda n: -counts[n])
+            for n in numbers:
+                actions.append(TurnOutput(doubt=False, number=n, cards=[n] * min(3, counts[n])))
+            if jokers and numbers and counts[numbers[0]] < 3:
+                best = numbers[0]
+                actions.append(TurnOutput(doubt=False, number=best, cards=[best] * counts[best] + [0]))
+            best = numbers[0] if numbers else self._any_number(p)
+            trash = self._trash(counts, best)
+        else:
+            best = p.current_number
+            trash = self._trash(counts, best)
+            actions.append(TurnOutput(doubt=True, number=None, cards=None))
+            c = counts[best]
+            if c:
+                actions.append(TurnOutput(doubt=False, number=None, cards=[best] * min(3, c)))
+                if jokers and c < 3:
+                    actions.append(TurnOutput(doubt=False, number=None, cards=[best] * c + [0]))
+            if jokers:
+                actions.append(TurnOutput(doubt=False, number=None, cards=[0]))
+        for k in (1, 2, 3):
+            if k <= len(trash) and k < size:
+                actions.append(TurnOutput(
+                    doubt=False, number=best if p.board_cards == 0 else None, cards=trash[:k],
+                ))
+        return actions
+
+    # ── Search ────────────────────────────────────────────────────────────────
+
+    def evaluate(self, p: TurnData, actions: list[TurnOutput]) -> list[float] | None:
+        """Mean rollout score of each action, or None when no determinization exists or
+        no rollout ran. The first batch always runs, whatever the time budget."""
+        deadline = None if self.time_budget is None else time.perf_counter() + self.time_budget
+        totals = [0.0] * len(actions)
+        done = 0
+
+        def batch(n: int) -> list | None:
+            deals = [self.tracker.sample(p, self.rng, self.horizon) for _ in range(n)]
+            return None if any(d is None for d in deals) else deals
+
+        while done < self.rollouts and (done == 0 or deadline is None or time.perf_counter() < deadline):
+            if self.workers > 1:
+                futures = []
+                for _ in range(self.workers):
+                    n = min(self.batch_size, self.rollouts - done - len(futures) * self.batch_size)
+                    if n <= 0:
+                        break
+                    deals = batch(n)
+                    if deals is None:
+                        return None
+                    futures.append((n, _pool(self.workers).submit(
+                        simulate, deals, actions, self.rollout_policy, self.rng.getrandbits(32), self.endgame_table,
+                    )))
+                results = [(n, f.result()) for n, f in futures]
+            else:
+                n = min(self.batch_size, self.rollouts - done)
+                deals = batch(n)
+                if deals is None:
+                    return None
+                results = [(n, simulate(deals, actions, self.rollout_policy,
+                                         self.rng.getrandbits(32), self.endgame_table))]
+            for n, scores in results:
+                done += n
+                totals = [t + s for t, s in zip(totals, scores)]
+        if not done:
+            return None
+        return [t / done for t in totals]
+
+    def _any_number(self, p: TurnData) -> int:
+        """A number to declare when nothing better is known: an available one, else one of
+        my cards (as PlayerAI.bluff does)."""
+        return p.playing_cards[0] if p.playing_cards else self.rng.choice(self.cards.hand)
+
+    def _choose(self, p: TurnData) -> TurnOutput:
+        self.tracker.my_id = p.my_player_id
+        self.tracker.ingest(p.history)
+        if len(self.cards) <= 3:          # hand-emptying play: an immediate, un-doubtable win
+            cards = list(self.cards.hand)
+            real = [c for c in cards if c != 0]
+            number = Counter(real).most_common(1)[0][0] if real else self._any_number(p)
+            self.cards.pick_idx(list(range(len(cards))))
+            return TurnOutput(doubt=False, number=number if p.board_cards == 0 else None, cards=cards)
+
+        if p.board_cards == 0 and self.opening_book:
+            if self.opening_book not in _BOOKS:
+                _BOOKS[self.opening_book] = OpeningBook.load(self.opening_book)
+            output = _BOOKS[self.opening_book].play(self, p)
+            if output is not None:
+                self.tracker.record_play(output.cards)
+                return output
+
+        actions = self.candidates(p)
+        scores = self.evaluate(p, actions) if len(actions) > 1 else [0.0]
+        if scores is None:                # no consistent deal or no rollout: fall back to the A–E hooks
+            if p.board_cards == 0:
+                return super().play_first_turn(p)
+            return super().play_regular_turn(p)
+        action = actions[max(range(len(actions)), key=scores.__getitem__)]
+        if action.doubt:
+            return action
+        for n, c in Counter(action.cards).items():
+            self.cards.pick(n, c)
+        self.tracker.record_play(action.cards)
+        return TurnOutput(doubt=False, number=action.number, cards=list(action.cards))
+
+    def play_first_turn(self, p: TurnData) -> TurnOutput:
+        return self._choose(p)
+
+    def play_regular_turn(self, p: TurnData) -> TurnOutput:
+        return self._choose(p)
+
+    # ── A–E hooks (fallback only — used when no consistent deal exists) ───────
+
+    def bluff_first_hand(self, p: TurnData) -> bool:
+        return False
+
+    def maximize_first_hand(self, p: TurnData) -> bool:
+        return True
+
+    def should_doubt(self, p: TurnData) -> bool:
+        return self.cards.count(p.current_number) + p.n_cards_played > 4
+
+    def bluff_regular(self, p: TurnData) -> bool:
+        return False
+
+    def maximize_regular(self, p: TurnData) -> bool:
+        return True
@@ -0,0 +1,145 @@
+"""
+OpeningBook — simulation-derived lookup table for first-hand decisions ([A] and [B]).
+
+An opener is described abstractly, so one entry covers many concrete hands:
+
+    (copies, k, bluff)   declare a number I hold `copies` of (0 = one I do not hold)
+                         and play `k` cards — `k` of that number when honest, `k` of my
+                         least useful other cards when bluffing. Jokers are kept.
+
+and keyed by compact features of the position:
+
+    shape       (jokers, triples ≤2, pairs ≤3, singles bucket 0 = 0–1 … 3 = 6+) of the hand
+    seats       players still in the game
+    next_bucket next player's card count: 0 = ≤3, 1 = 4–6, 2 = 7–10, 3 = 11+
+
+Each entry stores the mean rollout score and sample count of every opener tried, plus
+the best one. Build a book with bots.search.build_opening_book; any bot can then call
+book.play(self, p) from play_first_turn: one dict lookup, no per-turn computation.
+"""
+from __future__ import annotations
+import json
+import os
+from collections import Counter
+
+from dubito.game_data import TurnData, TurnOutput
+
+Opener = tuple[int, int, bool]
+
+
+def shape(counts: Counter) -> tuple[int, int, int, int]:
+    per_copies = Counter(c for n, c in counts.items() if n != 0 and c > 0)
+    return counts[0], min(2, per_copies[3]), min(3, per_copies[2]), min(3, per_copies[1] // 2)
+
+
+def next_bucket(n_cards: int) -> int:
+    if n_cards <= 3:
+        return 0
+    if n_cards <= 6:
+        return 1
+    if n_cards <= 10:
+        return 2
+    return 3
+
+
+def features(counts: Counter, seats: int, next_cards: int) -> str:
+    j, t, pr, s = shape(counts)
+    return f'{j},{t},{pr},{s}|{seats}|{next_bucket(next_cards)}'
+
+
+def openers(counts: Counter) -> list[Opener]:
+    """Every abstract opener available to a hand (size > 3)."""
+    held = {c for n, c in counts.items() if n != 0 and c > 0}
+    trash = sum(c for n, c in counts.items() if n != 0)
+    out = [(c, k, False) for c in sorted(held) for k in range(1, c + 1)]
+    for c in sorted(held | {0}):
+        spare = trash - c
+        out += [(c, k, True) for k in range(1, min(3, spare) + 1)]
+    return out
+
+
+def realize(opener: Opener, counts: Counter, available: list[int]) -> tuple[int, list[int]] | None:
+    """Concrete (declared number, cards) for an abstract opener, or None if the hand
+    cannot play it. Bluffs shed singletons first and never break the declared number."""
+    copies, k, bluff = opener
+    if copies:
+        numbers = [n for n in sorted(counts) if n != 0 and counts[n] == copies]
+    else:
+        numbers = [n for n in available if counts[n] == 0]
+    if not numbers:
+        return None
+    number = numbers[0]
+    if not bluff:
+        return number, [number] * k
+    trash = sorted((n for n in counts if n != 0 and n != number and counts[n] > 0), key=lambda n: counts[n])
+    cards = [n for n in trash for _ in range(counts[n])][:k]
+    return (number, cards) if len(cards) == k else None
+
+
+def key(opener: Opener) -> str:
+    copies, k, bluff = opener
+    return f'{copies},{k},{int(bluff)}'
+
+
+def parse(text: str) -> Opener:
+    copies, k, bluff = text.split(',')
+    return int(copies), int(k), bool(int(bluff))
+
+
+class OpeningBook:
+
+    def __init__(self, entries: dict[str, dict] | None = None, min_samples: int = 20) -> None:
+        """
+        Args:
+            entries (dict): features → {'best': opener key, 'values': {opener key: [mean, n]}}.
+            min_samples (int): An opener needs this many samples to be recommended.
+                Defaults to 20.
+        """
+        self.entries = entries or {}
+        self.min_samples = min_samples
+
+    @classmethod
+    def load(cls, path: str, **kwargs) -> OpeningBook:
+        if not os.path.exists(path):
+            return cls(**kwargs)
+        with open(path) as f:
+            return cls(json.load(f)['entries'], **kwargs)
+
+    def save(self, path: str) -> None:
+        with open(path, 'w') as f:
+            json.dump({'version': 1, 'entries': self.entries}, f, separators=(',', ':'), sort_keys=True)
+
+    def record(self, feats: str, opener: str, total: float, n: int = 1) -> None:
+        """Fold `n` more samples scoring `total` in all into an opener's running mean."""
+        values = self.entries.setdefault(feats, {'best': None, 'values': {}})['values']
+        mean, seen = values.get(opener, (0.0, 0))
+        values[opener] = [(mean * seen + total) / (seen + n), seen + n]
+
+    def finalize(self) -> None:
+        """Recompute each entry's best opener from the recorded means."""
+        for entry in self.entries.values():
+            ranked = [(v[0], k) for k, v in entry['values'].items() if v[1] >= self.min_samples]
+            entry['best'] = max(ranked)[1] if ranked else None
+
+    # ── Queries ───────────────────────────────────────────────────────────────
+
+    def lookup(self, counts: Counter, seats: int, next_cards: int) -> Opener | None:
+        entry = self.entries.get(features(counts, seats, next_cards))
+        if entry is None or entry['best'] is None:
+            return None
+        return parse(entry['best'])
+
+    def play(self, bot, p: TurnData) -> TurnOutput | None:
+        """Book opener for `bot` on this first hand, picked out of its Hand, or None when
+        the book has no confident entry (the caller plays its own opener)."""
+        counts = bot.cards.count_all()
+        opener = self.lookup(counts, p.n_players, p.player_card_counts.get(p.next_player_id, 0))
+        if opener is None or len(bot.cards) <= 3:
+            return None
+        concrete = realize(opener, counts, p.playing_cards)
+        if concrete is None:
+            return None
+        number, cards = concrete
+        for n, c in Counter(cards).items():
+            bot.cards.pick(n, c)
+        return TurnOutput(doubt=False, number=number, cards=cards)
@@ -0,0 +1,128 @@
+"""
+Rollouts — fast default policies that play a GameState to the end.
+
+Policies read the count vectors directly and never build a TurnData, so a full game
+costs a few hundred list operations. They are deliberately simple: their job is to be
+a plausible, cheap stand-in for the field, not to be strong.
+"""
+from __future__ import annotations
+import random
+
+from dubito.game_data import TurnOutput
+from dubito.state import GameState, N_NUMBERS, _cards
+
+from .endgame import EndgameSolver
+
+DOUBT = TurnOutput(doubt=True, number=None, cards=None)
+
+
+def _dump(state: GameState, hand: list[int]) -> TurnOutput:
+    """Empty the hand: an immediate win that can never be doubted."""
+    cards = _cards(hand)
+    number = None
+    if state.board_n == 0:
+        number = max(range(1, N_NUMBERS), key=hand.__getitem__) if any(hand[1:]) else state.availables()[0]
+    return TurnOutput(doubt=False, number=number, cards=cards)
+
+
+def heuristic_policy(state: GameState, rng: random.Random) -> TurnOutput:
+    """Mostly honest: dump at ≤3, open with the biggest set, doubt impossible or
+    threatening claims, otherwise play matching cards, a joker, or a single bluff."""
+    seat = state.this
+    hand = state.hands[seat]
+    if state.sizes[seat] <= 3:
+        return _dump(state, hand)
+
+    if state.board_n == 0:
+        best = max(range(1, N_NUMBERS), key=lambda n: (hand[n], rng.random()))
+        return TurnOutput(doubt=False, number=best, cards=[best] * min(3, hand[best]))
+
+    number = state.number
+    claimed = len(state.latest)
+    prev_size = state.sizes[state.prev]
+    jokers = sum(h[0] for h in state.hands) + state.board[0] - hand[0]   # still in play, not mine
+    if hand[number] + claimed > 4 + jokers:        # impossible even with every joker
+        return DOUBT
+    p_doubt = 0.15 + 0.1 * claimed + (0.3 if prev_size <= 3 else 0.0)
+    if hand[number] + claimed > 4:
+        p_doubt += 0.4
+    if rng.random() < p_doubt:
+        return DOUBT
+
+    if hand[number]:
+        return TurnOutput(doubt=False, number=None, cards=[number] * min(3, hand[number]))
+    if hand[0]:
+        return TurnOutput(doubt=False, number=None, cards=[0])
+    trash = [n for n in range(1, N_NUMBERS) if hand[n]]
+    return TurnOutput(doubt=False, number=None, cards=[rng.choice(trash)])
+
+
+def random_policy(state: GameState, rng: random.Random) -> TurnOutput:
+    """Uniform-ish: doubt a third of the time, otherwise 1–3 random cards."""
+    seat = state.this
+    hand = state.hands[seat]
+    if state.sizes[seat] <= 3:
+        return _dump(state, hand)
+    if state.board_n and rng.random() < 0.33:
+        return DOUBT
+    cards = rng.sample(_cards(hand), rng.randint(1, 3))
+    number = rng.choice(state.availables() or cards) if state.board_n == 0 else None
+    return TurnOutput(doubt=False, number=number, cards=cards)
+
+
+POLICIES = {
+    'heuristic': heuristic_policy,
+    'random':    random_policy,
+}
+
+
+_SOLVERS: dict[str, EndgameSolver] = {}
+
+
+def endgame_solver(path: str) -> EndgameSolver:
+    """The table at `path`, loaded once per process (workers included)."""
+    if path not in _SOLVERS:
+        _SOLVERS[path] = EndgameSolver.load(path)
+    return _SOLVERS[path]
+
+
+def outcome(state: GameState, seat: int) -> float:
+    """Score of `seat` in a finished game: 1 hard win, 0.5 soft win, 0 loss."""
+    if seat not in state.winners:
+        return 0.0
+    return 1.0 if state.winners[0] == seat else 0.5
+
+
+def rollout(state: GameState, seat: int, policy, rng: random.Random,
+            solver: EndgameSolver | None = None) -> float:
+    """Play `state` to the end in place and score it for `seat`. With a solver, stop at
+    the first 3-player endgame its table knows and score the solved result instead."""
+    while not state.is_over():
+        if solver is not None and solver.in_scope(state):
+            winner = solver.lookup(state)
+            if winner is not None:
+                return (1.0 if not state.winners else 0.5) if winner == seat else 0.0
+        state.apply(policy(state, rng))
+    return outcome(state, seat)
+
+
+def simulate(states: list[GameState], actions: list[TurnOutput], policy_name: str, seed: int,
+             endgame: str | None = None) -> list[float]:
+    """
+    Score every candidate action once per determinization (common random samples).
+
+    Module-level so it can be shipped to a ProcessPoolExecutor worker. Returns the summed
+    outcome of each action over `states`. `endgame` is the path of a warmed
+    EndgameSolver table used to cut rollouts short.
+    """
+    rng = random.Random(seed)
+    policy = POLICIES[policy_name]
+    solver = endgame_solver(endgame) if endgame else None
+    totals = [0.0] * len(actions)
+    for state in states:
+        seat = state.this
+        for i, action in enumerate(actions):
+            s = state.clone()
+            s.apply(action)
+            totals[i] += rollout(s, seat, policy, rng, solver)
+    return totals
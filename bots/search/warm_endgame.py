@@ -0,0 +1,47 @@
+"""
+Warm an EndgameSolver table on realistic positions and save it to disk.
+
+    python -m bots.search.warm_endgame --positions 2000 --max-cards 6 --out endgame.pkl
+
+Point MonteCarloBot.endgame_table at the output to cut its rollouts short.
+"""
+import argparse
+import random
+
+from dubito.state import GameState
+
+from .endgame import EndgameSolver
+from .rollout import heuristic_policy
+
+
+def sample_endgames(n: int, max_cards: int, rng: random.Random, n_players: int = 4):
+    """Yield realistic 3-player endgames: play random deals with the rollout policy until
+    three players remain, all holding at most `max_cards`."""
+    produced = 0
+    while produced < n:
+        state = GameState.deal(n_players)
+        while not state.is_over():
+            if len(state.playing) == 3 and all(state.sizes[s] <= max_cards for s in state.playing):
+                produced += 1
+                yield state
+                break
+            state.apply(heuristic_policy(state, rng))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Warm the endgame table on sampled positions.')
+    parser.add_argument('--positions', type=int, default=500)
+    parser.add_argument('--max-cards', type=int, default=6)
+    parser.add_argument('--budget', type=int, default=20_000, help='nodes per position')
+    parser.add_argument('--out', default='endgame.pkl')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    solver = EndgameSolver.load(args.out, max_cards=args.max_cards, node_budget=args.budget)
+    before = len(solver.table)
+    solved = 0
+    for state in sample_endgames(args.positions, args.max_cards, random.Random(args.seed)):
+        solved += solver.solve(state) is not None
+    solver.save(args.out)
+    print(f'{solved}/{args.positions} positions solved exactly, '
+          f'table {before:,} → {len(solver.table):,} entries ({args.out})')
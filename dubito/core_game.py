@@ -1,11 +1,16 @@
+from __future__ import annotations
 import random
 from collections import Counter
+from collections.abc import Sequence
+from typing import TYPE_CHECKING
 
 from .player import Player
 from .handlers import GameHandler, StatsHandler, generate_player_data
-from .game_data import CardsPlayedEvent, DoubtResolvedEvent, DiscardEvent, PlayerWonEvent, GameStartEvent
-from machine_learning.dataset import DubitoDataset
+from .observers import GameObserver, GameLogger
+from .game_data import TurnData, TurnOutput, CardsPlayedEvent, DoubtResolvedEvent, DiscardEvent, PlayerWonEvent, GameStartEvent
 
+if TYPE_CHECKING:
+    from .sandbox import Sandbox                # multiprocessing: only needed by sandboxed runs
 
 
 def create_deck(deck_size: int = 14, n_jollies: int = 0) -> list[int]:
@@ -77,14 +82,11 @@ def _resolve_doubt(
         game_handler: GameHandler,
         this_player: Player,
         prev_player: Player,
-        stats_handler: StatsHandler,
-) -> tuple[bool, str]:
-    """Resolves a doubt action. Returns (replay_turn, log_snippet)."""
-    log = f'Player{this_player.id} ({this_player.__class__.__name__}) doubt Player{prev_player.id} ({prev_player.__class__.__name__})!\n'
-    stats_handler.increase_player_doubts(this_player)
-
-    latest_cards_snap = list(game_handler.get_latest_played_cards())
-    full_board_snap = list(game_handler.get_board())
+        observers: Sequence[GameObserver] = (),
+) -> bool:
+    """Resolves a doubt action. Returns True when the doubter replays the turn."""
+    latest_cards_snap = tuple(game_handler.get_latest_played_cards())
+    full_board_snap = tuple(game_handler.get_board())
     declared_snap = game_handler.get_current_number()
     jokers_played = game_handler.jokers_in_latest()
 
@@ -93,19 +95,15 @@ def _resolve_doubt(
         for j in jokers_played:
             board_cards.remove(j)
         this_player.add_cards(board_cards)
-        stats_handler.increase_player_honesty(prev_player)
-        log += f"Joker revealed! Player{this_player.id} ({this_player.__class__.__name__}) gets {len(board_cards)} cards, {len(jokers_played)} joker(s) discarded!\n"
         event = DoubtResolvedEvent(
             doubter_id=this_player.id, target_id=prev_player.id, correct=False,
-            latest_cards=latest_cards_snap, board_cards=board_cards,
+            latest_cards=latest_cards_snap, board_cards=tuple(board_cards),
             declared_number=declared_snap, jokers_discarded=len(jokers_played),
         )
         replay = False
 
     elif game_handler.is_honest():
         this_player.add_cards(game_handler.get_board())
-        stats_handler.increase_player_honesty(prev_player)
-        log += f"Player{this_player.id} ({this_player.__class__.__name__}) get all ({game_handler.n_cards_board()}) the cards!\n"
         event = DoubtResolvedEvent(
             doubter_id=this_player.id, target_id=prev_player.id, correct=False,
             latest_cards=latest_cards_snap, board_cards=full_board_snap,
@@ -115,9 +113,6 @@ def _resolve_doubt(
 
     else:
         prev_player.add_cards(game_handler.get_board())
-        stats_handler.increase_player_dishonesty(prev_player)
-        stats_handler.increase_player_successful_doubts(this_player)
-        log += f"Player{prev_player.id} ({prev_player.__class__.__name__}) get all ({game_handler.n_cards_board()}) the cards!\n"
         event = DoubtResolvedEvent(
             doubter_id=this_player.id, target_id=prev_player.id, correct=True,
             latest_cards=latest_cards_snap, board_cards=full_board_snap,
@@ -127,62 +122,179 @@ def _resolve_doubt(
 
     game_handler.reset_board()
     game_handler.append_event(event)
-    return replay, log
+    for observer in observers:
+        observer.on_doubt(game_handler, this_player, prev_player, event)
+    return replay
 
 
 def _handle_play(
         game_handler: GameHandler,
         this_player: Player,
-        output,
-        stats_handler: StatsHandler,
-) -> str:
-    """Handles a card-play action. Returns a log snippet."""
-    log = ""
+        output: TurnOutput,
+        observers: Sequence[GameObserver] = (),
+) -> None:
+    """Handles a card-play action."""
     if game_handler.is_first_hand():
         new_value = output.number
         if new_value == 0:
             pool = game_handler.board.availables or output.cards
             new_value = random.choice(pool)
         game_handler.set_current_number(new_value)
-        log += f"Player{this_player.id} call number {new_value}\n"
-
-    new_cards = output.cards
-    game_handler.set_board_cards(new_cards)
-    stats_handler.add_player_cards_played(this_player, len(new_cards))
-    if not game_handler.is_honest():
-        stats_handler.increase_player_bluffs(this_player)
-    log += f"Player{this_player.id} play {new_cards}\n"
-    game_handler.append_event(CardsPlayedEvent(
+
+    game_handler.set_board_cards(output.cards)
+    event = CardsPlayedEvent(
         player_id=this_player.id,
         declared_number=game_handler.get_current_number(),
-        n_cards=len(new_cards),
-    ))
-    return log
+        n_cards=len(output.cards),
+    )
+    game_handler.append_event(event)
+    for observer in observers:
+        observer.on_play(game_handler, this_player, event)
 
 
-def _process_end_of_turn(game_handler: GameHandler) -> str:
-    """Runs discards and winner detection. Returns a log snippet."""
-    log = ""
+def _process_end_of_turn(game_handler: GameHandler, observers: Sequence[GameObserver] = ()) -> bool:
+    """Runs discards and winner detection. Returns True when a card was discarded or a
+    player finished."""
+    progress = False
     for p in game_handler.playing_players():
         discarded_cards = p.discard_cards()
         if discarded_cards:
-            log += f"Player{p.id} removed: {discarded_cards}\n"
             for card_number in discarded_cards:
-                game_handler.append_event(DiscardEvent(
-                    player_id=p.id,
-                    card_number=card_number,
-                ))
-        game_handler.set_discarded_cards(discarded_cards)
+                event = DiscardEvent(player_id=p.id, card_number=card_number)
+                game_handler.append_event(event)
+                for observer in observers:
+                    observer.on_discard(game_handler, p, event)
+            game_handler.set_discarded_cards(discarded_cards)
+            progress = True
 
     for winner in [p for p in game_handler.playing_players() if p.has_no_cards()]:
-        log += f"Player{winner.id} Won!\n"
         game_handler.set_winners(winner)
-        log += f"{game_handler.n_playing_players()} Players remaining!\n"
-        game_handler.append_event(PlayerWonEvent(
-            player_id=winner.id,
-            position=len(game_handler.get_winners()),
+        progress = True
+        event = PlayerWonEvent(player_id=winner.id, position=len(game_handler.get_winners()))
+        game_handler.append_event(event)
+        for observer in observers:
+            observer.on_win(game_handler, winner, event)
+    return progress
+
+
+def default_observers() -> list[GameObserver]:
+    """Observers attached when dubito() is called without an explicit list."""
+    return [StatsHandler(), GameLogger()]
+
+
+class DubitoGame:
+    """
+    Step-wise driver of one game over live Player objects.
+
+    This is the single implementation of the turn loop: dubito() runs it to completion,
+    while interactive consumers (rl.env.DubitoEnv, the Flask app) pause it on the seat
+    they control and feed that seat's TurnOutput back in themselves.
+
+        game = DubitoGame(players)             # players already dealt (see initialize)
+        while not game.is_over():
+            player, turn_data = game.next_turn()
+            game.apply(player.play(turn_data))
+        game_result, game_infos = game.finish()
+
+    Stall rule: a game in which no card leaves play (four-of-a-kind or joker discards)
+    and no player finishes for `stall_turns` consecutive turns can only pass the pile
+    around, so it ends there, like one that reaches `max_turns`.
+    """
+
+    def __init__(
+            self,
+            all_players: list[Player],
+            deck_size: int = 14,
+            max_turns: int = 1_000,
+            stall_turns: int | None = None,
+            observers: Sequence[GameObserver] = (),
+            sandbox: Sandbox | None = None,
+            packed_history: bool = False,
+    ) -> None:
+        self.all_players = all_players
+        self.max_turns = max_turns
+        self.stall_turns = stall_turns
+        if sandbox is not None:
+            observers = [*observers, sandbox]
+        self.observers = observers
+        self.sandbox = sandbox
+        history = None
+        if packed_history:
+            from .packing import PackedHistory    # NumPy, only when asked for
+            history = PackedHistory()
+        self.game_handler = GameHandler(all_players=all_players, deck_size=deck_size, history=history)
+        self.prev_player: Player | None = None
+        self.this_player: Player | None = None
+        self.turn_data: TurnData | None = None    # set between next_turn() and apply()
+        self.replay_turn = False
+        self.progress_turn = 0                     # last turn a card left play or a player finished
+
+        self.game_handler.append_event(GameStartEvent(
+            player_ids=tuple(p.id for p in all_players),
+            initial_card_counts={p.id: len(p.cards) for p in all_players},
         ))
-    return log
+        for observer in observers:
+            observer.on_game_start(self.game_handler)
+
+    def is_stalled(self) -> bool:
+        return self.stall_turns is not None and self.game_handler.turn.counter - self.progress_turn >= self.stall_turns
+
+    def is_over(self) -> bool:
+        gh = self.game_handler
+        return gh.n_playing_players() <= 2 or gh.turn.counter >= self.max_turns or self.is_stalled()
+
+    def next_turn(self) -> tuple[Player, TurnData]:
+        """Advance to the next player to act and return them with their TurnData."""
+        if self.replay_turn:
+            self.replay_turn = False
+        else:
+            self.prev_player, self.this_player = self.game_handler.next_turn()
+        self.turn_data = generate_player_data(self.game_handler)
+        return self.this_player, self.turn_data
+
+    def apply(self, output: TurnOutput) -> None:
+        """Resolve the current player's action, then run discards and winner detection."""
+        gh = self.game_handler
+        this_player, prev_player = self.this_player, self.prev_player
+        for observer in self.observers:
+            observer.on_turn(gh, this_player, self.turn_data, output)
+        self.turn_data = None
+
+        if output.doubt and gh.is_first_hand():
+            raise Exception(f"Player{this_player.id} cannot doubt in the first round")
+        elif output.doubt:
+            self.replay_turn = _resolve_doubt(gh, this_player, prev_player, self.observers)
+            if gh.history[-1].jokers_discarded:
+                self.progress_turn = gh.turn.counter
+        else:
+            _handle_play(gh, this_player, output, self.observers)
+
+        if _process_end_of_turn(gh, self.observers):
+            self.progress_turn = gh.turn.counter
+
+    def play_turn(self) -> None:
+        player, turn_data = self.next_turn()
+        if self.sandbox is None:
+            self.apply(player.play(turn_data))
+        else:
+            self.apply(self.sandbox.decide(player, turn_data))
+
+    def finish(self) -> tuple[dict, dict]:
+        """Notify observers that the game is over and collect the results."""
+        gh = self.game_handler
+        if gh.n_playing_players() > 2:
+            gh.stopped_by = ('stall_turns', self.stall_turns) if self.is_stalled() else ('max_turns', self.max_turns)
+        for observer in self.observers:
+            observer.on_game_end(gh)
+        game_result = {
+            'winners': gh.get_winners(),
+            'losers': gh.playing_players(),
+            'turns': gh.turn.counter,
+            'timeout': gh.n_playing_players() > 2,     # stopped by max_turns or the stall rule
+            'stalled': self.is_stalled(),
+        }
+        game_infos = {o.key: o.result() for o in self.observers if o.key is not None}
+        return game_result, game_infos
 
 
 def dubito(
@@ -191,6 +303,11 @@ def dubito(
         deck_size: int = 14,
         n_jollies: int = 2,
         max_turns: int = 1_000,
+        observers: Sequence[GameObserver] | None = None,
+        deal: bool = True,
+        sandbox: Sandbox | None = None,
+        stall_turns: int | None = None,
+        packed_history: bool = False,
 ) -> tuple[dict, dict]:
     """
     Simulates a game of Dubito, a dynamic card game for 3-8 players.
@@ -203,71 +320,38 @@ def dubito(
         n_jollies (int): Number of joker cards added to the deck. Defaults to 2.
         max_turns (int): Safety cap on the number of turns. Defaults to 1_000.
             If reached, all remaining players are treated as losers.
+        observers (Sequence[GameObserver] | None): Plugins notified of every game event.
+            None attaches default_observers() (StatsHandler + GameLogger); pass an empty
+            sequence to run the bare game loop with no bookkeeping at all.
+        deal (bool): Deal fresh hands. Pass False when the players already hold their
+            cards (e.g. duplicate replays of a fixed deal). Defaults to True.
+        sandbox (Sandbox | None): Runs every decision under a deadline, with a fallback
+            action on timeouts, exceptions and illegal moves (see dubito/sandbox.py).
+            Its fault counts are published as game_infos['sandbox']. Defaults to None.
+        stall_turns (int | None): End the game once this many consecutive turns pass
+            with no card leaving play and no player finishing; the remaining players
+            lose, as at `max_turns`. None disables the rule. Defaults to None.
+        packed_history (bool): Keep the event log as a PackedHistory (see
+            dubito/packing.py) instead of a list of events. Defaults to False.
 
     Returns:
         tuple[dict, dict]: A tuple containing two dictionaries:
-            - game_result: Contains information about the winners and losers of the game.
-            - game_infos: Contains logs and decisions made during the game.
+            - game_result: The winners (in order) and losers of the game, the number of
+              turns played, whether the game was cut short (`timeout`, by `max_turns` or
+              the stall rule) and whether the stall rule ended it (`stalled`).
+            - game_infos: observer.result() for every attached observer with a key
+              ('stats', 'logs', 'decisions', ...).
     """
-    logger = ""
+    if observers is None:
+        observers = default_observers()
 
     if shuffle_players:
         random.shuffle(all_players)
-    initialize(all_players, deck_size, n_jollies)
-
-    logger += f'\n{len(all_players)} Players are playing: {[f"Player{player.id}" for player in all_players]}'
-    logger += f'\nGame Start!\n\n'
-
-    game_handler = GameHandler(all_players=all_players, deck_size=deck_size)
-    stats_handler = StatsHandler(all_players=all_players)
-    dataset_handler = DubitoDataset()
-
-    game_handler.append_event(GameStartEvent(
-        player_ids=[p.id for p in all_players],
-        initial_card_counts={p.id: len(p.cards) for p in all_players},
-    ))
-
-    replay_turn = False
-
-    while game_handler.n_playing_players() > 2 and game_handler.turn.counter < max_turns:
-
-        logger += f"\n\n------ Turn {game_handler.turn.counter} ------\n"
-        logger += '\n'.join([f"Player{p.id}'s Cards: {p.cards}" for p in game_handler.playing_players()]) + '\n\n'
-
-        if replay_turn:
-            replay_turn = False
-        else:
-            prev_player, this_player = game_handler.next_turn()
-
-        logger += f'Available Numbers: {game_handler.board.availables}\n'
-        logger += f'Is Player{this_player.id}\'s turn! ({this_player.__class__.__name__})\n'
-        logger += f'Player{this_player.id} ({this_player.__class__.__name__}) has: {this_player.cards}\n'
-
-        input_player = generate_player_data(game_handler)
-        untouched_hand = this_player.cards.hand.copy()
-        output = this_player.play(input_player)
-        dataset_handler.add_data(untouched_hand, this_player.id, input_player, output)
-        stats_handler.increase_turns_played(this_player, game_handler.is_first_hand())
-
-        if output.doubt and game_handler.is_first_hand():
-            raise Exception(f"Player{this_player.id} cannot doubt in the first round")
-        elif output.doubt:
-            replay_turn, doubt_log = _resolve_doubt(game_handler, this_player, prev_player, stats_handler)
-            logger += doubt_log
-        else:
-            logger += _handle_play(game_handler, this_player, output, stats_handler)
-
-        logger += _process_end_of_turn(game_handler)
-
-    logger += f"\n------ End Game ------"
-    if game_handler.turn.counter >= max_turns:
-        logger += f"\nTurn limit ({max_turns}) reached — all remaining players count as losers."
-    logger += f"\nWinners: {[f'Player{p.id}' for p in game_handler.get_winners()]}\n"
-    logger += f"Losers: {[f'Player{p.id}' for p in game_handler.playing_players()]}"
-
-    dataset_handler.add_result(game_handler.get_winners(), game_handler.playing_players())
-
-    game_result = {'winners': game_handler.get_winners(), 'losers': game_handler.playing_players()}
-    game_infos = {'logs': logger, 'decisions': dataset_handler.get_dataset(), 'stats': stats_handler}
-
-    return game_result, game_infos
+    if deal:
+        initialize(all_players, deck_size, n_jollies)
+
+    game = DubitoGame(all_players, deck_size=deck_size, max_turns=max_turns, stall_turns=stall_turns,
+                      observers=observers, sandbox=sandbox, packed_history=packed_history)
+    while not game.is_over():
+        game.play_turn()
+    return game.finish()
@@ -1,32 +1,36 @@
 from __future__ import annotations
+from collections.abc import Sequence
 from dataclasses import dataclass
 
 
 # ---------------------------------------------------------------------------
 # Game events — emitted after each action and stored in game_handler.history.
 # Only observable information is included (card values are hidden until doubted).
+# Events are frozen and slotted, with card lists as tuples: long runs create
+# millions of them, and every TurnData of a game shares the same ones.
+# dubito.packing.PackedHistory stores them as int records instead.
 # ---------------------------------------------------------------------------
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class GameStartEvent:
-    player_ids: list[int]               # in turn order
+    player_ids: tuple[int, ...]         # in turn order
     initial_card_counts: dict[int, int] # player_id → starting n_cards
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class CardsPlayedEvent:
     player_id: int
     declared_number: int
     n_cards: int
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class DoubtResolvedEvent:
     doubter_id: int
     target_id: int
-    correct: bool           # True = bluffer caught; False = doubter wrong
-    latest_cards: list[int] # target's actual last play (now revealed)
-    board_cards: list[int]  # cards the loser picks up
+    correct: bool                   # True = bluffer caught; False = doubter wrong
+    latest_cards: tuple[int, ...]   # target's actual last play (now revealed)
+    board_cards: tuple[int, ...]    # cards the loser picks up
     declared_number: int
     jokers_discarded: int = 0
 
@@ -35,13 +39,13 @@ class DoubtResolvedEvent:
         return self.target_id if self.correct else self.doubter_id
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class DiscardEvent:
     player_id: int
     card_number: int        # 4 of this number were removed from their hand
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class PlayerWonEvent:
     player_id: int
     position: int           # 1 = first place, 2 = second, etc.
@@ -73,7 +77,7 @@ class TurnData:
     prev_player_id: int
     next_player_id: int
     # — Raw event log — derive anything uncertain from here —
-    history: list[GameEvent]
+    history: Sequence[GameEvent]        # a list, or a PackedHistory (see dubito/packing.py)
 
 
 @dataclass
@@ -86,33 +90,43 @@ class TurnOutput:
 # ---------------------------------------------------------------------------
 # History helpers — derive per-player statistics from the event log.
 # Import these in bots instead of relying on pre-computed fields.
+# A PackedHistory (dubito/packing.py) answers them without rebuilding events.
 # ---------------------------------------------------------------------------
 
-def honest_times(player_id: int, history: list[GameEvent]) -> int:
+def honest_times(player_id: int, history: Sequence[GameEvent]) -> int:
     """Times player was doubted and found to be honest (doubter was wrong)."""
+    if hasattr(history, 'tally'):
+        return history.tally(DoubtResolvedEvent, target_id=player_id, correct=False)
     return sum(
         1 for e in history
-        if isinstance(e, DoubtResolvedEvent) and e.target_id == player_id and not e.correct
+        if type(e) is DoubtResolvedEvent and e.target_id == player_id and not e.correct
     )
 
 
-def dishonest_times(player_id: int, history: list[GameEvent]) -> int:
+def dishonest_times(player_id: int, history: Sequence[GameEvent]) -> int:
     """Times player was doubted and caught bluffing (doubter was correct)."""
+    if hasattr(history, 'tally'):
+        return history.tally(DoubtResolvedEvent, target_id=player_id, correct=True)
     return sum(
         1 for e in history
-        if isinstance(e, DoubtResolvedEvent) and e.target_id == player_id and e.correct
+        if type(e) is DoubtResolvedEvent and e.target_id == player_id and e.correct
     )
 
 
-def doubts_count(player_id: int, history: list[GameEvent]) -> int:
+def doubts_count(player_id: int, history: Sequence[GameEvent]) -> int:
     """Number of times player chose to doubt."""
+    if hasattr(history, 'tally'):
+        return history.tally(DoubtResolvedEvent, doubter_id=player_id)
     return sum(
         1 for e in history
-        if isinstance(e, DoubtResolvedEvent) and e.doubter_id == player_id
+        if type(e) is DoubtResolvedEvent and e.doubter_id == player_id
     )
 
 
-def turns_count(player_id: int, history: list[GameEvent]) -> int:
+def turns_count(player_id: int, history: Sequence[GameEvent]) -> int:
     """Total turns taken by player (card plays + doubts)."""
-    plays = sum(1 for e in history if isinstance(e, CardsPlayedEvent) and e.player_id == player_id)
+    if hasattr(history, 'tally'):
+        plays = history.tally(CardsPlayedEvent, player_id=player_id)
+    else:
+        plays = sum(1 for e in history if type(e) is CardsPlayedEvent and e.player_id == player_id)
     return plays + doubts_count(player_id, history)
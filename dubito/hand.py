@@ -5,6 +5,9 @@ class Hand:
     """
     Represents a hand of cards.
 
+    Mutators rebind `hand` to a new list instead of changing it in place, so a list
+    taken from a hand (e.g. by the lazy TurnData of the turn) keeps its contents.
+
     Attributes:
         hand (list[int]): List of card values in the hand.
     """
@@ -87,9 +90,10 @@ class Hand:
             ValueError: If the specified amount is greater than the number of unique elements in the hand.
         """
         random_numbers = random.sample(self.hand, min(amount, len(self.hand)))
+        remaining_cards = self.hand[:]
         for n in random_numbers:
-            if n in self.hand:
-                self.hand.remove(n)
+            remaining_cards.remove(n)
+        self.hand = remaining_cards
         return random_numbers
     
     def pick_most(self) -> list[int]:
@@ -111,8 +115,7 @@ class Hand:
         Args:
             cards (list[int]): List of cards to add to the hand.
         """
-        self.hand += cards
-        self.hand.sort()
+        self.hand = sorted(self.hand + cards)
 
     def count_all(self) -> Counter:
         """
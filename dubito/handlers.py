@@ -1,5 +1,10 @@
+from collections.abc import Sequence
+from dataclasses import fields
+from functools import cached_property
+
 from .player import Player
-from .game_data import TurnData, GameEvent
+from .game_data import TurnData, TurnOutput, GameEvent, CardsPlayedEvent, DoubtResolvedEvent
+from .observers import GameObserver
 
 
 class TurnHandler:
@@ -31,12 +36,15 @@ class BoardHandler:
 
 
 class GameHandler:
-    """Manages the overall game state."""
-    def __init__(self, all_players: list[Player], deck_size: int) -> None:
+    """Manages the overall game state. The event log is a list unless a history (e.g. a
+    PackedHistory) is passed in."""
+    def __init__(self, all_players: list[Player], deck_size: int,
+                 history: Sequence[GameEvent] | None = None) -> None:
         self.turn = TurnHandler(all_players=all_players)
         self.players = PlayersHandler(all_players=all_players)
         self.board = BoardHandler(deck_size=deck_size)
-        self.history: list[GameEvent] = []
+        self.history: Sequence[GameEvent] = [] if history is None else history
+        self.stopped_by: tuple[str, int] | None = None   # ('max_turns' | 'stall_turns', limit) of a cut game
 
     def append_event(self, event: GameEvent) -> None:
         self.history.append(event)
@@ -128,9 +136,17 @@ class GameHandler:
         return self.players.winners
 
 
-class StatsHandler:
+class StatsHandler(GameObserver):
     """Tracks per-player game statistics for post-game analytics (experiments, ML)."""
-    def __init__(self, all_players: list[Player]) -> None:
+
+    key = 'stats'
+
+    def __init__(self, all_players: list[Player] | None = None) -> None:
+        self.data = {}
+        if all_players is not None:
+            self._init_players(all_players)
+
+    def _init_players(self, all_players: list[Player]) -> None:
         self.data = {}
         for p in all_players:
             self.data[p.id] = {
@@ -145,6 +161,31 @@ class StatsHandler:
                 'play_turns': 0,
             }
 
+    # ── GameObserver hooks ────────────────────────────────────────────────────
+
+    def on_game_start(self, game_handler: 'GameHandler') -> None:
+        self._init_players(game_handler.players.all)
+
+    def on_turn(self, game_handler: 'GameHandler', player: Player,
+                turn_data: TurnData, output: TurnOutput) -> None:
+        self.increase_turns_played(player, game_handler.is_first_hand())
+
+    def on_play(self, game_handler: 'GameHandler', player: Player, event: CardsPlayedEvent) -> None:
+        self.add_player_cards_played(player, event.n_cards)
+        if not game_handler.is_honest():
+            self.increase_player_bluffs(player)
+
+    def on_doubt(self, game_handler: 'GameHandler', doubter: Player, target: Player,
+                 event: DoubtResolvedEvent) -> None:
+        self.increase_player_doubts(doubter)
+        if event.correct:
+            self.increase_player_dishonesty(target)
+            self.increase_player_successful_doubts(doubter)
+        else:
+            self.increase_player_honesty(target)
+
+    # ── Counters ──────────────────────────────────────────────────────────────
+
     def increase_turns_played(self, player: Player, first_hand: bool) -> None:
         self.data[player.id]['turns'] += 1
         if not first_hand:
@@ -170,19 +211,57 @@ class StatsHandler:
         self.data[player.id]['play_turns'] += 1
 
 
+class _LazyTurnData(TurnData):
+    """
+    TurnData whose list and dict fields are built on first access, then cached. Most bots
+    read a few scalars, and copying the history alone grows with every turn.
+
+    The snapshot stays exact whenever a field is read: it holds the hand lists (which Hand
+    rebinds rather than mutates), the availables (rebound on every discard) and the
+    history length at the time of the turn. Copies and pickles are plain TurnData.
+    """
+
+    def __init__(self, game_handler: GameHandler) -> None:
+        players = game_handler.players
+        self.current_number = game_handler.get_current_number()
+        self.board_cards = game_handler.n_cards_board()
+        self.n_cards_played = len(game_handler.board.latests)
+        self.n_players = game_handler.n_playing_players()
+        self.streak = game_handler.turn.streak
+        self.my_player_id = players.this.id
+        self.prev_player_id = players.prev.id
+        self.next_player_id = players.next.id
+        self._hand = players.this.cards.hand
+        self._hands = [(p.id, p.cards.hand) for p in players.playing]
+        self._availables = game_handler.board.availables
+        self._history = game_handler.history
+        self._n_events = len(game_handler.history)
+
+    @cached_property
+    def my_cards(self) -> list[int]:
+        return list(self._hand)
+
+    @cached_property
+    def playing_cards(self) -> list[int]:
+        return list(self._availables)
+
+    @cached_property
+    def player_card_counts(self) -> dict[int, int]:
+        return {pid: len(hand) for pid, hand in self._hands}
+
+    @cached_property
+    def history(self) -> Sequence[GameEvent]:
+        return self._history[:self._n_events]
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, TurnData):
+            return NotImplemented
+        return all(getattr(self, f.name) == getattr(other, f.name) for f in fields(TurnData))
+
+    def __reduce__(self):
+        return TurnData, tuple(getattr(self, f.name) for f in fields(TurnData))
+
+
 def generate_player_data(game_handler: GameHandler) -> TurnData:
-    """Build the TurnData snapshot passed to player.play() each turn."""
-    return TurnData(
-        my_cards=list(game_handler.players.this.cards.hand),
-        current_number=game_handler.get_current_number(),
-        board_cards=game_handler.n_cards_board(),
-        n_cards_played=len(game_handler.board.latests),
-        playing_cards=list(game_handler.board.availables),
-        n_players=game_handler.n_playing_players(),
-        player_card_counts={p.id: len(p.cards) for p in game_handler.playing_players()},
-        streak=game_handler.turn.streak,
-        my_player_id=game_handler.players.this.id,
-        prev_player_id=game_handler.players.prev.id,
-        next_player_id=game_handler.players.next.id,
-        history=list(game_handler.history),
-    )
+    """Build the TurnData snapshot passed to player.play() each turn (see _LazyTurnData)."""
+    return _LazyTurnData(game_handler)
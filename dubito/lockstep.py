@@ -0,0 +1,411 @@
+"""
+Lockstep — a batch of games advanced together, one turn per step, on NumPy arrays.
+
+dubito() plays one game at a time over Player and Hand objects. Bots whose decisions are
+simple functions of a few TurnData fields can instead play a whole batch at once. Every
+array has one row per game:
+
+    hand      (G, P, 14)  card counts per seat, index 0 = jokers (as in GameState)
+    board     (G, 14)     pile counts; `latest` holds the last play
+    avail     (G, 14)     numbers still in circulation
+    playing   (G, P)      seats still in the game
+
+Each step resolves one turn in every unfinished game. Bots take part through VectorRules
+subclasses: the five BotBase hooks (A–E), each answering for all the games of the batch
+in which one of its seats is to move (see bots/manual/vectorized.py). The framework
+around them (the forced bluff, card choice, the first-hand number), the deal, doubts,
+discards, winners, max_turns and the stall rule follow DubitoGame, so a batch has the
+outcome distribution of dubito() games with the same bots. The random draws are not
+the same, so single games do not replay.
+"""
+from __future__ import annotations
+from collections.abc import Sequence
+from dataclasses import dataclass
+
+import numpy as np
+
+from .state import N_NUMBERS
+
+STATS = ('turns', 'not_first_turns', 'doubts', 'honest_times', 'dishonest_times', 'bluffs',
+         'successful_doubts', 'total_cards_played', 'play_turns')
+
+
+class Turns:
+    """
+    The pending decisions of one bot across the batch: TurnData fields as arrays with
+    one entry per game (my_cards and playing_cards have one row per game).
+    """
+
+    def __init__(self, batch: _Batch, games: np.ndarray, my_cards: np.ndarray) -> None:
+        self._batch = batch
+        self._games = games
+        self.my_cards = my_cards
+
+    def __len__(self) -> int:
+        return len(self._games)
+
+    @property
+    def current_number(self) -> np.ndarray:
+        return self._batch.number[self._games]
+
+    @property
+    def board_cards(self) -> np.ndarray:
+        return self._batch.board_n[self._games]
+
+    @property
+    def n_cards_played(self) -> np.ndarray:
+        return self._batch.latest_n[self._games]
+
+    @property
+    def playing_cards(self) -> np.ndarray:
+        return self._batch.avail[self._games]
+
+    @property
+    def n_players(self) -> np.ndarray:
+        return self._batch.playing[self._games].sum(1)
+
+    @property
+    def streak(self) -> np.ndarray:
+        return self._batch.streak[self._games]
+
+    @property
+    def prev_cards(self) -> np.ndarray:
+        """player_card_counts.get(prev_player_id, 0)"""
+        return self._batch.cards_of(self._games, self._batch.prev[self._games])
+
+    @property
+    def next_cards(self) -> np.ndarray:
+        """player_card_counts.get(next_player_id, 0)"""
+        return self._batch.cards_of(self._games, self._batch.next[self._games])
+
+    def can_play_truthfully(self) -> np.ndarray:
+        return self.my_cards[np.arange(len(self)), self.current_number] > 0
+
+    def is_first_turn(self) -> np.ndarray:
+        return self.board_cards == 0
+
+    def prev_player_started_turn(self) -> np.ndarray:
+        return self.n_cards_played == self.board_cards
+
+    def all_equal(self) -> np.ndarray:
+        return np.count_nonzero(self.my_cards, axis=1) <= 1
+
+    def random(self) -> np.ndarray:
+        """One random.random() per game."""
+        return self._batch.rng.random(len(self))
+
+    def coin(self) -> np.ndarray:
+        """One random.choice([True, False]) per game."""
+        return self._batch.rng.random(len(self)) < 0.5
+
+
+class VectorRules:
+    """
+    A bot's A–E hooks (see BotBase) over a batch of pending decisions. Each returns a
+    bool per game, or a single bool for all of them. The first two hooks only see first
+    hands, the last three only regular turns; bluff_regular only matters where an
+    honest play is possible, as in BotBase.
+    """
+
+    def __init__(self, bot: type) -> None:
+        self.bot = bot       # the BotBase subclass, for its class constants
+
+    def bluff_first_hand(self, t: Turns) -> np.ndarray | bool:     raise NotImplementedError
+    def maximize_first_hand(self, t: Turns) -> np.ndarray | bool:  raise NotImplementedError
+    def should_doubt(self, t: Turns) -> np.ndarray | bool:         raise NotImplementedError
+    def bluff_regular(self, t: Turns) -> np.ndarray | bool:        raise NotImplementedError
+    def maximize_regular(self, t: Turns) -> np.ndarray | bool:     raise NotImplementedError
+
+
+@dataclass
+class LockstepResult:
+    """Per-game outcomes of simulate(). Seat arrays are (G, P); empty seats hold 0."""
+    seats: np.ndarray        # rules index per seat, -1 = empty
+    place: np.ndarray        # finishing position (1 = first), 0 = did not finish
+    cards: np.ndarray        # cards left in hand at the end
+    turns: np.ndarray
+    timeout: np.ndarray      # cut short by max_turns or the stall rule
+    stalled: np.ndarray
+    stats: dict[str, np.ndarray]   # StatsHandler counters per seat
+
+
+def simulate(seats: np.ndarray, rules: Sequence[VectorRules], deck_size: int = 14, n_jollies: int = 2,
+             max_turns: int = 1_000, stall_turns: int | None = None, seed: int | None = None) -> LockstepResult:
+    """
+    Play one game per row of `seats` to the end.
+
+    Args:
+        seats (np.ndarray): (G, P) index into `rules` of the bot at each seat, in turn
+            order; -1 marks the empty seats of games with fewer than P players, which
+            must come last.
+        rules (Sequence[VectorRules]): The bots.
+        deck_size, n_jollies, max_turns, stall_turns: As in dubito().
+        seed (int | None): Seed of the batch's random generator.
+
+    Returns:
+        LockstepResult
+    """
+    batch = _Batch(np.asarray(seats), rules, deck_size, n_jollies, max_turns, stall_turns, seed)
+    return batch.run()
+
+
+def _first_true(mask: np.ndarray) -> np.ndarray:
+    return mask.argmax(1)
+
+
+class _Batch:
+
+    def __init__(self, seats: np.ndarray, rules: Sequence[VectorRules], deck_size: int, n_jollies: int,
+                 max_turns: int, stall_turns: int | None, seed: int | None) -> None:
+        self.seats = seats
+        self.rules = rules
+        self.max_turns = max_turns
+        self.stall_turns = np.inf if stall_turns is None else stall_turns
+        self.rng = np.random.default_rng(seed)
+        G, P = seats.shape
+        present = seats >= 0
+        self.n = present.sum(1)
+
+        self.hand = self._deal(deck_size, n_jollies)
+        self.size = self.hand.sum(2)
+        self.playing = present.copy()
+        self.board = np.zeros((G, N_NUMBERS), dtype=np.int16)
+        self.board_n = np.zeros(G, dtype=np.int16)
+        self.latest = np.zeros((G, N_NUMBERS), dtype=np.int16)
+        self.latest_n = np.zeros(G, dtype=np.int16)
+        self.number = np.zeros(G, dtype=np.int64)
+        self.avail = np.zeros((G, N_NUMBERS), dtype=bool)
+        self.avail[:, 1:deck_size] = True
+        self.turn = np.zeros(G, dtype=np.int32)
+        self.streak = np.zeros(G, dtype=np.int32)
+        self.progress = np.zeros(G, dtype=np.int32)
+        self.cur = self.n - 1                     # seat at the turn position (GameState.pos)
+        self.prev = np.zeros(G, dtype=np.int64)
+        self.this = np.zeros(G, dtype=np.int64)
+        self.next = np.zeros(G, dtype=np.int64)
+        self.replay = np.zeros(G, dtype=bool)
+        self.place = np.zeros((G, P), dtype=np.int16)
+        self.n_won = np.zeros(G, dtype=np.int16)
+        self.stalled = np.zeros(G, dtype=bool)
+        self.stats = {k: np.zeros((G, P), dtype=np.int32) for k in STATS}
+        self.over = self.n <= 2
+        self._advance(np.flatnonzero(~self.over))
+
+    # ── Setup ─────────────────────────────────────────────────────────────────
+
+    def _deal(self, deck_size: int, n_jollies: int) -> np.ndarray:
+        """Shuffle and deal round-robin, re-dealing any game with four of a kind in a hand
+        (as initialize() does)."""
+        G, P = self.seats.shape
+        deck = np.array(list(range(1, deck_size)) * 4 + [0] * n_jollies)
+        hand = np.zeros((G, P, N_NUMBERS), dtype=np.int16)
+        todo = np.arange(G)
+        while len(todo):
+            shuffled = deck[np.argsort(self.rng.random((len(todo), len(deck))), axis=1)]
+            seat = np.arange(len(deck)) % self.n[todo, None]
+            flat = ((np.arange(len(todo))[:, None] * P + seat) * N_NUMBERS + shuffled).ravel()
+            dealt = np.bincount(flat, minlength=len(todo) * P * N_NUMBERS).reshape(len(todo), P, N_NUMBERS)
+            hand[todo] = dealt
+            todo = todo[(dealt >= 4).any(axis=(1, 2))]
+        return hand
+
+    # ── Seats ─────────────────────────────────────────────────────────────────
+
+    def _next_seat(self, games: np.ndarray, seat: np.ndarray) -> np.ndarray:
+        """The next playing seat after `seat`, cyclically."""
+        P = self.seats.shape[1]
+        candidates = (seat[:, None] + 1 + np.arange(P)) % P
+        return candidates[np.arange(len(games)), _first_true(self.playing[games[:, None], candidates])]
+
+    def cards_of(self, games: np.ndarray, seat: np.ndarray) -> np.ndarray:
+        return np.where(self.playing[games, seat], self.size[games, seat], 0)
+
+    def _advance(self, games: np.ndarray) -> None:
+        replay = self.replay[games]
+        self.replay[games[replay]] = False
+        g = games[~replay]
+        self.turn[g] += 1
+        self.streak[g] += 1
+        self.prev[g] = self.cur[g]
+        self.this[g] = self._next_seat(g, self.cur[g])
+        self.next[g] = self._next_seat(g, self.this[g])
+        self.cur[g] = self.this[g]
+
+    # ── Turns ─────────────────────────────────────────────────────────────────
+
+    def run(self) -> LockstepResult:
+        while True:
+            games = np.flatnonzero(~self.over)
+            if not len(games):
+                break
+            self._step(games)
+        return LockstepResult(
+            seats=self.seats, place=self.place, cards=self.size, turns=self.turn,
+            timeout=self.playing.sum(1) > 2, stalled=self.stalled, stats=self.stats,
+        )
+
+    def _step(self, games: np.ndarray) -> None:
+        this = self.this[games]
+        first = self.board_n[games] == 0
+        self.stats['turns'][games, this] += 1
+        self.stats['not_first_turns'][games, this] += ~first
+
+        hand = self.hand[games, this]
+        doubt, bluff, maximize = self._decide(games, hand, first)
+        receiver = this.copy()
+        if doubt.any():
+            receiver[doubt] = self._resolve_doubt(games[doubt])
+        play = ~doubt
+        if play.any():
+            self._play(games[play], hand[play], first[play], bluff[play], maximize[play])
+        self._winners(games, receiver)
+
+        turn = self.turn[games]
+        self.stalled[games] = turn - self.progress[games] >= self.stall_turns
+        over = (self.playing[games].sum(1) <= 2) | (turn >= self.max_turns) | self.stalled[games]
+        self.over[games] = over
+        self._advance(games[~over])
+
+    def _decide(self, games: np.ndarray, hand: np.ndarray, first: np.ndarray) -> tuple[np.ndarray, ...]:
+        """(doubt, bluff, maximize) per game from the hooks of the bot to move."""
+        m = len(games)
+        doubt = np.zeros(m, dtype=bool)
+        bluff = np.zeros(m, dtype=bool)
+        maximize = np.zeros(m, dtype=bool)
+        kind = self.seats[games, self.this[games]]
+        for r, rules in enumerate(self.rules):
+            mine = kind == r
+            if not mine.any():
+                continue
+            f = mine & first
+            if f.any():
+                t = Turns(self, games[f], hand[f])
+                maximize[f] = rules.maximize_first_hand(t)           # B
+                bluff[f] = rules.bluff_first_hand(t)                 # A
+            g = mine & ~first
+            if g.any():
+                t = Turns(self, games[g], hand[g])
+                doubt[g] = rules.should_doubt(t)                     # C
+                maximize[g] = rules.maximize_regular(t)              # E
+                bluff[g] = ~t.can_play_truthfully() | rules.bluff_regular(t)   # D, or forced
+        return doubt, bluff, maximize
+
+    def _draw(self, hand: np.ndarray, played: np.ndarray, rows: np.ndarray, amount: np.ndarray) -> None:
+        """Move min(amount, hand size) random cards of `hand` to `played` (Hand.pick_random)."""
+        for k in range(3):
+            r = rows[amount > k]
+            r = r[hand[r].sum(1) > 0]
+            if not len(r):
+                return
+            cum = hand[r].cumsum(1)
+            card = (cum <= (self.rng.random(len(r)) * cum[:, -1])[:, None]).sum(1)
+            hand[r, card] -= 1
+            played[r, card] += 1
+
+    def _pick(self, counts: np.ndarray) -> np.ndarray:
+        """One random.choice over each row's multiset of counts."""
+        cum = counts.cumsum(1)
+        return (cum <= (self.rng.random(len(counts)) * cum[:, -1])[:, None]).sum(1)
+
+    def _random_number(self, games: np.ndarray, played: np.ndarray) -> np.ndarray:
+        """random.choice(availables or cards), as in _handle_play and PlayerAI.bluff."""
+        avail = self.avail[games]
+        pool = np.where(avail.any(1)[:, None], avail, played)
+        return self._pick(pool)
+
+    def _play(self, games: np.ndarray, hand: np.ndarray, first: np.ndarray, bluff: np.ndarray,
+              maximize: np.ndarray) -> None:
+        m = len(games)
+        rows = np.arange(m)
+        played = np.zeros((m, N_NUMBERS), dtype=np.int16)
+        number = self.number[games].copy()
+        amount = np.where(maximize, 3, self.rng.integers(1, 4, m))
+
+        most = first & ~bluff & maximize                               # pick_most
+        r = rows[most]
+        top = hand[r].argmax(1)
+        played[r, top] = hand[r, top]
+        hand[r, top] = 0
+        number[r] = top
+        one = first & ~bluff & ~maximize                               # pick_random()
+        r = rows[one]
+        self._draw(hand, played, r, np.ones(len(r)))
+        number[r] = played[r].argmax(1)
+        r = rows[first & bluff]
+        self._draw(hand, played, r, amount[r])
+        number[r] = self._random_number(games[r], played[r])
+        r = rows[first & (number == 0)]                                # a declared 0 is redrawn
+        number[r] = self._random_number(games[r], played[r])
+
+        r = rows[~first & ~bluff]                                      # honest regular play
+        held = hand[r, number[r]]
+        take = np.where(maximize[r], held, np.floor(self.rng.random(len(r)) * held).astype(held.dtype) + 1)
+        played[r, number[r]] = take
+        hand[r, number[r]] -= take
+        r = rows[~first & bluff]
+        self._draw(hand, played, r, amount[r])
+
+        this = self.this[games]
+        n_played = played.sum(1)
+        self.hand[games, this] = hand
+        self.size[games, this] -= n_played
+        self.number[games] = number
+        self.board[games] += played
+        self.board_n[games] += n_played
+        self.latest[games] = played
+        self.latest_n[games] = n_played
+        honest = played[:, 0] + np.where(number > 0, played[rows, number], 0)
+        self.stats['bluffs'][games, this] += n_played > honest
+        self.stats['total_cards_played'][games, this] += n_played
+        self.stats['play_turns'][games, this] += 1
+
+    def _resolve_doubt(self, games: np.ndarray) -> np.ndarray:
+        """Hand the pile to the loser and run the loser's discards. Returns the loser's seat."""
+        this, prev, number = self.this[games], self.prev[games], self.number[games]
+        latest = self.latest[games]
+        jokers = latest[:, 0]
+        honest = self.latest_n[games] - jokers - np.where(number > 0, latest[np.arange(len(games)), number], 0) == 0
+        self.stats['doubts'][games, this] += 1
+        self.stats['honest_times'][games[honest], prev[honest]] += 1
+        self.stats['dishonest_times'][games[~honest], prev[~honest]] += 1
+        self.stats['successful_doubts'][games[~honest], this[~honest]] += 1
+
+        g = games[honest]
+        self.board[g, 0] -= jokers[honest]
+        self.board_n[g] -= jokers[honest]
+        dropped = g[jokers[honest] > 0]
+        self.progress[dropped] = self.turn[dropped]
+        self.replay[games[~honest]] = True
+
+        loser = np.where(honest, this, prev)
+        received = self.hand[games, loser] + self.board[games]
+        self.size[games, loser] += self.board_n[games]
+        self.board[games] = 0
+        self.board_n[games] = 0
+        self.number[games] = 0
+        self.streak[games] = 0
+        self.latest[games] = 0
+        self.latest_n[games] = 0
+
+        quads = received >= 4                                          # only a pickup completes them
+        q = quads.any(1)
+        if q.any():
+            self.progress[games[q]] = self.turn[games[q]]
+            self.size[games, loser] -= np.where(quads, received, 0).sum(1).astype(self.size.dtype)
+            received[quads] = 0
+            self.avail[games] &= ~quads
+        self.hand[games, loser] = received
+        return loser
+
+    def _winners(self, games: np.ndarray, seat: np.ndarray) -> None:
+        """Only the player who played or the one who picked up the pile can run out of cards."""
+        won = self.size[games, seat] == 0
+        if not won.any():
+            return
+        g, w = games[won], seat[won]
+        self.progress[g] = self.turn[g]
+        self.n_won[g] += 1
+        self.place[g, w] = self.n_won[g]
+        self.playing[g, w] = False
+        anchor = np.where(w == self.this[g], self.prev[g], self.this[g])
+        self.cur[g] = np.where(self.playing[g, anchor], anchor, _first_true(self.playing[g]))
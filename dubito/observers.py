@@ -0,0 +1,120 @@
+from __future__ import annotations
+from typing import TYPE_CHECKING
+
+from .game_data import TurnData, TurnOutput, CardsPlayedEvent, DoubtResolvedEvent, DiscardEvent, PlayerWonEvent
+
+if TYPE_CHECKING:
+    from .handlers import GameHandler
+    from .player import Player
+
+
+class GameObserver:
+    """
+    Base class for dubito() plugins (stats, dataset recording, logging, custom collectors).
+
+    Every hook is a no-op: override only the ones you need. Hooks fire in this order:
+
+        on_game_start                          once, after the deal
+        on_turn      → on_play | on_doubt      every turn, right after player.play()
+                     → on_discard* → on_win*   end-of-turn bookkeeping
+        on_game_end                            once, after the last turn
+
+    Observers whose `key` is set publish `result()` into the game_infos dict returned by
+    dubito() under that key.
+    """
+
+    key: str | None = None
+
+    def on_game_start(self, game_handler: GameHandler) -> None:
+        pass
+
+    def on_turn(self, game_handler: GameHandler, player: Player,
+                turn_data: TurnData, output: TurnOutput) -> None:
+        """Called after player.play() returns, before the action is resolved."""
+
+    def on_play(self, game_handler: GameHandler, player: Player, event: CardsPlayedEvent) -> None:
+        """Called after the played cards are on the board."""
+
+    def on_doubt(self, game_handler: GameHandler, doubter: Player, target: Player,
+                 event: DoubtResolvedEvent) -> None:
+        """Called after the pile has been handed to the loser of the doubt."""
+
+    def on_discard(self, game_handler: GameHandler, player: Player, event: DiscardEvent) -> None:
+        pass
+
+    def on_win(self, game_handler: GameHandler, player: Player, event: PlayerWonEvent) -> None:
+        pass
+
+    def on_game_end(self, game_handler: GameHandler) -> None:
+        pass
+
+    def result(self):
+        return self
+
+
+def _name(player: Player) -> str:
+    return f'Player{player.id} ({player.__class__.__name__})'
+
+
+class GameLogger(GameObserver):
+    """Builds the human-readable turn-by-turn log (game_infos['logs'])."""
+
+    key = 'logs'
+
+    def __init__(self) -> None:
+        self.log = ''
+
+    def on_game_start(self, game_handler: GameHandler) -> None:
+        players = game_handler.players.all
+        self.log = f'\n{len(players)} Players are playing: {[f"Player{p.id}" for p in players]}'
+        self.log += '\nGame Start!\n\n'
+
+    def on_turn(self, game_handler: GameHandler, player: Player,
+                turn_data: TurnData, output: TurnOutput) -> None:
+        log = f"\n\n------ Turn {game_handler.turn.counter} ------\n"
+        log += '\n'.join(
+            f"Player{p.id}'s Cards: {turn_data.my_cards if p is player else p.cards}"
+            for p in game_handler.playing_players()
+        ) + '\n\n'
+        log += f'Available Numbers: {turn_data.playing_cards}\n'
+        log += f"Is Player{player.id}'s turn! ({player.__class__.__name__})\n"
+        log += f'{_name(player)} has: {turn_data.my_cards}\n'
+        self.log += log
+
+    def on_play(self, game_handler: GameHandler, player: Player, event: CardsPlayedEvent) -> None:
+        if game_handler.n_cards_board() == event.n_cards:
+            self.log += f"Player{player.id} call number {event.declared_number}\n"
+        self.log += f"Player{player.id} play {game_handler.get_latest_played_cards()}\n"
+
+    def on_doubt(self, game_handler: GameHandler, doubter: Player, target: Player,
+                 event: DoubtResolvedEvent) -> None:
+        log = f'{_name(doubter)} doubt {_name(target)}!\n'
+        n = len(event.board_cards)
+        if event.jokers_discarded:
+            log += f"Joker revealed! {_name(doubter)} gets {n} cards, {event.jokers_discarded} joker(s) discarded!\n"
+        else:
+            loser = target if event.correct else doubter
+            log += f"{_name(loser)} get all ({n}) the cards!\n"
+        self.log += log
+
+    def on_discard(self, game_handler: GameHandler, player: Player, event: DiscardEvent) -> None:
+        self.log += f"Player{player.id} removed: [{event.card_number}]\n"
+
+    def on_win(self, game_handler: GameHandler, player: Player, event: PlayerWonEvent) -> None:
+        self.log += f"Player{player.id} Won!\n"
+        self.log += f"{game_handler.n_playing_players()} Players remaining!\n"
+
+    def on_game_end(self, game_handler: GameHandler) -> None:
+        log = "\n------ End Game ------"
+        if game_handler.stopped_by is not None:
+            rule, limit = game_handler.stopped_by
+            if rule == 'stall_turns':
+                log += f"\nStall rule: no progress in {limit} turns — all remaining players count as losers."
+            else:
+                log += f"\nTurn limit ({limit}) reached — all remaining players count as losers."
+        log += f"\nWinners: {[f'Player{p.id}' for p in game_handler.get_winners()]}\n"
+        log += f"Losers: {[f'Player{p.id}' for p in game_handler.playing_players()]}"
+        self.log += log
+
+    def result(self) -> str:
+        return self.log
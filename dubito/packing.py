@@ -0,0 +1,247 @@
+"""
+Packing — GameEvents as fixed-width int records, for archives and vectorized queries.
+
+One game packs into two arrays:
+
+    records   int16 (n_events, WIDTH), one row per history event
+    cards     int8  (n_cards,), every card list of the game, concatenated in event order
+
+Columns (-1 = not applicable / unknown):
+
+    KIND     START, PLAY, DOUBT, DISCARD or WON
+    TURN     turn counter when the event happened
+    ACTOR    START: n_players · PLAY: player · DOUBT: doubter · DISCARD/WON: player
+    TARGET   DOUBT: target · WON: position
+    NUMBER   PLAY/DOUBT: declared number · DISCARD: discarded number
+    COUNT    PLAY: cards played · DOUBT: cards in the doubted play · DISCARD: 4
+    FLAG     PLAY: 1 bluff, 0 honest · DOUBT: 1 correct, 0 wrong
+    JOKERS   DOUBT: jokers discarded
+    BOARD    cards on the board before the event
+    STREAK   plays without a doubt before the event
+    HAND     actor's hand size before the event (after it for DISCARD)
+    CARDS    length of the event's slice of `cards`:
+               START: player ids in turn order, then their initial counts
+               PLAY:  the cards actually played (hidden information — needs `played`)
+               DOUBT: latest_cards, then board_cards
+
+PLAY rows only know FLAG and their cards when the packer is given the actual plays
+(experiments.archive.ArchiveRecorder does); packing a bare history leaves them -1 / empty.
+
+PackedHistory keeps a live game's history in the same layout, behind the list interface
+the engine and the bots use (see DubitoGame's packed_history).
+"""
+from __future__ import annotations
+from collections.abc import Iterable, Sequence
+
+import numpy as np
+
+from .game_data import (
+    GameEvent, GameStartEvent, CardsPlayedEvent, DoubtResolvedEvent, DiscardEvent, PlayerWonEvent,
+)
+
+KIND, TURN, ACTOR, TARGET, NUMBER, COUNT, FLAG, JOKERS, BOARD, STREAK, HAND, CARDS = range(12)
+WIDTH = 12
+COLUMNS = ('kind', 'turn', 'actor', 'target', 'number', 'count', 'flag', 'jokers',
+           'board', 'streak', 'hand', 'cards')
+
+START, PLAY, DOUBT, DISCARD, WON = range(5)
+
+
+def _pack_event(event: GameEvent) -> tuple[list[int], list[int]]:
+    """(row, cards) of one event, with TURN, BOARD, STREAK, HAND and PLAY's FLAG unset."""
+    row = [-1] * WIDTH
+    cards: list[int] = []
+    kind = type(event)
+    if kind is CardsPlayedEvent:
+        row[KIND], row[ACTOR], row[NUMBER], row[COUNT] = PLAY, event.player_id, event.declared_number, event.n_cards
+    elif kind is DoubtResolvedEvent:
+        row[KIND], row[ACTOR], row[TARGET] = DOUBT, event.doubter_id, event.target_id
+        row[NUMBER], row[COUNT], row[FLAG] = event.declared_number, len(event.latest_cards), int(event.correct)
+        row[JOKERS] = event.jokers_discarded
+        cards += event.latest_cards
+        cards += event.board_cards
+    elif kind is GameStartEvent:
+        row[KIND] = START
+        row[ACTOR] = len(event.player_ids)
+        cards += event.player_ids
+        cards += [event.initial_card_counts[p] for p in event.player_ids]
+    elif kind is DiscardEvent:
+        row[KIND], row[ACTOR], row[NUMBER], row[COUNT] = DISCARD, event.player_id, event.card_number, 4
+    elif kind is PlayerWonEvent:
+        row[KIND], row[ACTOR], row[TARGET] = WON, event.player_id, event.position
+    row[CARDS] = len(cards)
+    return row, cards
+
+
+def _unpack_event(row: list[int], chunk: list[int]) -> GameEvent:
+    """Inverse of _pack_event."""
+    kind = row[KIND]
+    if kind == PLAY:
+        return CardsPlayedEvent(player_id=row[ACTOR], declared_number=row[NUMBER], n_cards=row[COUNT])
+    if kind == DOUBT:
+        n = row[COUNT]
+        return DoubtResolvedEvent(
+            doubter_id=row[ACTOR], target_id=row[TARGET], correct=bool(row[FLAG]),
+            latest_cards=tuple(chunk[:n]), board_cards=tuple(chunk[n:]),
+            declared_number=row[NUMBER], jokers_discarded=row[JOKERS],
+        )
+    if kind == START:
+        n = row[ACTOR]
+        ids = tuple(chunk[:n])
+        return GameStartEvent(player_ids=ids, initial_card_counts=dict(zip(ids, chunk[n:])))
+    if kind == DISCARD:
+        return DiscardEvent(player_id=row[ACTOR], card_number=row[NUMBER])
+    return PlayerWonEvent(player_id=row[ACTOR], position=row[TARGET])
+
+
+def pack_game(history: Sequence[GameEvent], played: list[list[int]] | None = None,
+              context: list[tuple[int, int, int, int]] | None = None) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Args:
+        history: The game's event log.
+        played: Actual cards of each CardsPlayedEvent, in order (optional).
+        context: (turn, board, streak, hand) per event (optional).
+
+    Returns:
+        (records, cards) as described in the module docstring.
+    """
+    rows: list[list[int]] = []
+    cards: list[int] = []
+    plays = iter(played) if played is not None else None
+    for i, event in enumerate(history):
+        row, chunk = _pack_event(event)
+        if plays is not None and row[KIND] == PLAY:
+            chunk = next(plays)
+            row[FLAG] = int(any(c not in (0, event.declared_number) for c in chunk))
+            row[CARDS] = len(chunk)
+        if context is not None:
+            row[TURN], row[BOARD], row[STREAK], row[HAND] = context[i]
+        rows.append(row)
+        cards += chunk
+    return np.array(rows, dtype=np.int16).reshape(len(rows), WIDTH), np.array(cards, dtype=np.int8)
+
+
+def unpack_game(records: np.ndarray, cards: np.ndarray) -> tuple[list[GameEvent], list[list[int]]]:
+    """Inverse of pack_game: (history, played). `played` is empty when the plays were not packed."""
+    history: list[GameEvent] = []
+    played: list[list[int]] = []
+    cards = cards.tolist()
+    offset = 0
+    for row in records.tolist():
+        chunk = cards[offset:offset + row[CARDS]]
+        offset += row[CARDS]
+        if row[KIND] == PLAY:
+            history.append(_unpack_event(row, []))
+            if row[CARDS]:
+                played.append(chunk)
+        else:
+            history.append(_unpack_event(row, chunk))
+    return history, played
+
+
+# ── Live histories ────────────────────────────────────────────────────────────
+
+# Event field → record column, for PackedHistory.tally.
+_COLUMNS: dict[type, tuple[int, dict[str, int]]] = {
+    GameStartEvent: (START, {}),
+    CardsPlayedEvent: (PLAY, {'player_id': ACTOR, 'declared_number': NUMBER, 'n_cards': COUNT}),
+    DoubtResolvedEvent: (DOUBT, {'doubter_id': ACTOR, 'target_id': TARGET, 'correct': FLAG,
+                                 'declared_number': NUMBER, 'jokers_discarded': JOKERS}),
+    DiscardEvent: (DISCARD, {'player_id': ACTOR, 'card_number': NUMBER}),
+    PlayerWonEvent: (WON, {'player_id': ACTOR, 'position': TARGET}),
+}
+
+
+def _grown(array: np.ndarray, used: int, need: int) -> np.ndarray:
+    """A copy of array[:used] with room for at least `need` rows."""
+    grown = np.empty((max(need, 2 * len(array), 16),) + array.shape[1:], dtype=array.dtype)
+    grown[:used] = array[:used]
+    return grown
+
+
+class PackedHistory(Sequence):
+    """
+    A game's event log stored as packed records (see the module docstring) instead of
+    event objects: about 30 bytes per event instead of a few hundred.
+
+    Indexing and iteration rebuild the events, so bots read it like a list. A slice
+    history[a:b] is a read-only view sharing the buffers, which makes the per-turn
+    history snapshots of TurnData free; appending to a view copies it first. tally()
+    counts matching events with NumPy, without building them, and the history helpers
+    of game_data use it.
+    """
+
+    def __init__(self, events: Iterable[GameEvent] = (), capacity: int = 128) -> None:
+        self.records = np.empty((capacity, WIDTH), dtype=np.int16)
+        self.starts = np.empty(capacity, dtype=np.int32)    # offset of each event's cards
+        self.cards = np.empty(4 * capacity, dtype=np.int8)
+        self._n = 0
+        self._end = 0                                       # cards in use
+        for event in events:
+            self.append(event)
+
+    @classmethod
+    def _view(cls, records: np.ndarray, starts: np.ndarray, cards: np.ndarray) -> PackedHistory:
+        view = cls.__new__(cls)
+        view.records, view.starts, view.cards = records, starts, cards
+        view._n, view._end = len(records), len(cards)       # full, so append() copies
+        return view
+
+    def append(self, event: GameEvent) -> None:
+        row, chunk = _pack_event(event)
+        n, end = self._n, self._end
+        if n == len(self.records):
+            self.records = _grown(self.records, n, n + 1)
+            self.starts = _grown(self.starts, n, n + 1)
+        if end + len(chunk) > len(self.cards):
+            self.cards = _grown(self.cards, end, end + len(chunk))
+        self.records[n] = row
+        self.starts[n] = end
+        self.cards[end:end + len(chunk)] = chunk
+        self._n, self._end = n + 1, end + len(chunk)
+
+    def __len__(self) -> int:
+        return self._n
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            start, stop, step = index.indices(self._n)
+            if step != 1:
+                return [self[i] for i in range(start, stop, step)]
+            stop = max(start, stop)
+            end = self._end if stop == self._n else int(self.starts[stop])
+            return self._view(self.records[start:stop], self.starts[start:stop], self.cards[:end])
+        if index < 0:
+            index += self._n
+        if not 0 <= index < self._n:
+            raise IndexError('history index out of range')
+        row = self.records[index].tolist()
+        start = int(self.starts[index])
+        return _unpack_event(row, self.cards[start:start + row[CARDS]].tolist())
+
+    def __iter__(self):
+        cards = self.cards[:self._end].tolist()
+        for row, start in zip(self.records[:self._n].tolist(), self.starts[:self._n].tolist()):
+            yield _unpack_event(row, cards[start:start + row[CARDS]])
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Sequence):
+            return NotImplemented
+        return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+
+    __hash__ = None
+
+    def tally(self, event_type: type, **fields) -> int:
+        """Events of `event_type` whose fields equal the given values, e.g.
+        tally(DoubtResolvedEvent, target_id=3, correct=True)."""
+        kind, columns = _COLUMNS[event_type]
+        records = self.records[:self._n]
+        mask = records[:, KIND] == kind
+        for name, value in fields.items():
+            mask &= records[:, columns[name]] == value
+        return int(np.count_nonzero(mask))
+
+    def arrays(self) -> tuple[np.ndarray, np.ndarray]:
+        """(records, cards) copies, as pack_game would return for the same events."""
+        first = int(self.starts[0]) if self._n else 0
+        return self.records[:self._n].copy(), self.cards[first:self._end].copy()
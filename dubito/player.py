@@ -71,9 +71,12 @@ class Player(ABC):
     
     def reset(self) -> None:
         """
-        Resets the player's hand to an empty state.
+        Clears everything a game leaves on the player. initialize() calls it before every
+        deal and PlayerPool before an instance is seated again, so after reset() a player
+        must behave exactly like a fresh `cls(id)`. Subclasses that keep per-game state
+        override it and call super().reset(). The hand object itself is kept and emptied.
         """
-        self.cards = Hand(hand = [])
+        self.cards.hand = []
         
     def all_equal(self) -> bool:
         """
@@ -264,4 +267,39 @@ class PlayerAI(Player):
                 amount_to_choice = list(range(1, card_count + 1))
                 cards_number = random.choice(amount_to_choice)
                 picked_cards = self.cards.pick(input_player.current_number, cards_number)
-            return TurnOutput(doubt=False, number=None, cards=picked_cards)
\ No newline at end of file
+            return TurnOutput(doubt=False, number=None, cards=picked_cards)
+
+
+class PlayerPool:
+    """
+    Player instances kept across games, one per (class, seat id), so that long runs seat
+    the same objects again instead of constructing a lineup for every game. An instance
+    is reset() before it is handed out again (see Player.reset for the contract), and a
+    game_result from an earlier game may therefore name an instance now playing another.
+    """
+
+    def __init__(self) -> None:
+        self._players: dict[tuple[type, int], Player] = {}
+
+    def seat(self, lineup: list[type]) -> list[Player]:
+        """
+        Players for `lineup`, with ids 1..n in lineup order.
+
+        Args:
+            lineup (list[type]): Player classes, one per seat.
+
+        Returns:
+            list[Player]: Pooled instances, reset, or new ones on first use.
+        """
+        players = []
+        for i, cls in enumerate(lineup, start=1):
+            player = self._players.get((cls, i))
+            if player is None:
+                player = self._players[(cls, i)] = cls(i)
+            else:
+                player.reset()
+            players.append(player)
+        return players
+
+    def __len__(self) -> int:
+        return len(self._players)
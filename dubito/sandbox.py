@@ -0,0 +1,256 @@
+"""
+Sandbox — per-decision deadlines and crash isolation for untrusted bots.
+
+dubito(..., sandbox=Sandbox()) routes every player.play() call through Sandbox.decide:
+
+    deadline    a decision that takes longer than `deadline` seconds is a timeout. In the
+                main thread of a Unix process a hanging play() is also interrupted
+                (SIGALRM); elsewhere it runs to its end and is discarded, so slow bots are
+                penalised the same way either way.
+    exceptions  anything play() raises.
+    illegal     not a TurnOutput, a doubt on the first hand, 0 or more than 3 cards, cards
+                the player did not hold (its hand before the call must equal its hand after
+                plus the cards played), or a first-hand number outside 0..13.
+
+Whatever the fault, the player's hand is restored and the `fallback` action is played
+instead:
+
+    'random'    one random card from the hand (declaring a random number in circulation
+                on the first hand)
+    'honest'    one card of the current number or a joker when held, else 'random'
+    'doubt'     doubt whenever allowed, else 'random'
+    callable    fallback(player, turn_data) -> TurnOutput, itself trusted
+
+Faults are counted per player id and published in game_infos['sandbox'] as
+{player_id: {'decision_timeouts': n, 'exceptions': n, 'illegal_moves': n}}.
+
+Bots whose class name is in `isolate` play in their own worker process, one per seat,
+which keeps a mirror instance of the bot: every decision sends the TurnData and the
+current hand and gets back the action and the hand. A worker that overruns its deadline
+is killed and restarted for the next decision, so a bot that hangs or crashes its
+interpreter costs a fallback move instead of the run. Call close() to stop the workers.
+"""
+from __future__ import annotations
+import multiprocessing
+import random
+import signal
+import threading
+import time
+from collections import Counter
+from typing import Callable, TYPE_CHECKING
+
+from .game_data import TurnData, TurnOutput
+from .observers import GameObserver
+
+if TYPE_CHECKING:
+    from .handlers import GameHandler
+    from .player import Player
+
+FAULTS = ('decision_timeouts', 'exceptions', 'illegal_moves')
+
+
+class DecisionTimeout(BaseException):
+    """Raised into a play() that overran its deadline; a BaseException so that a bot's own
+    `except Exception` cannot swallow it."""
+
+
+def _on_alarm(signum, frame):
+    raise DecisionTimeout()
+
+
+def _can_interrupt() -> bool:
+    return hasattr(signal, 'setitimer') and threading.current_thread() is threading.main_thread()
+
+
+def is_legal(output: object, turn_data: TurnData, hand_before: list[int], hand_after: list[int]) -> bool:
+    """Whether `output` is a legal action for the player whose hand went from
+    `hand_before` to `hand_after` while choosing it."""
+    if not isinstance(output, TurnOutput):
+        return False
+    first_hand = turn_data.board_cards == 0
+    if output.doubt:
+        return not first_hand and Counter(hand_before) == Counter(hand_after)
+    cards = output.cards
+    if not isinstance(cards, list) or not 1 <= len(cards) <= 3:
+        return False
+    if Counter(hand_before) != Counter(hand_after) + Counter(cards):
+        return False
+    if first_hand and not (isinstance(output.number, int) and 0 <= output.number <= 13):
+        return False
+    return True
+
+
+# ── Fallback actions ──────────────────────────────────────────────────────────
+
+def _random_play(player: Player, turn_data: TurnData) -> TurnOutput:
+    cards = player.cards.pick_random(1)
+    number = random.choice(turn_data.playing_cards or cards) if turn_data.board_cards == 0 else None
+    return TurnOutput(doubt=False, number=number, cards=cards)
+
+
+def _honest_play(player: Player, turn_data: TurnData) -> TurnOutput:
+    if turn_data.board_cards:
+        for card in (turn_data.current_number, 0):
+            if card in player.cards.hand:
+                return TurnOutput(doubt=False, number=None, cards=player.cards.pick(card, 1))
+    return _random_play(player, turn_data)
+
+
+def _doubt(player: Player, turn_data: TurnData) -> TurnOutput:
+    if turn_data.board_cards:
+        return TurnOutput(doubt=True, number=None, cards=None)
+    return _random_play(player, turn_data)
+
+
+FALLBACKS: dict[str, Callable[[Player, TurnData], TurnOutput]] = {
+    'random': _random_play,
+    'honest': _honest_play,
+    'doubt': _doubt,
+}
+
+
+# ── Isolated workers ──────────────────────────────────────────────────────────
+
+def _serve(conn, cls: type, player_id: int) -> None:
+    """Worker process loop: a mirror bot answering ('play', turn_data, hand) and ('reset',).
+    The bot's shared resources are loaded (BotBase.preload) before it reports ready, so
+    that time never counts against a decision's deadline."""
+    preload = getattr(cls, 'preload', None)
+    if preload is not None:
+        preload()
+    bot = cls(player_id)
+    conn.send(('ready',))
+    while True:
+        try:
+            message = conn.recv()
+        except EOFError:
+            return
+        if message[0] == 'reset':
+            bot.reset()
+            continue
+        _, turn_data, hand = message
+        bot.cards.hand = list(hand)
+        try:
+            output = bot.play(turn_data)
+            conn.send(('ok', output, list(bot.cards.hand)))
+        except Exception as e:                             # reported, the worker lives on
+            conn.send(('error', f'{type(e).__name__}: {e}', None))
+
+
+class _Worker:
+
+    def __init__(self, cls: type, player_id: int) -> None:
+        self.conn, child = multiprocessing.Pipe()
+        self.process = multiprocessing.Process(target=_serve, args=(child, cls, player_id), daemon=True)
+        self.process.start()
+        child.close()
+        try:
+            self.conn.recv()                               # ('ready',) once the bot is loaded
+        except (EOFError, OSError):                        # it died loading
+            self.stop()
+            raise
+
+    def stop(self) -> None:
+        self.conn.close()
+        self.process.terminate()
+        self.process.join()
+
+
+class Sandbox(GameObserver):
+
+    key = 'sandbox'
+
+    def __init__(self, deadline: float | None = 1.0,
+                 fallback: str | Callable[[Player, TurnData], TurnOutput] = 'random',
+                 isolate: set[str] | list[str] = ()) -> None:
+        """
+        Args:
+            deadline (float | None): Seconds per decision; None disables the deadline.
+                Defaults to 1.
+            fallback (str | callable): Action played on a fault (see the module
+                docstring). Defaults to 'random'.
+            isolate (set[str]): Bot class names played in worker processes.
+        """
+        self.deadline = deadline
+        self.fallback = FALLBACKS[fallback] if isinstance(fallback, str) else fallback
+        self.isolate = set(isolate)
+        self.faults: dict[int, Counter] = {}
+        self._workers: dict[tuple[str, int], _Worker] = {}
+
+    # ── GameObserver ──────────────────────────────────────────────────────────
+
+    def on_game_start(self, game_handler: GameHandler) -> None:
+        self.faults = {p.id: Counter() for p in game_handler.players.all}
+        for p in game_handler.players.all:
+            worker = self._workers.get((p.__class__.__name__, p.id))
+            if worker is not None:
+                worker.conn.send(('reset',))
+
+    def result(self) -> dict[int, dict[str, int]]:
+        return {pid: {f: c[f] for f in FAULTS} for pid, c in self.faults.items()}
+
+    # ── Decisions ─────────────────────────────────────────────────────────────
+
+    def decide(self, player: Player, turn_data: TurnData) -> TurnOutput:
+        """player.play(turn_data) under the deadline, or the fallback on any fault."""
+        before = list(player.cards.hand)
+        if player.__class__.__name__ in self.isolate:
+            fault, output = self._play_isolated(player, turn_data)
+        else:
+            fault, output = self._play_local(player, turn_data)
+        if fault is None and not is_legal(output, turn_data, before, player.cards.hand):
+            fault = 'illegal_moves'
+        if fault is None:
+            return output
+        self.faults.setdefault(player.id, Counter())[fault] += 1
+        player.cards.hand = before
+        return self.fallback(player, turn_data)
+
+    def _play_local(self, player: Player, turn_data: TurnData) -> tuple[str | None, TurnOutput | None]:
+        interrupt = self.deadline is not None and _can_interrupt()
+        if interrupt:
+            previous = signal.signal(signal.SIGALRM, _on_alarm)
+            signal.setitimer(signal.ITIMER_REAL, self.deadline)
+        start = time.perf_counter()
+        try:
+            try:
+                output = player.play(turn_data)
+            finally:
+                if interrupt:
+                    signal.setitimer(signal.ITIMER_REAL, 0)
+        except DecisionTimeout:
+            return 'decision_timeouts', None
+        except Exception:
+            return 'exceptions', None
+        finally:
+            if interrupt:
+                signal.signal(signal.SIGALRM, previous)
+        if self.deadline is not None and time.perf_counter() - start > self.deadline:
+            return 'decision_timeouts', None
+        return None, output
+
+    def _play_isolated(self, player: Player, turn_data: TurnData) -> tuple[str | None, TurnOutput | None]:
+        key = (player.__class__.__name__, player.id)
+        worker = self._workers.get(key)
+        try:
+            if worker is None or not worker.process.is_alive():
+                worker = self._workers[key] = _Worker(player.__class__, player.id)
+            worker.conn.send(('play', turn_data, list(player.cards.hand)))
+            if not worker.conn.poll(self.deadline):
+                worker.stop()
+                del self._workers[key]
+                return 'decision_timeouts', None
+            status, output, hand = worker.conn.recv()
+        except (EOFError, OSError):                        # the worker died
+            if key in self._workers:
+                self._workers.pop(key).stop()
+            return 'exceptions', None
+        if status != 'ok':
+            return 'exceptions', None
+        player.cards.hand = hand
+        return None, output
+
+    def close(self) -> None:
+        for worker in self._workers.values():
+            worker.stop()
+        self._workers.clear()
@@ -0,0 +1,372 @@
+"""
+GameState — compact, cloneable mirror of the Dubito rules for search and rollouts.
+
+The object engine (DubitoGame over Player/Hand) is what bots play against: bots pick
+cards out of their own Hand. Search needs the opposite trade-off — thousands of
+copies of a position per decision — so GameState keeps the whole game in a handful of
+flat lists and ints:
+
+    hands[seat]   count vector, index 0 = jokers, 1..13 = face values
+    board         count vector of the pile; `latest` holds the last play
+    avail         int bitmask of numbers still in circulation (bit n = number n)
+    playing       seats still in the game, in turn order
+
+Seats are indexes into `ids` (turn order at the deal). Turn progression, doubt
+resolution, discards and winner anchoring follow DubitoGame exactly, so a game
+replayed through both engines ends identically (see tests.TestGameState).
+
+A state is always positioned on the player to move (`to_move`); apply(output)
+resolves that player's action and advances to the next one.
+"""
+from __future__ import annotations
+import random
+
+from .game_data import (
+    TurnData, TurnOutput,
+    CardsPlayedEvent, DoubtResolvedEvent, DiscardEvent, PlayerWonEvent, GameStartEvent,
+)
+
+N_NUMBERS = 14   # joker + 13 face values
+
+
+def _counts(cards: list[int]) -> list[int]:
+    counts = [0] * N_NUMBERS
+    for c in cards:
+        counts[c] += 1
+    return counts
+
+
+def _cards(counts: list[int]) -> list[int]:
+    return [n for n in range(N_NUMBERS) for _ in range(counts[n])]
+
+
+def _bits(avail: int) -> list[int]:
+    return [n for n in range(1, N_NUMBERS) if avail >> n & 1]
+
+
+def _multisets(counts: list[int], size: int, start: int = 0) -> list[list[int]]:
+    """All distinct multisets of exactly `size` cards drawable from `counts`."""
+    if size == 0:
+        return [[]]
+    out = []
+    for n in range(start, N_NUMBERS):
+        if counts[n]:
+            counts[n] -= 1
+            out += [[n] + rest for rest in _multisets(counts, size - 1, n)]
+            counts[n] += 1
+    return out
+
+
+class GameState:
+    __slots__ = (
+        'ids', 'hands', 'sizes', 'board', 'board_n', 'latest', 'number', 'avail',
+        'streak', 'turn', 'playing', 'winners', 'pos', 'prev', 'this', 'next',
+        'replay', 'max_turns', 'stall_turns', 'progress_turn', 'stalled', 'history',
+    )
+
+    # ── Construction ──────────────────────────────────────────────────────────
+
+    def __init__(
+            self,
+            ids: list[int],
+            hands: list[list[int]],
+            deck_size: int = 14,
+            max_turns: int = 1_000,
+            record_history: bool = False,
+            stall_turns: int | None = None,
+    ) -> None:
+        """
+        Start a game from dealt hands (card lists, in turn order).
+
+        Args:
+            ids (list[int]): Player id of each seat.
+            hands (list[list[int]]): Each seat's cards.
+            deck_size (int): Same meaning as in create_deck(). Defaults to 14.
+            max_turns (int): Turn cap, as in dubito(). Defaults to 1_000.
+            record_history (bool): Keep the GameEvent log needed by turn_data().
+                Leave off for rollouts — it is the only per-turn allocation.
+            stall_turns (int | None): Stall rule, as in dubito(). Defaults to None.
+        """
+        self.ids = tuple(ids)
+        self.hands = [_counts(h) for h in hands]
+        self.sizes = [len(h) for h in hands]
+        self.board = [0] * N_NUMBERS
+        self.board_n = 0
+        self.latest: tuple[int, ...] = ()
+        self.number = 0
+        self.avail = sum(1 << n for n in range(1, deck_size))
+        self.streak = 0
+        self.turn = 0
+        self.playing = list(range(len(ids)))
+        self.winners: list[int] = []
+        self.pos = len(ids) - 1
+        self.prev = self.this = self.next = 0
+        self.replay = False
+        self.max_turns = max_turns
+        self.stall_turns = float('inf') if stall_turns is None else stall_turns
+        self.progress_turn = 0
+        self.stalled = False
+        self.history = None
+        if record_history:
+            self.history = [GameStartEvent(
+                player_ids=tuple(ids),
+                initial_card_counts={pid: len(h) for pid, h in zip(ids, hands)},
+            )]
+        if not self.is_over():
+            self._next_turn()
+
+    @classmethod
+    def deal(cls, n_players: int, deck_size: int = 14, n_jollies: int = 2,
+             max_turns: int = 1_000, record_history: bool = False, stall_turns: int | None = None) -> GameState:
+        """Deal a fresh game with the same deck and retry rule as initialize()."""
+        from .core_game import create_deck
+        while True:
+            deck = create_deck(deck_size, n_jollies)
+            hands = [deck[i::n_players] for i in range(n_players)]
+            if not any(max(_counts(h)) >= 4 for h in hands):
+                break
+        return cls(list(range(1, n_players + 1)), hands, deck_size, max_turns, record_history, stall_turns)
+
+    @classmethod
+    def from_game(cls, game, record_history: bool = False) -> GameState:
+        """Snapshot a live DubitoGame. Taken between next_turn() and apply(), the
+        snapshot is on the same decision the live game is waiting for."""
+        gh = game.game_handler
+        players = gh.players.all
+        seat = {p.id: i for i, p in enumerate(players)}
+        state = cls.__new__(cls)
+        state.ids = tuple(p.id for p in players)
+        state.hands = [_counts(p.cards.hand) for p in players]
+        state.sizes = [len(p.cards) for p in players]
+        state.board = _counts(gh.get_board())
+        state.board_n = gh.n_cards_board()
+        state.latest = tuple(gh.get_latest_played_cards())
+        state.number = gh.get_current_number()
+        state.avail = sum(1 << n for n in gh.board.availables)
+        state.streak = gh.turn.streak
+        state.turn = gh.turn.counter
+        state.playing = [seat[p.id] for p in gh.playing_players()]
+        state.winners = [seat[p.id] for p in gh.get_winners()]
+        state.pos = gh.turn.position
+        state.prev = seat[gh.players.prev.id] if gh.players.prev else 0
+        state.this = seat[gh.players.this.id] if gh.players.this else 0
+        state.next = seat[gh.players.next.id] if gh.players.next else 0
+        state.replay = game.replay_turn
+        state.max_turns = game.max_turns
+        state.stall_turns = float('inf') if game.stall_turns is None else game.stall_turns
+        state.progress_turn = game.progress_turn
+        state.stalled = game.is_stalled()
+        state.history = list(gh.history) if record_history else None
+        if game.turn_data is None and not state.is_over():
+            state._advance()
+        return state
+
+    def clone(self) -> GameState:
+        new = GameState.__new__(GameState)
+        new.ids = self.ids
+        new.hands = [h[:] for h in self.hands]
+        new.sizes = self.sizes[:]
+        new.board = self.board[:]
+        new.board_n = self.board_n
+        new.latest = self.latest
+        new.number = self.number
+        new.avail = self.avail
+        new.streak = self.streak
+        new.turn = self.turn
+        new.playing = self.playing[:]
+        new.winners = self.winners[:]
+        new.pos = self.pos
+        new.prev = self.prev
+        new.this = self.this
+        new.next = self.next
+        new.replay = self.replay
+        new.max_turns = self.max_turns
+        new.stall_turns = self.stall_turns
+        new.progress_turn = self.progress_turn
+        new.stalled = self.stalled
+        new.history = None if self.history is None else self.history[:]
+        return new
+
+    def key(self) -> tuple:
+        """Hashable encoding of the position: everything that affects how the rest of
+        the game can unfold (turn counter, streak and history excluded)."""
+        return (
+            tuple(tuple(h) for h in self.hands), tuple(self.board), self.latest,
+            self.number, self.avail, tuple(self.playing), tuple(self.winners),
+            self.prev, self.this, self.next, self.pos,
+        )
+
+    # ── Queries ───────────────────────────────────────────────────────────────
+
+    @property
+    def to_move(self) -> int:
+        """Seat of the player whose decision is pending."""
+        return self.this
+
+    def is_over(self) -> bool:
+        return len(self.playing) <= 2 or self.turn >= self.max_turns or self.stalled
+
+    def is_first_hand(self) -> bool:
+        return self.board_n == 0
+
+    def is_honest(self) -> bool:
+        return all(c == 0 or c == self.number for c in self.latest)
+
+    def hand(self, seat: int) -> list[int]:
+        """Seat's cards as a sorted list (the Hand representation)."""
+        return _cards(self.hands[seat])
+
+    def availables(self) -> list[int]:
+        return _bits(self.avail)
+
+    def losers(self) -> list[int]:
+        return self.playing[:] if self.is_over() else []
+
+    def legal_actions(self) -> list[TurnOutput]:
+        """
+        Every distinct action open to the player to move: doubt (not on the first hand)
+        and each multiset of 1–3 cards from their hand. On the first hand each play is
+        paired with every number still in circulation — declaring a discarded number is
+        allowed by the engine but can only be honest with jokers, so it is never better.
+        """
+        seat = self.this
+        actions = [] if self.board_n == 0 else [TurnOutput(doubt=True, number=None, cards=None)]
+        counts = self.hands[seat][:]
+        plays = [cards for k in range(1, min(3, self.sizes[seat]) + 1) for cards in _multisets(counts, k)]
+        if self.board_n:
+            actions += [TurnOutput(doubt=False, number=None, cards=cards) for cards in plays]
+        else:
+            numbers = _bits(self.avail) or list(range(1, N_NUMBERS))
+            actions += [TurnOutput(doubt=False, number=n, cards=cards) for cards in plays for n in numbers]
+        return actions
+
+    def turn_data(self) -> TurnData:
+        """TurnData for the player to move, as generate_player_data() would build it."""
+        ids = self.ids
+        return TurnData(
+            my_cards=self.hand(self.this),
+            current_number=self.number,
+            board_cards=self.board_n,
+            n_cards_played=len(self.latest),
+            playing_cards=_bits(self.avail),
+            n_players=len(self.playing),
+            player_card_counts={ids[s]: self.sizes[s] for s in self.playing},
+            streak=self.streak,
+            my_player_id=ids[self.this],
+            prev_player_id=ids[self.prev],
+            next_player_id=ids[self.next],
+            history=list(self.history) if self.history is not None else [],
+        )
+
+    # ── Transitions ───────────────────────────────────────────────────────────
+
+    def apply(self, output: TurnOutput) -> None:
+        """Resolve the pending action, run discards and winner detection, and advance
+        to the next player to move."""
+        if output.doubt:
+            if self.board_n == 0:
+                raise ValueError(f"Player{self.ids[self.this]} cannot doubt in the first round")
+            receiver = self._resolve_doubt()
+        else:
+            self._play(output)
+            receiver = None
+        self._end_of_turn(receiver)
+        self.stalled = self.turn - self.progress_turn >= self.stall_turns
+        if not self.is_over():
+            self._advance()
+
+    def _advance(self) -> None:
+        if self.replay:
+            self.replay = False
+        else:
+            self._next_turn()
+
+    def _next_turn(self) -> None:
+        self.turn += 1
+        self.streak += 1
+        playing = self.playing
+        n = len(playing)
+        self.prev = playing[self.pos]
+        self.pos = (self.pos + 1) % n
+        self.this = playing[self.pos]
+        self.next = playing[(self.pos + 1) % n]
+
+    def _play(self, output: TurnOutput) -> None:
+        cards = output.cards
+        hand = self.hands[self.this]
+        for c in cards:
+            hand[c] -= 1
+        if min(hand) < 0 or not cards:
+            for c in cards:
+                hand[c] += 1
+            raise ValueError(f"Player{self.ids[self.this]} cannot play {cards}")
+        self.sizes[self.this] -= len(cards)
+
+        if self.board_n == 0:
+            number = output.number
+            if number == 0:
+                number = random.choice(_bits(self.avail) or cards)
+            self.number = number
+        board = self.board
+        for c in cards:
+            board[c] += 1
+        self.board_n += len(cards)
+        self.latest = tuple(cards)
+        if self.history is not None:
+            self.history.append(CardsPlayedEvent(
+                player_id=self.ids[self.this], declared_number=self.number, n_cards=len(cards),
+            ))
+
+    def _resolve_doubt(self) -> int:
+        """Hand the pile to the loser of the doubt. Returns the loser's seat."""
+        jokers = self.latest.count(0)
+        if self.is_honest():
+            loser, correct = self.this, False
+            self.board[0] -= jokers
+            self.board_n -= jokers
+            if jokers:
+                self.progress_turn = self.turn
+        else:
+            loser, correct = self.prev, True
+            jokers = 0
+            self.replay = True
+        if self.history is not None:
+            self.history.append(DoubtResolvedEvent(
+                doubter_id=self.ids[self.this], target_id=self.ids[self.prev], correct=correct,
+                latest_cards=self.latest, board_cards=tuple(_cards(self.board)),
+                declared_number=self.number, jokers_discarded=jokers,
+            ))
+        hand = self.hands[loser]
+        for n, c in enumerate(self.board):
+            hand[n] += c
+        self.sizes[loser] += self.board_n
+        self.board = [0] * N_NUMBERS
+        self.board_n = 0
+        self.number = 0
+        self.streak = 0
+        self.latest = ()
+        return loser
+
+    def _end_of_turn(self, receiver: int | None) -> None:
+        # Only a pile pickup can complete four of a kind.
+        if receiver is not None:
+            hand = self.hands[receiver]
+            for n in range(N_NUMBERS):
+                if hand[n] >= 4:
+                    self.progress_turn = self.turn
+                    self.sizes[receiver] -= hand[n]
+                    hand[n] = 0
+                    self.avail &= ~(1 << n)
+                    if self.history is not None:
+                        self.history.append(DiscardEvent(player_id=self.ids[receiver], card_number=n))
+
+        for seat in [s for s in self.playing if self.sizes[s] == 0]:
+            self.progress_turn = self.turn
+            self.winners.append(seat)
+            self.playing.remove(seat)
+            if self.history is not None:
+                self.history.append(PlayerWonEvent(player_id=self.ids[seat], position=len(self.winners)))
+            if not self.playing:
+                continue
+            anchor = self.prev if seat == self.this else self.this
+            self.pos = self.playing.index(anchor) if anchor in self.playing else 0
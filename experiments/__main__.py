@@ -1,29 +1,99 @@
 import sys
 
-from .runner import ALL_BOTS, load_config, save_stats, print_summary, play_games
-from .report import generate_html_site
+from .runner import (ALL_BOTS, DEFAULT_BOTS, load_config, check_config, save_stats, print_summary, print_paired,
+                     print_stopping, play_games, play_duplicate, play_adaptive, play_cached, play_lockstep)
 
 
 if __name__ == '__main__':
     config_path = sys.argv[1] if len(sys.argv) > 1 else 'experiment.yaml'
     config = load_config(config_path)
+    check_config(config)
 
-    bot_names         = config.get('bots', list(ALL_BOTS.keys()))
+    bot_names         = config.get('bots', DEFAULT_BOTS)
     algorithms        = [ALL_BOTS[name] for name in bot_names]
     available_players = config['available_players']
     n_experiments     = config['n_experiments']
     output_file = config.get('output_file', 'all_games.yaml')
     output_dir  = config.get('output_dir', 'report_site')
+    mode        = config.get('mode', 'random')
 
-    print(f"Running {n_experiments:,} games with {len(algorithms)} bots "
+    print(f"Running {n_experiments:,} games ({mode} mode) with {len(algorithms)} bots "
           f"and {available_players[0]}–{available_players[-1]} players per game.")
 
-    final_infos = play_games(algorithms, available_players, n_experiments)
+    # Every option is imported only by the runs that set it (http.server for telemetry,
+    # multiprocessing for the sandbox, ...)
+    scheduler = None
+    if config.get('schedule') == 'uncertainty':
+        from .scheduler import LineupScheduler
+        scheduler = LineupScheduler(algorithms)
+    ratings_file = config.get('ratings_file')
+    ratings = None
+    if ratings_file:
+        from .ratings import Ratings
+        ratings = Ratings.load(ratings_file)
+    archive = None
+    if config.get('archive'):
+        from .archive import ArchiveWriter
+        archive = ArchiveWriter(config['archive'], seed=config.get('seed'))
+    telemetry = None
+    if config.get('telemetry') or config.get('telemetry_port'):
+        from .telemetry import Telemetry
+        telemetry = Telemetry(config.get('telemetry'), config.get('telemetry_every', 5.0), config.get('telemetry_port'))
+        if telemetry.url:
+            print(f"Live progress at {telemetry.url}")
+    sandbox = None
+    if config.get('sandbox'):
+        from dubito.sandbox import Sandbox
+        sandbox = Sandbox(**config['sandbox'])
 
-    save_stats(final_infos, output_file)
+    run = None
+    if mode == 'duplicate':
+        final_infos, run = play_duplicate(algorithms, available_players, n_experiments, config.get('seed'),
+                                          ratings=ratings)
+    elif mode == 'cached':
+        from .cache import ResultCache
+        cache = ResultCache(config.get('cache_dir', '.dubito_cache'))
+        final_infos, run = play_cached(algorithms, available_players, n_experiments, config.get('seed', 0),
+                                       config.get('block_size', 100), cache)
+        print(f"Cache: {run['cached_blocks']:,} blocks reused, {run['simulated_blocks']:,} simulated.")
+    elif mode == 'farm':
+        from .farm import play_farm
+        final_infos, run = play_farm(algorithms, available_players, n_experiments, config.get('farm_dir', 'farm'),
+                                     config.get('seed', 0), config.get('block_size', 100),
+                                     config.get('lease', 600.0), config.get('poll', 1.0),
+                                     config.get('local_workers', 0))
+        print(f"Farm: {run['shards']:,} shards merged, {run['reissued']:,} re-issued.")
+    elif mode == 'lockstep':
+        final_infos, run = play_lockstep(algorithms, available_players, n_experiments, config.get('seed', 0),
+                                         config.get('batch_size', 10_000))
+    elif mode == 'adaptive':
+        final_infos, run = play_adaptive(algorithms, available_players, n_experiments,
+                                         config.get('precision', 0.005), config.get('check_every', 10_000),
+                                         scheduler=scheduler, ratings=ratings, archive=archive,
+                                         telemetry=telemetry, sandbox=sandbox)
+    else:
+        final_infos = play_games(algorithms, available_players, n_experiments, scheduler, ratings, archive,
+                                 telemetry, sandbox)
+    if sandbox is not None:
+        sandbox.close()
+    if telemetry is not None:
+        telemetry.close()
+
+    save_stats(final_infos, output_file, run)
     print(f"\nResults saved to {output_file}")
+    if ratings is not None:
+        ratings.save(ratings_file)
+        print(f"Ratings saved to {ratings_file}")
+    if archive is not None:
+        archive.close()
+        print(f"Games archived to {config['archive']}")
 
     print_summary(final_infos)
+    if mode == 'duplicate':
+        print_paired(final_infos, run)
+    elif mode == 'adaptive':
+        print_stopping(final_infos, run)
 
     print('\nGenerating HTML site...')
-    generate_html_site(final_infos, config, output_dir)
+    from .report import generate_html_site
+    generate_html_site(final_infos, config, output_dir, run, ratings)
@@ -0,0 +1,254 @@
+"""
+Game archive — every event of every game, compressed and indexed for random access.
+
+Set `archive: games_archive/` in experiment.yaml and each game is seeded, recorded by an
+ArchiveRecorder and packed (dubito/packing.py) into chunked files:
+
+    games_archive/
+        meta.json            bot names, record width, chunk list
+        index.npz            per game: game_id, seed, chunk, row, n_players, bots
+        chunk-00000.npz      records + cards of `chunk_size` games, zip-compressed
+
+The index is all a reader loads up front; a game's chunk is opened only when one of its
+games is asked for. Games are reproducible: the stored seed and lineup re-run the exact
+game (ArchiveReader.replay), as long as the bots draw their randomness from `random`.
+
+    reader = ArchiveReader('games_archive')
+    game = reader.game(42)                         # history + the actual cards played
+    for game in reader.games(reader.find(bot='HonestBot')):
+        ...
+"""
+from __future__ import annotations
+import json
+import os
+import random
+from dataclasses import dataclass
+from typing import Iterator, Sequence, TYPE_CHECKING
+
+import numpy as np
+
+from dubito.core_game import dubito
+from dubito.game_data import TurnData, TurnOutput, CardsPlayedEvent, DoubtResolvedEvent, DiscardEvent, PlayerWonEvent
+from dubito.observers import GameObserver
+from dubito.packing import WIDTH, pack_game, unpack_game
+from dubito.player import Player
+from bots.base import BotBase
+
+if TYPE_CHECKING:
+    from dubito.handlers import GameHandler
+
+MAX_SEATS = 8
+
+
+class ArchiveRecorder(GameObserver):
+    """Packs the game being played, with the hidden plays and per-event context."""
+
+    key = 'archive'
+
+    def __init__(self) -> None:
+        self.played: list[list[int]] = []
+        self.context: list[tuple[int, int, int, int]] = []
+        self._pending = (-1, -1, -1, -1)
+        self.packed: tuple[np.ndarray, np.ndarray] | None = None
+
+    def on_game_start(self, game_handler: GameHandler) -> None:
+        self.played, self.context, self.packed = [], [(0, 0, 0, -1)], None
+
+    def on_turn(self, game_handler: GameHandler, player: Player,
+                turn_data: TurnData, output: TurnOutput) -> None:
+        self._pending = (game_handler.turn.counter, turn_data.board_cards, turn_data.streak, len(turn_data.my_cards))
+
+    def on_play(self, game_handler: GameHandler, player: Player, event: CardsPlayedEvent) -> None:
+        self.played.append(list(game_handler.get_latest_played_cards()))
+        self.context.append(self._pending)
+
+    def on_doubt(self, game_handler: GameHandler, doubter: Player, target: Player,
+                 event: DoubtResolvedEvent) -> None:
+        self.context.append(self._pending)
+
+    def _after(self, game_handler: GameHandler, player: Player) -> tuple[int, int, int, int]:
+        return game_handler.turn.counter, game_handler.n_cards_board(), game_handler.turn.streak, len(player.cards)
+
+    def on_discard(self, game_handler: GameHandler, player: Player, event: DiscardEvent) -> None:
+        self.context.append(self._after(game_handler, player))
+
+    def on_win(self, game_handler: GameHandler, player: Player, event: PlayerWonEvent) -> None:
+        self.context.append(self._after(game_handler, player))
+
+    def on_game_end(self, game_handler: GameHandler) -> None:
+        self.packed = pack_game(game_handler.history, self.played, self.context)
+
+    def result(self) -> tuple[np.ndarray, np.ndarray] | None:
+        return self.packed
+
+
+@dataclass
+class ArchivedGame:
+    game_id: int
+    seed: int
+    bots: list[str]            # bot class per player id (bots[0] is Player1)
+    records: np.ndarray
+    cards: np.ndarray
+
+    def unpack(self) -> tuple[list, list[list[int]]]:
+        """(history, played): the game's event log and the actual cards of every play."""
+        return unpack_game(self.records, self.cards)
+
+
+def _load_index(path: str) -> dict[str, np.ndarray]:
+    with np.load(os.path.join(path, 'index.npz')) as f:
+        return {k: f[k] for k in f.files}
+
+
+class ArchiveWriter:
+
+    def __init__(self, path: str, chunk_size: int = 1_000, seed: int | None = None) -> None:
+        """
+        Args:
+            path (str): Archive directory; an existing archive is appended to.
+            chunk_size (int): Games per chunk file. Defaults to 1_000.
+            seed (int | None): Seeds the per-game seeds. Defaults to None.
+        """
+        self.path = path
+        self.chunk_size = chunk_size
+        self.rng = random.Random(seed)
+        os.makedirs(path, exist_ok=True)
+        meta_path = os.path.join(path, 'meta.json')
+        if os.path.exists(meta_path):
+            with open(meta_path) as f:
+                self.meta = json.load(f)
+            self.index = {k: list(v) for k, v in _load_index(path).items()}
+        else:
+            self.meta = {'version': 1, 'width': WIDTH, 'bots': [], 'chunks': []}
+            self.index = {k: [] for k in ('game_id', 'seed', 'chunk', 'row', 'n_players', 'bots')}
+        self._buffer: list[tuple] = []
+
+    def __enter__(self) -> ArchiveWriter:
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def next_seed(self) -> int:
+        return self.rng.getrandbits(62)
+
+    def _code(self, bot: str) -> int:
+        if bot not in self.meta['bots']:
+            self.meta['bots'].append(bot)
+        return self.meta['bots'].index(bot)
+
+    def add(self, seed: int, bot_names: list[str], records: np.ndarray, cards: np.ndarray) -> int:
+        """Queue one packed game; `bot_names` lists the bot class per player id. Returns its id."""
+        game_id = len(self.index['game_id']) + len(self._buffer)
+        codes = [self._code(b) for b in bot_names] + [-1] * (MAX_SEATS - len(bot_names))
+        self._buffer.append((game_id, seed, codes, records, cards))
+        if len(self._buffer) >= self.chunk_size:
+            self.flush()
+        return game_id
+
+    def flush(self) -> None:
+        if not self._buffer:
+            return
+        chunk = len(self.meta['chunks'])
+        name = f'chunk-{chunk:05d}.npz'
+        ids, seeds, codes, records, cards = zip(*self._buffer)
+        np.savez_compressed(
+            os.path.join(self.path, name),
+            records=np.concatenate(records),
+            cards=np.concatenate(cards),
+            rec_offsets=np.cumsum([0] + [len(r) for r in records]),
+            card_offsets=np.cumsum([0] + [len(c) for c in cards]),
+            game_id=np.array(ids, dtype=np.int64),
+            seed=np.array(seeds, dtype=np.int64),
+            bots=np.array(codes, dtype=np.int16),
+        )
+        self.meta['chunks'].append({'file': name, 'games': len(ids)})
+        for row, (game_id, seed, code, _, _) in enumerate(self._buffer):
+            self.index['game_id'].append(game_id)
+            self.index['seed'].append(seed)
+            self.index['chunk'].append(chunk)
+            self.index['row'].append(row)
+            self.index['n_players'].append(sum(c >= 0 for c in code))
+            self.index['bots'].append(code)
+        self._buffer = []
+
+    def close(self) -> None:
+        """Flush the last chunk and write the index."""
+        self.flush()
+        np.savez(
+            os.path.join(self.path, 'index.npz'),
+            game_id=np.array(self.index['game_id'], dtype=np.int64),
+            seed=np.array(self.index['seed'], dtype=np.int64),
+            chunk=np.array(self.index['chunk'], dtype=np.int32),
+            row=np.array(self.index['row'], dtype=np.int32),
+            n_players=np.array(self.index['n_players'], dtype=np.int8),
+            bots=np.array(self.index['bots'], dtype=np.int16).reshape(-1, MAX_SEATS),
+        )
+        with open(os.path.join(self.path, 'meta.json'), 'w') as f:
+            json.dump(self.meta, f, indent=1)
+
+
+class ArchiveReader:
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        with open(os.path.join(path, 'meta.json')) as f:
+            self.meta = json.load(f)
+        self.index = _load_index(path)
+        self.bots: list[str] = self.meta['bots']
+        self._chunk: tuple[int, dict[str, np.ndarray]] | None = None
+
+    def __len__(self) -> int:
+        return len(self.index['game_id'])
+
+    def find(self, seed: int | None = None, bot: str | None = None, n_players: int | None = None) -> np.ndarray:
+        """Ids of the games matching every given filter (a vectorized scan of the index)."""
+        mask = np.ones(len(self), dtype=bool)
+        if seed is not None:
+            mask &= self.index['seed'] == seed
+        if bot is not None:
+            code = self.bots.index(bot) if bot in self.bots else -2
+            mask &= (self.index['bots'] == code).any(axis=1)
+        if n_players is not None:
+            mask &= self.index['n_players'] == n_players
+        return self.index['game_id'][mask]
+
+    def chunk(self, i: int) -> dict[str, np.ndarray]:
+        """Arrays of chunk `i` (the last chunk read is kept in memory)."""
+        if self._chunk is None or self._chunk[0] != i:
+            with np.load(os.path.join(self.path, self.meta['chunks'][i]['file'])) as f:
+                self._chunk = (i, {k: f[k] for k in f.files})
+        return self._chunk[1]
+
+    def chunks(self) -> Iterator[dict[str, np.ndarray]]:
+        for i in range(len(self.meta['chunks'])):
+            yield self.chunk(i)
+
+    def _game(self, data: dict[str, np.ndarray], row: int) -> ArchivedGame:
+        r0, r1 = data['rec_offsets'][row], data['rec_offsets'][row + 1]
+        c0, c1 = data['card_offsets'][row], data['card_offsets'][row + 1]
+        return ArchivedGame(
+            game_id=int(data['game_id'][row]),
+            seed=int(data['seed'][row]),
+            bots=[self.bots[c] for c in data['bots'][row] if c >= 0],
+            records=data['records'][r0:r1],
+            cards=data['cards'][c0:c1],
+        )
+
+    def game(self, game_id: int) -> ArchivedGame:
+        chunk, row = self.index['chunk'][game_id], self.index['row'][game_id]
+        return self._game(self.chunk(int(chunk)), int(row))
+
+    def games(self, ids: Sequence[int] | np.ndarray | None = None) -> Iterator[ArchivedGame]:
+        """Stream the given games (all by default), one chunk in memory at a time."""
+        ids = self.index['game_id'] if ids is None else np.asarray(ids)
+        order = np.lexsort((self.index['row'][ids], self.index['chunk'][ids]))
+        for game_id in ids[order]:
+            yield self.game(int(game_id))
+
+    def replay(self, game_id: int, observers: Sequence[GameObserver] = ()) -> tuple[dict, dict]:
+        """Re-run an archived game from its seed and lineup."""
+        game = self.game(game_id)
+        players = [BotBase.registry[name](i) for i, name in enumerate(game.bots, start=1)]
+        random.seed(game.seed)
+        return dubito(players, observers=observers)
@@ -0,0 +1,114 @@
+"""
+ResultCache — content-addressed cache of simulated game blocks.
+
+`mode: cached` plays the tournament as blocks: one lineup, one seat count, a fixed seed
+range. A block's key hashes everything that can change its outcome:
+
+    engine      the source of every dubito/ module plus the stats bookkeeping
+    lineup      each seat's bot name and the hash of its source (see bot_hash)
+    deal        deck size, jokers, turn cap
+    seeds       base seed, block index and block size
+
+so editing one bot changes the keys of exactly the blocks it plays in. Every other block
+is read back from disk and merged (stats.merge_stats) instead of re-simulated. Entries
+are raw BotStats sums (before finalize_stats), pickled under `.dubito_cache/<2 hex>/`.
+Delete the directory to reclaim the space; stale entries are never read again.
+"""
+from __future__ import annotations
+import hashlib
+import inspect
+import json
+import os
+import pickle
+import sys
+import types
+from dataclasses import asdict
+from pathlib import Path
+
+from .stats import BotStats, BucketStats
+
+CACHE_VERSION = 1
+_ROOT = Path(__file__).resolve().parent.parent
+
+
+def _sha(*parts: str) -> str:
+    h = hashlib.sha256()
+    for part in parts:
+        h.update(part.encode())
+        h.update(b'\0')
+    return h.hexdigest()
+
+
+def _bot_modules(cls: type) -> list[types.ModuleType]:
+    """Modules under bots/ the class depends on: its MRO's modules, plus every bots.*
+    module those reference (imports, helper classes and functions), transitively."""
+    seen: dict[str, types.ModuleType] = {}
+    todo = [sys.modules[c.__module__] for c in cls.__mro__ if c.__module__.startswith('bots.')]
+    while todo:
+        module = todo.pop()
+        if module.__name__ in seen:
+            continue
+        seen[module.__name__] = module
+        for value in vars(module).values():
+            name = value.__name__ if isinstance(value, types.ModuleType) else getattr(value, '__module__', None)
+            if isinstance(name, str) and name.startswith('bots.') and name not in seen and name in sys.modules:
+                todo.append(sys.modules[name])
+    return [seen[name] for name in sorted(seen)]
+
+
+def bot_hash(cls: type) -> str:
+    """Hash of the source of every bots/ module the bot class depends on."""
+    return _sha(cls.__name__, *(inspect.getsource(m) for m in _bot_modules(cls)))
+
+
+def engine_hash() -> str:
+    """Hash of the game engine and the stats bookkeeping that fill a cache entry."""
+    from . import runner
+    sources = [p.read_text() for p in sorted((_ROOT / 'dubito').glob('*.py'))]
+    sources += [(_ROOT / 'experiments' / 'stats.py').read_text(), inspect.getsource(runner.record_game)]
+    return _sha(str(CACHE_VERSION), *sources)
+
+
+def block_key(engine: str, lineup: list[tuple[str, str]], deal: dict, seed: int, block: int, size: int) -> str:
+    """
+    Args:
+        engine: engine_hash().
+        lineup: (bot name, bot_hash) per seat.
+        deal: deck config, e.g. {'deck_size': 14, 'n_jollies': 2, 'max_turns': 1000}.
+        seed, block, size: the block's seed range.
+    """
+    return _sha(json.dumps({
+        'engine': engine, 'lineup': lineup, 'deal': deal, 'seed': seed, 'block': block, 'size': size,
+    }, sort_keys=True))
+
+
+class ResultCache:
+
+    def __init__(self, root: str = '.dubito_cache') -> None:
+        self.root = root
+        self.hits = 0
+        self.misses = 0
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.root, key[:2], f'{key}.pkl')
+
+    def get(self, key: str) -> dict[str, BotStats] | None:
+        path = self._path(key)
+        if not os.path.exists(path):
+            self.misses += 1
+            return None
+        with open(path, 'rb') as f:
+            raw = pickle.load(f)
+        self.hits += 1
+        return {
+            bot: BotStats(**{bucket: BucketStats(**values) for bucket, values in buckets.items()})
+            for bot, buckets in raw.items()
+        }
+
+    def put(self, key: str, stats: dict[str, BotStats]) -> None:
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f'{path}.tmp'
+        with open(tmp, 'wb') as f:
+            pickle.dump({bot: asdict(info) for bot, info in stats.items()}, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, path)
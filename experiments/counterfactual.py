@@ -0,0 +1,215 @@
+"""
+Counterfactual — fork an archived game at any decision and replay what-ifs.
+
+Archived games are seeded (experiments/archive.py), so the state before any decision can
+be rebuilt exactly: deal from the stored seed, then step the live bots through their
+first `step` decisions. Decisions are the game's PLAY and DOUBT events, counted from 0.
+If a bot's code changed since the game was archived the rebuilt history diverges, and
+`restore` refuses to fork it.
+
+From the rebuilt state, `fork` plays `n` continuations twice each, on copies of the game
+(copy.deepcopy, bots' internal state included) and with common seeds:
+
+    baseline        the seat's own bot decides, as it did in the archived game
+    counterfactual  the seat plays `action` instead, and/or `bot` takes over the seat
+
+The Score deltas (1 hard win, 0.5 soft win, 0 loss) are paired per seed. With
+`workers` > 1 the continuations are split across processes.
+
+    python -m experiments.counterfactual games_archive/ 42 --list
+    python -m experiments.counterfactual games_archive/ 42 --step 17 --doubt
+    python -m experiments.counterfactual games_archive/ 42 --step 17 --bot HonestBot --n 1000 --workers 4
+"""
+from __future__ import annotations
+import argparse
+import copy
+import random
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+
+from dubito.core_game import DubitoGame, initialize
+from dubito.game_data import TurnOutput, CardsPlayedEvent, DoubtResolvedEvent, PlayerWonEvent
+from dubito.player import Player
+from bots.base import BotBase
+from .archive import ArchiveReader, ArchivedGame
+from .runner import game_score
+from .stats import PairedStats
+
+DEAL = {'deck_size': 14, 'n_jollies': 2, 'max_turns': 1_000, 'stall_turns': None}     # dubito() defaults, as archived
+
+
+@dataclass
+class ForkResult:
+    game_id: int
+    step: int
+    player_id: int
+    bot: str
+    actual: float                 # the seat's Score in the archived game
+    baseline: float               # mean Score over the baseline continuations
+    counterfactual: float         # mean Score over the counterfactual continuations
+    delta: PairedStats            # counterfactual − baseline, paired per seed
+
+
+def decisions(game: ArchivedGame) -> list[tuple[int, int, str, str]]:
+    """(step, player id, bot, 'play' | 'doubt') for every decision of the game."""
+    history, _ = game.unpack()
+    rows = []
+    for event in history:
+        if isinstance(event, CardsPlayedEvent):
+            rows.append((len(rows), event.player_id, game.bots[event.player_id - 1], 'play'))
+        elif isinstance(event, DoubtResolvedEvent):
+            rows.append((len(rows), event.doubter_id, game.bots[event.doubter_id - 1], 'doubt'))
+    return rows
+
+
+def restore(game: ArchivedGame, step: int) -> DubitoGame:
+    """The archived game paused on its `step`-th decision: next_turn() has been called,
+    and game.this_player / game.turn_data are the seat to move and what it sees."""
+    players: list[Player] = [BotBase.registry[name](i) for i, name in enumerate(game.bots, start=1)]
+    random.seed(game.seed)
+    random.shuffle(players)                                      # as dubito() does
+    initialize(players, DEAL['deck_size'], DEAL['n_jollies'])
+    state = DubitoGame(players, deck_size=DEAL['deck_size'], max_turns=DEAL['max_turns'],
+                       stall_turns=DEAL['stall_turns'], observers=())
+    for done in range(step + 1):
+        if state.is_over():
+            raise ValueError(f'game {game.game_id} has only {done} decisions')
+        if done < step:
+            state.play_turn()
+    state.next_turn()
+
+    history, _ = game.unpack()
+    rebuilt = state.game_handler.history
+    if rebuilt != history[:len(rebuilt)]:
+        raise ValueError(f'game {game.game_id} does not replay as archived (did a bot change since?)')
+    return state
+
+
+def _swap(state: DubitoGame, old: Player, cls: type) -> Player:
+    """Seat a `cls` bot in place of `old`, with its hand, everywhere the game refers to it."""
+    new = cls(old.id)
+    new.cards = old.cards
+    players = state.game_handler.players
+    for seats in {id(s): s for s in (state.all_players, players.all, players.playing, players.winners)}.values():
+        seats[:] = [new if p is old else p for p in seats]
+    for holder, attr in ((players, 'prev'), (players, 'this'), (players, 'next'),
+                         (state, 'prev_player'), (state, 'this_player')):
+        if getattr(holder, attr) is old:
+            setattr(holder, attr, new)
+    return new
+
+
+def _take(player: Player, action: TurnOutput) -> TurnOutput:
+    """Remove a prescribed play's cards from the hand, as a bot's play() would."""
+    if action.doubt:
+        return TurnOutput(doubt=True, number=None, cards=None)
+    for card in action.cards:
+        if not player.cards.pick(card, 1):
+            raise ValueError(f'Player{player.id} holds no {card} to play')
+    return TurnOutput(doubt=False, number=action.number, cards=list(action.cards))
+
+
+def continuation(state: DubitoGame, seed: str, action: TurnOutput | None = None,
+                 bot: str | None = None) -> float:
+    """Score of the seat to move after playing a copy of `state` out from `seed`."""
+    state = copy.deepcopy(state)
+    player = state.this_player
+    if bot is not None:
+        player = _swap(state, player, BotBase.registry[bot])
+    random.seed(seed)
+    state.apply(player.play(state.turn_data) if action is None else _take(player, action))
+    while not state.is_over():
+        state.play_turn()
+    results, _ = state.finish()
+    return game_score(player, results)
+
+
+def _shard(path: str, game_id: int, step: int, action: TurnOutput | None, bot: str | None,
+           seeds: list[str]) -> list[tuple[float, float]]:
+    state = restore(ArchiveReader(path).game(game_id), step)
+    return [(continuation(state, s), continuation(state, s, action, bot)) for s in seeds]
+
+
+def fork(path: str, game_id: int, step: int, action: TurnOutput | None = None, bot: str | None = None,
+         n: int = 200, seed: int = 0, workers: int = 1) -> ForkResult:
+    """
+    Args:
+        path (str): Archive directory.
+        game_id (int): Archived game to fork.
+        step (int): Decision to fork at (see decisions()).
+        action (TurnOutput | None): Replaces the seat's decision at the fork.
+        bot (str | None): Bot that plays the seat from the fork on.
+        n (int): Continuations. Defaults to 200.
+        seed (int): Base of the continuation seeds. Defaults to 0.
+        workers (int): Processes the continuations are spread across. Defaults to 1.
+    """
+    if action is None and bot is None:
+        raise ValueError('give an action, a bot, or both')
+    game = ArchiveReader(path).game(game_id)
+    state = restore(game, step)
+    player_id = state.this_player.id
+
+    seeds = [f'{seed}:{i}' for i in range(n)]
+    if workers > 1:
+        for name in {*game.bots, bot} - {None}:
+            BotBase.registry[name].preload()
+        shards = [seeds[i::workers] for i in range(workers)]
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            pairs = [p for shard in pool.map(_shard, [path] * workers, [game_id] * workers, [step] * workers,
+                                             [action] * workers, [bot] * workers, shards) for p in shard]
+    else:
+        pairs = [(continuation(state, s), continuation(state, s, action, bot)) for s in seeds]
+
+    delta = PairedStats()
+    for base, alt in pairs:
+        delta.add(alt - base)
+
+    history, _ = game.unpack()
+    winners = [e.player_id for e in history if isinstance(e, PlayerWonEvent)]
+    actual = 1.0 if winners[:1] == [player_id] else 0.5 if player_id in winners else 0.0
+    return ForkResult(
+        game_id=game_id, step=step, player_id=player_id, bot=game.bots[player_id - 1], actual=actual,
+        baseline=sum(b for b, _ in pairs) / n, counterfactual=sum(a for _, a in pairs) / n, delta=delta,
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Fork an archived game at a decision and replay what-ifs.')
+    parser.add_argument('archive', help='archive directory')
+    parser.add_argument('game', type=int, help='game id')
+    parser.add_argument('--list', action='store_true', help="list the game's decisions")
+    parser.add_argument('--step', type=int, help='decision to fork at')
+    parser.add_argument('--doubt', action='store_true', help='doubt instead')
+    parser.add_argument('--play', type=int, nargs='+', metavar='CARD', help='play these cards instead')
+    parser.add_argument('--declare', type=int, help='number declared with --play on a first hand')
+    parser.add_argument('--bot', help='bot that takes over the seat')
+    parser.add_argument('--n', type=int, default=200, help='continuations')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--workers', type=int, default=1)
+    args = parser.parse_args()
+
+    reader = ArchiveReader(args.archive)
+    if args.list:
+        for step, player_id, bot, kind in decisions(reader.game(args.game)):
+            print(f'{step:>5}  Player{player_id:<3} {bot:<24} {kind}')
+        return
+    if args.step is None:
+        parser.error('--step is required (see --list)')
+    if args.bot is not None and args.bot not in BotBase.registry:
+        parser.error(f'unknown bot {args.bot!r}')
+
+    action = None
+    if args.doubt:
+        action = TurnOutput(doubt=True, number=None, cards=None)
+    elif args.play:
+        action = TurnOutput(doubt=False, number=args.declare, cards=args.play)
+    result = fork(args.archive, args.game, args.step, action, args.bot, args.n, args.seed, args.workers)
+    print(f'Game {result.game_id}, decision {result.step}: Player{result.player_id} ({result.bot})')
+    print(f'  archived score   {result.actual:.2f}')
+    print(f'  baseline         {result.baseline:.3f}')
+    print(f'  counterfactual   {result.counterfactual:.3f}')
+    print(f'  delta            {result.delta.mean:+.3f} ± {result.delta.half_width():.3f}  ({result.delta.deals} seeds)')
+
+
+if __name__ == '__main__':
+    main()
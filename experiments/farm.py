@@ -0,0 +1,252 @@
+"""
+Farm — one tournament played by many machines through a shared-directory work queue.
+
+`mode: farm` splits the game budget into the seeded blocks of cached mode (one lineup
+and seat count per block, see runner.block_lineup), and queues them as shards in a
+directory every host can see (NFS, SMB, a synced volume):
+
+    farm/
+        job.json            bots, player counts, seed, block size, engine and bot hashes
+        todo/00000042       one empty file per shard waiting for a worker
+        claimed/00000042    shard being played (claimed with an atomic rename)
+        done/00000042.pkl   raw BotStats of a finished shard
+        stop                written by the coordinator once every shard is merged
+
+The coordinator merges shard results as they arrive. A claim it has watched for longer
+than `lease` seconds, by its own clock so host clocks need not agree, is moved back to
+todo/. This covers a worker that died or a host that went away. A shard may then be
+played twice, but it is merged once. Blocks are seeded, so the result equals a
+`mode: cached` run with the same seed and block size, wherever the shards ran.
+
+Workers check job.json's engine and bot hashes against their own code before they take
+a shard, so a host with stale code refuses to play instead of polluting the stats.
+
+    python -m experiments experiment.yaml            # mode: farm, farm_dir: /shared/farm
+    python -m experiments.farm worker /shared/farm   # on every other host
+"""
+from __future__ import annotations
+import argparse
+import json
+import multiprocessing
+import os
+import pickle
+import socket
+import time
+
+from bots.base import BotBase
+from .cache import bot_hash, engine_hash
+from .runner import BLOCK_DEAL, block_lineup, play_block, finalize_stats
+from .stats import BotStats, make_bot_stats, merge_stats
+
+
+def _shard(i: int) -> str:
+    return f'{i:08d}'
+
+
+def _dirs(farm_dir: str) -> tuple[str, str, str]:
+    return tuple(os.path.join(farm_dir, d) for d in ('todo', 'claimed', 'done'))
+
+
+def create_job(farm_dir: str, algorithms: list, available_players: list, n_experiments: int,
+               seed: int = 0, block_size: int = 100) -> dict:
+    """Write job.json and queue every shard not already queued, claimed or done. An existing
+    job is resumed if its settings match, and refused otherwise."""
+    names = sorted(a.__name__ for a in algorithms)
+    job = {
+        'version': 1, 'bots': names, 'available_players': list(available_players), 'games': n_experiments,
+        'seed': seed, 'block_size': block_size, 'shards': -(-n_experiments // block_size), 'deal': BLOCK_DEAL,
+        'engine': engine_hash(), 'hashes': {a.__name__: bot_hash(a) for a in algorithms},
+    }
+    todo, claimed, done = _dirs(farm_dir)
+    for d in (todo, claimed, done):
+        os.makedirs(d, exist_ok=True)
+    path = os.path.join(farm_dir, 'job.json')
+    if os.path.exists(path):
+        with open(path) as f:
+            existing = json.load(f)
+        if existing != job:
+            raise ValueError(f'{farm_dir} holds a different job: use another farm_dir or delete it')
+    else:
+        with open(f'{path}.tmp', 'w') as f:
+            json.dump(job, f, indent=1)
+        os.replace(f'{path}.tmp', path)
+    if os.path.exists(os.path.join(farm_dir, 'stop')):
+        os.remove(os.path.join(farm_dir, 'stop'))
+
+    started = set(os.listdir(todo)) | set(os.listdir(claimed)) | {f[:-4] for f in os.listdir(done)}
+    for i in range(job['shards']):
+        if _shard(i) not in started:
+            open(os.path.join(todo, _shard(i)), 'w').close()
+    return job
+
+
+# ── Worker ────────────────────────────────────────────────────────────────────
+
+def _check_code(job: dict) -> None:
+    if job['engine'] != engine_hash():
+        raise RuntimeError('this host runs a different engine than the coordinator')
+    for name in job['bots']:
+        if name not in BotBase.registry or bot_hash(BotBase.registry[name]) != job['hashes'][name]:
+            raise RuntimeError(f'this host runs a different {name} than the coordinator')
+
+
+def play_shard(job: dict, shard: int) -> dict[str, BotStats]:
+    """Raw BotStats of one shard: the block of cached mode with the same index."""
+    algorithms = [BotBase.registry[name] for name in job['bots']]
+    size = min(job['block_size'], job['games'] - shard * job['block_size'])
+    lineup = block_lineup(algorithms, job['available_players'], job['seed'], shard)
+    return play_block(lineup, set(job['bots']), job['seed'], shard, size, job['deal'])
+
+
+def run_worker(farm_dir: str, name: str | None = None, poll: float = 1.0) -> int:
+    """Claim and play shards until the coordinator writes `stop`. Returns the shards played."""
+    name = name or f'{socket.gethostname()}-{os.getpid()}'
+    todo, claimed, done = _dirs(farm_dir)
+    stop = os.path.join(farm_dir, 'stop')
+    job_path = os.path.join(farm_dir, 'job.json')
+    job, played = None, 0
+    while not os.path.exists(stop):
+        if job is None:
+            if not os.path.exists(job_path):
+                time.sleep(poll)
+                continue
+            with open(job_path) as f:
+                job = json.load(f)
+            _check_code(job)
+        shards = sorted(os.listdir(todo)) if os.path.isdir(todo) else []
+        if not shards:
+            time.sleep(poll)
+            continue
+        for shard in shards:
+            try:
+                os.rename(os.path.join(todo, shard), os.path.join(claimed, shard))
+            except FileNotFoundError:
+                continue                                   # another worker won the race
+            stats = play_shard(job, int(shard))
+            tmp = os.path.join(done, f'{shard}.{name}.tmp')
+            with open(tmp, 'wb') as f:
+                pickle.dump(stats, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp, os.path.join(done, f'{shard}.pkl'))
+            try:
+                os.remove(os.path.join(claimed, shard))
+            except FileNotFoundError:                      # re-issued meanwhile
+                pass
+            played += 1
+            break
+    return played
+
+
+def _local_worker(farm_dir: str, name: str, poll: float, errors) -> None:
+    """run_worker for a worker process the coordinator started: its error goes back to
+    the coordinator, which stops once no local worker is left."""
+    try:
+        run_worker(farm_dir, name, poll)
+    except BaseException as e:
+        errors.put(f'{name}: {e!r}')
+        raise
+
+
+# ── Coordinator ───────────────────────────────────────────────────────────────
+
+def play_farm(algorithms: list, available_players: list, n_experiments: int, farm_dir: str = 'farm',
+              seed: int = 0, block_size: int = 100, lease: float = 600.0, poll: float = 1.0,
+              local_workers: int = 0) -> tuple[dict, dict]:
+    """
+    Queue the tournament in `farm_dir` and merge shards as workers finish them.
+
+    Args:
+        lease (float): Seconds a claimed shard may stay unfinished before it is re-issued.
+            Defaults to 600.
+        poll (float): Seconds between two scans of the queue. Defaults to 1.
+        local_workers (int): Worker processes to start on this host. Defaults to 0
+            (remote workers only). If all of them die before the job is done, the
+            coordinator raises instead of waiting for shards nobody will play.
+
+    Returns:
+        (final_infos, run): the usual BotStats, plus run metadata with the shard and
+        re-issue counts.
+    """
+    from tqdm import tqdm
+    job = create_job(farm_dir, algorithms, available_players, n_experiments, seed, block_size)
+    todo, claimed, done = _dirs(farm_dir)
+    final_infos: dict[str, BotStats] = {name: make_bot_stats(set(job['bots'])) for name in job['bots']}
+    merged: set[str] = set()
+    seen: dict[str, float] = {}                            # claim → when this coordinator first saw it
+    reissued = 0
+
+    if local_workers:
+        for alg in algorithms:
+            alg.preload()
+    errors = multiprocessing.SimpleQueue()
+    workers = [multiprocessing.Process(target=_local_worker, args=(farm_dir, f'local-{i}', poll, errors), daemon=True)
+               for i in range(local_workers)]
+    for w in workers:
+        w.start()
+    try:
+        with tqdm(total=job['shards'], desc='Merging Shards', unit='shard') as bar:
+            while len(merged) < job['shards']:
+                for file in sorted(os.listdir(done)):
+                    shard = file[:-4]
+                    if not file.endswith('.pkl') or shard in merged:
+                        continue
+                    with open(os.path.join(done, file), 'rb') as f:
+                        merge_stats(final_infos, pickle.load(f))
+                    merged.add(shard)
+                    bar.update(1)
+                    for stale in (os.path.join(todo, shard), os.path.join(claimed, shard)):
+                        if os.path.exists(stale):
+                            try:
+                                os.remove(stale)
+                            except FileNotFoundError:
+                                pass
+
+                now = time.monotonic()
+                for shard in os.listdir(claimed):
+                    if shard in merged:
+                        continue
+                    first = seen.setdefault(shard, now)
+                    if now - first > lease:
+                        try:
+                            os.rename(os.path.join(claimed, shard), os.path.join(todo, shard))
+                            reissued += 1
+                        except FileNotFoundError:
+                            pass
+                        del seen[shard]
+                if len(merged) < job['shards'] and workers and not any(w.is_alive() for w in workers):
+                    error = errors.get() if not errors.empty() else f'exit code {workers[0].exitcode}'
+                    raise RuntimeError(f'every local worker died with shards left to play ({error})')
+                if len(merged) < job['shards']:
+                    time.sleep(poll)
+    finally:
+        open(os.path.join(farm_dir, 'stop'), 'w').close()
+        for w in workers:
+            w.join()
+
+    run = {'mode': 'farm', 'games': n_experiments, 'seed': seed, 'block_size': block_size,
+           'shards': job['shards'], 'reissued': reissued}
+    return finalize_stats(final_infos), run
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Play shards of a farm-mode tournament.')
+    parser.add_argument('command', choices=['worker'])
+    parser.add_argument('farm_dir', help='shared queue directory (farm_dir in experiment.yaml)')
+    parser.add_argument('--processes', type=int, default=1, help='workers to run on this host')
+    parser.add_argument('--poll', type=float, default=1.0, help='seconds between queue scans')
+    args = parser.parse_args()
+
+    if args.processes == 1:
+        played = run_worker(args.farm_dir, poll=args.poll)
+        print(f'{played:,} shards played')
+        return
+    host = socket.gethostname()
+    workers = [multiprocessing.Process(target=run_worker, args=(args.farm_dir, f'{host}-{i}', args.poll))
+               for i in range(args.processes)]
+    for w in workers:
+        w.start()
+    for w in workers:
+        w.join()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,164 @@
+"""
+Query — metrics aggregated from an archive's event records, without re-simulating.
+
+Each archive chunk (experiments/archive.py) is turned into a column table, one row per
+event: the packed columns (dubito/packing.py) plus
+
+    game        row of the game in its chunk
+    bot         archive bot code of the event's actor (the doubter for DOUBT rows)
+    seat        the actor's position in the turn order (0 = first to play)
+    n_players   seats in the game
+
+A Metric selects the rows of one event kind and a value column; `aggregate` groups them
+by any columns with np.unique + np.bincount, chunk by chunk, and merges the partial sums.
+Chunks are independent, so with `workers` > 1 they are spread across processes.
+
+    python -m experiments.query games_archive/ bluff_rate --by bot streak
+    python -m experiments.query games_archive/ doubt_accuracy --by seat board --workers 4
+
+A new metric is one more METRICS entry; the archived games never need replaying.
+"""
+from __future__ import annotations
+import argparse
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+
+import numpy as np
+
+from dubito.packing import COLUMNS, KIND, ACTOR, START, PLAY, DOUBT, DISCARD
+from .archive import MAX_SEATS
+
+
+@dataclass(frozen=True)
+class Metric:
+    kind: int                  # event kind the metric reads (packing.PLAY, DOUBT, ...)
+    value: str                 # column averaged over those events
+    description: str = ''
+
+
+METRICS: dict[str, Metric] = {
+    'bluff_rate':     Metric(PLAY, 'flag', 'share of plays with a card other than the declared number or a joker'),
+    'cards_per_play': Metric(PLAY, 'count', 'cards per play'),
+    'doubt_accuracy': Metric(DOUBT, 'flag', 'share of doubts that were correct'),
+    'discard_turn':   Metric(DISCARD, 'turn', 'turn of each four-of-a-kind discard'),
+    'discard_hand':   Metric(DISCARD, 'hand', 'hand size right after a discard'),
+}
+
+
+def event_table(data: dict[str, np.ndarray]) -> dict[str, np.ndarray]:
+    """Column table of one archive chunk (see the module docstring)."""
+    records, offsets = data['records'], data['rec_offsets']
+    n_games = len(offsets) - 1
+    game = np.repeat(np.arange(n_games), np.diff(offsets))
+    table = {name: records[:, i] for i, name in enumerate(COLUMNS)}
+    table['game'] = game
+
+    # Every game starts with its START record, whose cards are the turn order then the counts.
+    n_players = records[offsets[:-1], ACTOR].astype(np.int64)
+    first = np.cumsum(n_players) - n_players
+    owner = np.repeat(np.arange(n_games), n_players)
+    position = np.arange(n_players.sum()) - np.repeat(first, n_players)
+    ids = data['cards'][np.repeat(data['card_offsets'][:-1], n_players) + position]
+    seat_of = np.full((n_games, MAX_SEATS + 1), -1, dtype=np.int16)
+    seat_of[owner, ids] = position
+
+    actor = np.where(records[:, KIND] == START, 0, records[:, ACTOR])
+    table['seat'] = np.where(actor > 0, seat_of[game, actor], -1)
+    table['bot'] = np.where(actor > 0, data['bots'][game, np.maximum(actor - 1, 0)], -1)
+    table['n_players'] = n_players[game]
+    return table
+
+
+def group_sums(keys: list[np.ndarray], values: np.ndarray) -> dict[tuple, tuple[float, float, int]]:
+    """{key tuple: (sum, sum of squares, count)} of `values` grouped by the key columns."""
+    if len(values) == 0:
+        return {}
+    stacked = np.stack(keys, axis=1)
+    groups, inverse = np.unique(stacked, axis=0, return_inverse=True)
+    inverse = inverse.reshape(-1)
+    values = values.astype(np.float64)
+    total = np.bincount(inverse, weights=values, minlength=len(groups))
+    total_sq = np.bincount(inverse, weights=values ** 2, minlength=len(groups))
+    count = np.bincount(inverse, minlength=len(groups))
+    return {
+        tuple(int(k) for k in group): (float(s), float(sq), int(n))
+        for group, s, sq, n in zip(groups, total, total_sq, count)
+    }
+
+
+def _merge(into: dict, other: dict) -> None:
+    for key, (s, sq, n) in other.items():
+        s0, sq0, n0 = into.get(key, (0.0, 0.0, 0))
+        into[key] = (s0 + s, sq0 + sq, n0 + n)
+
+
+def chunk_sums(chunk_path: str, metric: Metric, by: tuple[str, ...]) -> dict[tuple, tuple[float, float, int]]:
+    """Partial sums of `metric` over one chunk file."""
+    with np.load(chunk_path) as f:
+        table = event_table({k: f[k] for k in f.files})
+    rows = table['kind'] == metric.kind
+    if metric.value in ('flag', 'number', 'target', 'jokers'):
+        rows &= table[metric.value] >= 0                  # -1: not recorded
+    return group_sums([table[column][rows] for column in by], table[metric.value][rows])
+
+
+def aggregate(path: str, metric: str | Metric, by: tuple[str, ...] = ('bot',),
+              workers: int = 1) -> dict[tuple, tuple[float, float, int]]:
+    """
+    Args:
+        path (str): Archive directory.
+        metric (str | Metric): A METRICS name or a Metric.
+        by (tuple): Columns to group by. 'bot' keys are reported as bot names.
+        workers (int): Processes the chunks are spread across. Defaults to 1.
+
+    Returns:
+        {key tuple: (mean, std, count)}.
+    """
+    metric = METRICS[metric] if isinstance(metric, str) else metric
+    with open(os.path.join(path, 'meta.json')) as f:
+        meta = json.load(f)
+    files = [os.path.join(path, c['file']) for c in meta['chunks']]
+    sums: dict[tuple, tuple[float, float, int]] = {}
+    if workers > 1 and len(files) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for partial in pool.map(chunk_sums, files, [metric] * len(files), [by] * len(files)):
+                _merge(sums, partial)
+    else:
+        for file in files:
+            _merge(sums, chunk_sums(file, metric, by))
+
+    names = meta['bots']
+    result = {}
+    for key, (s, sq, n) in sorted(sums.items()):
+        mean = s / n
+        key = tuple(names[k] if column == 'bot' else k for column, k in zip(by, key))
+        result[key] = (mean, max(sq / n - mean ** 2, 0.0) ** 0.5, n)
+    return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Aggregate a metric over an archive of games.')
+    parser.add_argument('archive', help='archive directory')
+    parser.add_argument('metric', choices=sorted(METRICS))
+    parser.add_argument('--by', nargs='+', default=['bot'], help='columns to group by')
+    parser.add_argument('--workers', type=int, default=1)
+    parser.add_argument('--min-count', type=int, default=1, help='hide groups with fewer events')
+    args = parser.parse_args()
+
+    columns = set(COLUMNS) | {'game', 'bot', 'seat', 'n_players'}
+    for column in args.by:
+        if column not in columns:
+            parser.error(f'unknown column {column!r}: choose from {", ".join(sorted(columns))}')
+
+    result = aggregate(args.archive, args.metric, tuple(args.by), args.workers)
+    print(f'{args.metric}: {METRICS[args.metric].description}')
+    print(' '.join(f'{c:>18}' for c in args.by) + f' {"mean":>9} {"std":>9} {"events":>10}')
+    for key, (mean, std, n) in result.items():
+        if n >= args.min_count:
+            print(' '.join(f'{str(k):>18}' for k in key) + f' {mean:>9.4f} {std:>9.4f} {n:>10,}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,162 @@
+"""
+Ratings — multiplayer Elo over streamed game results.
+
+Win rates depend on who else was in the pool; a rating does not. Every game updates the
+ratings of the bots that played it from their finishing order, which is a list of
+groups best-first: each winner in order, then the final losers as one tied group.
+Each seat is scored against every other seat, pairwise Elo style:
+
+    E(i beats j) = 1 / (1 + 10 ** ((R_j − R_i) / 400))
+    R_i += K / (n − 1) · Σ_j (S_ij − E_ij)        S = 1 win, 0.5 tie, 0 loss
+
+so an update costs at most 8 × 7 pairs: O(1) per game, whatever the history. Copies of
+the same bot in one game are not scored against each other. Bots with fewer than
+`provisional` rated games move with twice the K, so newcomers settle quickly.
+
+Ratings persist as JSON between runs (`ratings_file:` in experiment.yaml). To rate a
+new bot without re-simulating the pool, play it against the rated bots with their
+ratings frozen as anchors:
+
+    python -m experiments.ratings add MyBot --games 5000      # ratings.json
+    python -m experiments.ratings show
+"""
+from __future__ import annotations
+import argparse
+import json
+import os
+import random
+
+from dubito.core_game import dubito
+from dubito.player import Player, PlayerPool
+from bots.base import BotBase
+
+
+class Ratings:
+
+    def __init__(self, ratings: dict[str, float] | None = None, games: dict[str, int] | None = None,
+                 k: float = 16.0, initial: float = 1500.0, provisional: int = 30) -> None:
+        """
+        Args:
+            ratings (dict): bot name → rating.
+            games (dict): bot name → rated games played.
+            k (float): Elo K-factor per game. Defaults to 16.
+            initial (float): Rating of an unseen bot. Defaults to 1500.
+            provisional (int): Games played with a doubled K. Defaults to 30.
+        """
+        self.ratings = dict(ratings or {})
+        self.games = dict(games or {})
+        self.k = k
+        self.initial = initial
+        self.provisional = provisional
+
+    # ── Persistence ───────────────────────────────────────────────────────────
+
+    @classmethod
+    def load(cls, path: str, **kwargs) -> Ratings:
+        """Ratings stored at `path` (empty if the file does not exist yet)."""
+        if not os.path.exists(path):
+            return cls(**kwargs)
+        with open(path) as f:
+            data = json.load(f)
+        return cls(data['ratings'], data['games'], **kwargs)
+
+    def save(self, path: str) -> None:
+        with open(path, 'w') as f:
+            json.dump({'version': 1, 'ratings': self.ratings, 'games': self.games}, f, indent=1, sort_keys=True)
+
+    # ── Updates ───────────────────────────────────────────────────────────────
+
+    def rating(self, bot: str) -> float:
+        return self.ratings.get(bot, self.initial)
+
+    def update(self, order: list[list[str]], frozen: set[str] = frozenset()) -> None:
+        """
+        Rate one game.
+
+        Args:
+            order: Finishing groups, best first; bots within a group tie. A bot name may
+                appear several times (several seats).
+            frozen: Bots whose rating is kept fixed (anchors).
+        """
+        seats = [(bot, rank) for rank, group in enumerate(order) for bot in group]
+        n = len(seats)
+        if n < 2:
+            return
+        before = {bot: self.rating(bot) for bot, _ in seats}
+        delta = dict.fromkeys(before, 0.0)
+        for i, (a, rank_a) in enumerate(seats):
+            for b, rank_b in seats[i + 1:]:
+                if a == b:
+                    continue
+                expected = 1 / (1 + 10 ** ((before[b] - before[a]) / 400))
+                actual = 1.0 if rank_a < rank_b else 0.5 if rank_a == rank_b else 0.0
+                delta[a] += actual - expected
+                delta[b] -= actual - expected
+        for bot in before:
+            if bot in frozen:
+                continue
+            k = self.k * (2 if self.games.get(bot, 0) < self.provisional else 1)
+            self.ratings[bot] = before[bot] + k / (n - 1) * delta[bot]
+        for bot, _ in seats:
+            self.games[bot] = self.games.get(bot, 0) + 1
+
+    def record(self, results: dict, frozen: set[str] = frozenset()) -> None:
+        """Rate a finished dubito() game from its game_result."""
+        self.update(finishing_order(results), frozen)
+
+    def leaderboard(self) -> list[tuple[str, float, int]]:
+        """(bot, rating, games) best first."""
+        return sorted(((b, r, self.games.get(b, 0)) for b, r in self.ratings.items()),
+                      key=lambda row: row[1], reverse=True)
+
+
+def finishing_order(results: dict) -> list[list[str]]:
+    """Finishing groups of a game_result: each winner in order, then the losers tied."""
+    order = [[p.__class__.__name__] for p in results['winners']]
+    if results['losers']:
+        order.append([p.__class__.__name__ for p in results['losers']])
+    return order
+
+
+def rate_newcomer(ratings: Ratings, newcomer: type, opponents: list, available_players: list,
+                  n_games: int) -> Ratings:
+    """Rate `newcomer` against already-rated `opponents`, whose ratings stay frozen. Every
+    game seats the newcomer once; the other seats are drawn uniformly from `opponents`."""
+    from tqdm import tqdm
+    frozen = {a.__name__ for a in opponents} - {newcomer.__name__}
+    pool = PlayerPool()
+    for _ in tqdm(range(n_games), desc=f'Rating {newcomer.__name__}', unit='game'):
+        n = random.choice(available_players)
+        lineup = [newcomer] + [random.choice(opponents) for _ in range(n - 1)]
+        all_players: list[Player] = pool.seat(lineup)
+        results, _ = dubito(all_players, observers=())
+        ratings.record(results, frozen)
+    return ratings
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Multiplayer Elo ratings of the bots.')
+    parser.add_argument('command', choices=['add', 'show'])
+    parser.add_argument('bot', nargs='?', help='bot to rate (add)')
+    parser.add_argument('--ratings', default='ratings.json', help='ratings file')
+    parser.add_argument('--games', type=int, default=5_000, help='games to play (add)')
+    parser.add_argument('--players', type=int, nargs='+', default=[3, 4, 5, 6, 7],
+                        help='player counts to draw from (add)')
+    args = parser.parse_args()
+
+    ratings = Ratings.load(args.ratings)
+    if args.command == 'add':
+        if args.bot not in BotBase.registry:
+            parser.error(f'unknown bot {args.bot!r}')
+        opponents = [BotBase.registry[b] for b in ratings.ratings if b in BotBase.registry and b != args.bot]
+        if not opponents:
+            parser.error(f'{args.ratings} has no rated opponents: run python -m experiments with ratings_file first')
+        rate_newcomer(ratings, BotBase.registry[args.bot], opponents, args.players, args.games)
+        ratings.save(args.ratings)
+
+    for rank, (bot, rating, games) in enumerate(ratings.leaderboard(), 1):
+        print(f'{rank:>3}. {bot:<24} {rating:>7.1f} {games:>10,}')
+
+
+if __name__ == '__main__':
+    main()
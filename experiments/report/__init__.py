@@ -1,3 +1,10 @@
-from ._site import generate_html_site
-
 __all__ = ['generate_html_site']
+
+
+def __getattr__(name: str):
+    # Plotly is imported with the site builder, on first use: the live telemetry page and
+    # the game runners only need ._common.
+    if name == 'generate_html_site':
+        from ._site import generate_html_site
+        return generate_html_site
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
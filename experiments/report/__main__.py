@@ -6,10 +6,12 @@ Usage:
     python -m experiments.report results/all_games.yaml --config results/experiment.yaml
 """
 import argparse
+import os
 
 import yaml
 
-from ..stats import BotStats, BucketStats
+from ..ratings import Ratings
+from ..stats import BotStats, BucketStats, PairedStats
 from . import generate_html_site
 
 
@@ -19,9 +21,20 @@ def load_stats(path: str) -> dict[str, BotStats]:
     return {
         bot: BotStats(**{bucket: BucketStats(**values) for bucket, values in buckets.items()})
         for bot, buckets in raw.items()
+        if not bot.startswith('_')
     }
 
 
+def load_run(path: str) -> dict | None:
+    """Run metadata saved under `_run` (duplicate / adaptive mode), or None."""
+    with open(path) as f:
+        run = yaml.safe_load(f).get('_run')
+    if run is not None and 'paired' in run:
+        run['paired'] = {a: {b: PairedStats(**ps) for b, ps in row.items()}
+                         for a, row in run['paired'].items()}
+    return run
+
+
 def main() -> None:
     parser = argparse.ArgumentParser(description=__doc__)
     parser.add_argument('results', nargs='?', default='all_games.yaml',
@@ -36,7 +49,9 @@ def main() -> None:
         config = yaml.safe_load(f)
     output_dir = args.out or config.get('output_dir', 'report_site')
 
-    generate_html_site(load_stats(args.results), config, output_dir)
+    ratings_file = config.get('ratings_file')
+    ratings = Ratings.load(ratings_file) if ratings_file and os.path.exists(ratings_file) else None
+    generate_html_site(load_stats(args.results), config, output_dir, load_run(args.results), ratings)
 
 
 if __name__ == '__main__':
@@ -32,6 +32,25 @@ def win_type_scatter(players, metrics, bot_colour, hard_base, soft_base) -> go.F
 
 # ── Rankings ──────────────────────────────────────────────────────────────────
 
+def rating_bar(rows, bot_colour) -> go.Figure:
+    bots    = [b for b, _, _ in rows]
+    ratings = [r for _, r, _ in rows]
+    fig = go.Figure(go.Bar(
+        x=bots, y=ratings,
+        marker_color=[bot_colour.get(b, '#888') for b in bots],
+        text=[f'{r:.0f}' for r in ratings], textposition='outside',
+        hovertemplate='<b>%{x}</b><br>Rating: %{y:.1f}<extra></extra>',
+    ))
+    fig.add_hline(y=1500, line_dash='dot', line_color='grey',
+                  annotation_text='Initial rating (1500)', annotation_position='top right')
+    fig.update_layout(
+        title='Elo Rating',
+        yaxis=dict(title='Rating', range=[min(ratings + [1500]) - 100, max(ratings + [1500]) + 100]),
+        **LAYOUT_BASE, margin=dict(t=60, b=120), height=460,
+    )
+    return fig
+
+
 def win_rate_bar(players, metrics, bot_colour, win_base) -> go.Figure:
     win_rates = [metrics[b]['win_rate'] for b in players]
     fig = go.Figure(go.Bar(
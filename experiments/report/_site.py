@@ -2,7 +2,13 @@ import datetime
 import json
 import os
 
-from ..stats import safe_div, win_rate, hard_win_rate, soft_win_rate
+import numpy as np
+
+from ..ratings import Ratings
+from ..stats import (
+    safe_div, win_rate, hard_win_rate, soft_win_rate, paired_diff, score_interval, hard_win_interval,
+    metric_errors, metric_intervals, significance_matrix,
+)
 from . import _charts as C
 from ._common import (
     make_bot_colours, div, head, nav, foot,
@@ -39,6 +45,7 @@ def _metrics(bot: str, final_infos: dict) -> dict:
         'doubt_accuracy': safe_div(t.successful_doubts, t.doubts),
         'cards_per_turn': safe_div(t.cards_played, t.play_turns),
         'games':          t.games,
+        'ci':             {k: list(v) for k, v in metric_intervals(info).items()},
     }
 
 
@@ -46,6 +53,21 @@ def _all_metrics(players: list, final_infos: dict) -> dict:
     return {b: _metrics(b, final_infos) for b in players}
 
 
+def _significance(players: list, final_infos: dict) -> dict:
+    """Per metric: estimate differences and Holm-adjusted p-values between every pair of
+    bots, as nested lists indexed like `players`."""
+    errors = [metric_errors(final_infos[b]) for b in players]
+    out = {}
+    for metric in errors[0] if errors else ():
+        est = np.array([e[metric][0] for e in errors])
+        se  = np.array([e[metric][1] for e in errors])
+        if np.isnan(se).any():
+            continue
+        diff, p = significance_matrix(est, se)
+        out[metric] = {'diff': diff.round(6).tolist(), 'p': p.round(6).tolist()}
+    return out
+
+
 
 def _bot_tips(bot, metrics) -> str:
     m = metrics[bot]
@@ -103,10 +125,12 @@ def _overview_rows(players, final_infos, metrics, bot_colour, score_base, prefix
       <tr>
         <td class="text-center text-muted">{rank}</td>
         <td><a href="{prefix}bots/{bot}.html" class="text-decoration-none fw-semibold">{dot}{bot}</a></td>
-        <td class="text-end">{info.total.games:,}</td>
-        <td class="text-end fw-bold" style="color:{colour}">{m['score']:.3f}</td>
+        <td class="text-end">{info.total.games:,.0f}</td>
+        <td class="text-end fw-bold" style="color:{colour}">{m['score']:.3f}
+          <span class="text-muted fw-normal small">± {(m['ci']['score'][1] - m['ci']['score'][0]) / 2:.3f}</span></td>
         <td class="text-end" style="color:{'#198754' if delta >= 0 else '#dc3545'}">{delta:+.3f}</td>
-        <td class="text-end">{m['hard_win_rate']:.1%}</td>
+        <td class="text-end">{m['hard_win_rate']:.1%}
+          <span class="text-muted small">({m['ci']['hard_win_rate'][0]:.1%}–{m['ci']['hard_win_rate'][1]:.1%})</span></td>
         <td class="text-end">{m['soft_win_rate']:.1%}</td>
         <td class="text-end text-danger">{info.losses.avg_cards:.2f}</td>
       </tr>'''
@@ -115,10 +139,104 @@ def _overview_rows(players, final_infos, metrics, bot_colour, score_base, prefix
 
 # ── Pages ─────────────────────────────────────────────────────────────────────
 
+def _paired_section(players, bot_colour, run) -> str:
+    """Duplicate mode: each bot against the next one in the ranking, paired by deal."""
+    if not run or not run.get('paired'):
+        return ''
+    rows = ''
+    for a, b in zip(players, players[1:]):
+        ps = paired_diff(run['paired'], a, b)
+        if ps is None or ps.deals == 0:
+            continue
+        hw = ps.half_width()
+        resolved = abs(ps.mean) > hw
+        badge = ('<span class="badge bg-success">resolved</span>' if resolved
+                 else '<span class="badge bg-secondary">within noise</span>')
+        rows += (
+            f'<tr><td><span style="color:{bot_colour[a]}">●</span> {a}</td>'
+            f'<td><span style="color:{bot_colour[b]}">●</span> {b}</td>'
+            f'<td class="text-end">{ps.deals:,}</td>'
+            f'<td class="text-end">{ps.mean:+.4f}</td>'
+            f'<td class="text-end">± {hw:.4f}</td>'
+            f'<td class="text-center">{badge}</td></tr>'
+        )
+    return f'''
+  <!-- Paired differences (duplicate mode) -->
+  <section id="paired" class="mb-5">
+    <div class="section-title">Paired Differences</div>
+    <p class="text-muted small mb-2">
+      Duplicate mode: <strong>{run['deals']:,} deals</strong>, each replayed with the lineup rotated
+      through every seat. ΔScore is the per-deal Score difference between neighbours in the
+      ranking, averaged over the deals both played; the deal's luck cancels out of it.
+      A gap is <em>resolved</em> when its 95% confidence interval excludes zero.
+    </p>
+    <div class="table-responsive mb-4">
+      <table class="table table-hover table-bordered align-middle bg-white shadow-sm mb-0">
+        <thead><tr>
+          <th>Bot</th><th>vs next</th>
+          <th class="text-end">Deals</th>
+          <th class="text-end">ΔScore</th>
+          <th class="text-end">95% CI</th>
+          <th class="text-center">Gap</th>
+        </tr></thead>
+        <tbody>{rows}</tbody>
+      </table>
+    </div>
+  </section>
+'''
+
+
+def _stopping_section(players, final_infos, bot_colour, run) -> str:
+    """Adaptive mode: the stopping decision and the CIs it was based on."""
+    if not run or run.get('mode') != 'adaptive':
+        return ''
+    z = run['z']
+    if run['stopped'] == 'resolved':
+        decision = (f'Stopped after <strong>{run["games"]:,}</strong> of {run["max_games"]:,} games: '
+                    f'every bot is settled.')
+    else:
+        decision = (f'Reached the cap of <strong>{run["max_games"]:,}</strong> games with '
+                    f'<strong>{len(run["unresolved"])}</strong> bots still unresolved.')
+    rows = ''
+    for b in players:
+        s_lo, s_hi = score_interval(final_infos[b], z)
+        h_lo, h_hi = hard_win_interval(final_infos[b], z)
+        badge = ('<span class="badge bg-secondary">unresolved</span>' if b in run['unresolved']
+                 else '<span class="badge bg-success">settled</span>')
+        rows += (
+            f'<tr><td><span style="color:{bot_colour[b]}">●</span> {b}</td>'
+            f'<td class="text-end">{s_lo:.4f} – {s_hi:.4f}</td>'
+            f'<td class="text-end">{h_lo:.2%} – {h_hi:.2%}</td>'
+            f'<td class="text-center">{badge}</td></tr>'
+        )
+    return f'''
+  <!-- Stopping rule (adaptive mode) -->
+  <section id="stopping" class="mb-5">
+    <div class="section-title">Stopping Rule</div>
+    <p class="text-muted small mb-2">
+      {decision} Checked every {run["check_every"]:,} games. A bot is <em>settled</em> when its
+      Score and hard-win-rate intervals are within ±{run["precision"]}, or when its Score interval
+      no longer overlaps its neighbours' in the ranking.
+    </p>
+    <div class="table-responsive mb-4">
+      <table class="table table-hover table-bordered align-middle bg-white shadow-sm mb-0">
+        <thead><tr>
+          <th>Bot</th>
+          <th class="text-end">Score CI</th>
+          <th class="text-end">Hard Win % CI (Wilson)</th>
+          <th class="text-center">Status</th>
+        </tr></thead>
+        <tbody>{rows}</tbody>
+      </table>
+    </div>
+  </section>
+'''
+
+
 def _page_index(players, final_infos, metrics, bot_colour, baselines,
-                config, generated) -> str:
+                config, generated, run=None) -> str:
     hard_base, soft_base, win_base, score_base = baselines
-    n_exp  = config.get('n_experiments', '?')
+    n_exp  = run['games'] if run else config.get('n_experiments', '?')
     ap     = config.get('available_players', [5])
     ap_str = f'{ap[0]}–{ap[-1]}' if ap else '?'
     n_bots = len(players)
@@ -178,7 +296,8 @@ def _page_index(players, final_infos, metrics, bot_colour, baselines,
   <section id="leaderboard" class="mb-5">
     <div class="section-title">Leaderboard</div>
     <p class="text-muted small mb-2">
-      Sorted by <strong>Score = hard win rate + 0.5 × soft win rate</strong>.
+      Sorted by <strong>Score = hard win rate + 0.5 × soft win rate</strong>, shown with its 95% CI
+      half-width (hard win rate: Wilson interval).
       Hard wins are worth twice as much as soft wins; losses contribute 0.
       Random-play baseline ≈ <strong>{score_base:.3f}</strong>
       (avg across {ap_str}-player games).
@@ -199,7 +318,7 @@ def _page_index(players, final_infos, metrics, bot_colour, baselines,
       </table>
     </div>
   </section>
-
+{_paired_section(players, bot_colour, run)}{_stopping_section(players, final_infos, bot_colour, run)}
   <!-- Win-type scatter -->
   <section id="overview-chart" class="mb-5">
     <div class="section-title">Win-Type Overview</div>
@@ -372,10 +491,11 @@ def _page_strategy(players, final_infos, metrics, bot_colour, baselines,
 ''' + foot(generated)
 
 
-def _page_compare(players, metrics, bot_colour, generated) -> str:
+def _page_compare(players, metrics, bot_colour, generated, significance=None) -> str:
     players_json  = json.dumps(players)
     colours_json  = json.dumps(bot_colour)
     metrics_json  = json.dumps(metrics)
+    sig_json      = json.dumps(significance or {})
 
     checkboxes = ''.join(
         f'<label class="bot-cb-label" style="border-color:{bot_colour[b]};color:{bot_colour[b]};">'
@@ -389,6 +509,7 @@ def _page_compare(players, metrics, bot_colour, generated) -> str:
 const PLAYERS  = {players_json};
 const COLOURS  = {colours_json};
 const METRICS  = {metrics_json};
+const SIG      = {sig_json};
 
 const PCT_KEYS = ['win_rate','hard_win_rate','soft_win_rate','loss_rate',
                   'bluff_rate','bluff_stealth','doubt_rate','doubt_accuracy'];
@@ -487,7 +608,10 @@ function renderTable(sel) {{
     html += `<tr><td class="text-muted small">${{ALL_LABELS[k]}}</td>`;
     for (const b of sel) {{
       const isBest = b === best && sel.length > 1;
-      html += `<td class="text-end fw-semibold" style="${{isBest ? 'background:#e8f5e9' : ''}}">${{fmt(METRICS[b][k], k)}}</td>`;
+      const ci = METRICS[b].ci[k];
+      html += `<td class="text-end fw-semibold" style="${{isBest ? 'background:#e8f5e9' : ''}}">${{fmt(METRICS[b][k], k)}}`
+            + (ci ? `<div class="text-muted fw-normal" style="font-size:.7rem;">${{fmt(ci[0], k)}} – ${{fmt(ci[1], k)}}</div>` : '')
+            + '</td>';
     }}
     html += '</tr>';
   }}
@@ -495,17 +619,48 @@ function renderTable(sel) {{
   document.getElementById('cmp-table').innerHTML = html;
 }}
 
+function renderSignificance(sel) {{
+  const k = document.getElementById('sig-metric').value;
+  const el = document.getElementById('cmp-sig');
+  if (sel.length < 2 || !SIG[k]) {{ el.innerHTML = ''; return; }}
+  const lowerBetter = k === 'loss_rate';
+  let html = '<div class="table-responsive"><table class="table table-bordered align-middle bg-white mb-0 small"><thead><tr><th></th>';
+  for (const b of sel) html += `<th class="text-center" style="color:${{COLOURS[b]}}">${{b}}</th>`;
+  html += '</tr></thead><tbody>';
+  for (const a of sel) {{
+    const i = PLAYERS.indexOf(a);
+    html += `<tr><th style="color:${{COLOURS[a]}}">${{a}}</th>`;
+    for (const b of sel) {{
+      const j = PLAYERS.indexOf(b);
+      if (i === j) {{ html += '<td class="bg-light"></td>'; continue; }}
+      const d = SIG[k].diff[i][j], p = SIG[k].p[i][j];
+      const better = lowerBetter ? d < 0 : d > 0;
+      const bg = p >= 0.05 ? '' : (better ? '#d1e7dd' : '#f8d7da');
+      const dTxt = k === 'score' || !PCT_KEYS.includes(k) ? (d >= 0 ? '+' : '') + d.toFixed(3)
+                                                          : (d >= 0 ? '+' : '') + (d*100).toFixed(1) + ' pp';
+      html += `<td class="text-center" style="background:${{bg}}">${{dTxt}}<div class="text-muted" style="font-size:.7rem;">p=${{p < 0.001 ? '&lt;0.001' : p.toFixed(3)}}</div></td>`;
+    }}
+    html += '</tr>';
+  }}
+  html += '</tbody></table></div>';
+  el.innerHTML = html;
+}}
+
 function updateAll() {{
   const sel = selected();
   renderRadar(sel);
   renderOutcome(sel);
   renderMetrics(sel);
   renderTable(sel);
+  renderSignificance(sel);
 }}
 
 document.addEventListener('DOMContentLoaded', () => {{
   updateAll();
   document.querySelectorAll('.bot-cb').forEach(cb => cb.addEventListener('change', updateAll));
+  const sigSelect = document.getElementById('sig-metric');
+  sigSelect.innerHTML = ALL_KEYS.filter(k => SIG[k]).map(k => `<option value="${{k}}">${{ALL_LABELS[k]}}</option>`).join('');
+  sigSelect.addEventListener('change', () => renderSignificance(selected()));
   document.getElementById('select-all').addEventListener('click', () => {{
     document.querySelectorAll('.bot-cb').forEach(c => c.checked = true);
     updateAll();
@@ -539,10 +694,25 @@ document.addEventListener('DOMContentLoaded', () => {{
   <!-- Stats table -->
   <div class="chart-card mb-4">
     <div class="section-title mb-3">Stats Table</div>
-    <p class="text-muted small mb-2">Best value in each row is highlighted green.</p>
+    <p class="text-muted small mb-2">Best value in each row is highlighted green. The small line under each value is its 95% confidence interval.</p>
     <div id="cmp-table"></div>
   </div>
 
+  <!-- Significance matrix -->
+  <div class="chart-card mb-4">
+    <div class="d-flex align-items-center gap-3 mb-3">
+      <div class="section-title mb-0">Significance Matrix</div>
+      <select id="sig-metric" class="form-select form-select-sm" style="width:auto;"></select>
+    </div>
+    <p class="text-muted small mb-2">
+      Each cell is the row bot minus the column bot, with the p-value of a two-sided z-test,
+      Holm-adjusted over every pair of bots in the run. Green: the row bot is significantly better
+      (p &lt; 0.05); red: significantly worse; blank: the difference is within noise — a ranking change
+      between these two bots could be chance.
+    </p>
+    <div id="cmp-sig"></div>
+  </div>
+
   <!-- Charts -->
   <div class="row g-4">
     <div class="col-12">
@@ -572,6 +742,60 @@ document.addEventListener('DOMContentLoaded', () => {{
 ''' + foot(generated)
 
 
+def _page_ratings(players, bot_colour, ratings, generated) -> str:
+    if ratings is None or not ratings.ratings:
+        body = tip_box('No ratings for this run. Set <code>ratings_file: ratings.json</code> in '
+                       '<code>experiment.yaml</code> to rate every game, then add new bots with '
+                       '<code>python -m experiments.ratings add MyBot</code>.')
+    else:
+        rows = ratings.leaderboard()
+        table_rows = ''.join(
+            f'<tr><td class="text-center text-muted">{rank}</td>'
+            f'<td><span style="color:{bot_colour.get(b, "#888")}">●</span> '
+            + (f'<a href="bots/{b}.html" class="text-decoration-none fw-semibold">{b}</a>' if b in players
+               else f'<span class="fw-semibold">{b}</span>')
+            + f'</td><td class="text-end fw-bold">{r:.1f}</td>'
+            f'<td class="text-end">{r - ratings.initial:+.1f}</td>'
+            f'<td class="text-end">{g:,}</td></tr>'
+            for rank, (b, r, g) in enumerate(rows, 1)
+        )
+        body = f'''
+  <section class="mb-5">
+    {chart_card(div(C.rating_bar(rows, bot_colour), height='460px'),
+      'Bots above the dotted line beat the field more often than an average bot would.')}
+  </section>
+  <section class="mb-5">
+    <div class="section-title">Rating Table</div>
+    <div class="table-responsive mb-4">
+      <table class="table table-hover table-bordered align-middle bg-white shadow-sm mb-0">
+        <thead><tr>
+          <th class="text-center">#</th><th>Bot</th>
+          <th class="text-end">Rating</th>
+          <th class="text-end">vs Initial</th>
+          <th class="text-end">Rated games</th>
+        </tr></thead>
+        <tbody>{table_rows}</tbody>
+      </table>
+    </div>
+  </section>'''
+
+    return head('Ratings') + nav(players, bot_colour, 'ratings') + f'''
+<div class="container-lg py-4">
+
+  <div class="mb-4">
+    <h1 class="fw-bold mb-1">📈 Ratings</h1>
+    <p class="text-muted lead mb-0">
+      Multiplayer Elo, updated after every game from the finishing order: each seat is scored
+      against every other seat (winners in order, the final losers tied). Unlike win rates, a
+      rating does not depend on which opponents happened to be drawn, and it carries over between
+      runs — a new bot can be rated against the existing pool without replaying it.
+    </p>
+  </div>
+{body}
+</div>
+''' + foot(generated)
+
+
 def _page_bot(bot, rank, players, final_infos, metrics, bot_colour,
               baselines, generated) -> str:
     hard_base, soft_base, win_base, score_base = baselines
@@ -588,7 +812,7 @@ def _page_bot(bot, rank, players, final_infos, metrics, bot_colour,
 <div class="row g-2 mb-3">
   <div class="col-6 col-md-2">{stat_card(f"{score:.3f}", "Score", colour,
                                           delta=f'{score_delta:+.3f} vs baseline')}</div>
-  <div class="col-6 col-md-2">{stat_card(f"{info.total.games:,}", "Total games")}</div>
+  <div class="col-6 col-md-2">{stat_card(f"{info.total.games:,.0f}", "Total games")}</div>
   <div class="col-6 col-md-2">{stat_card(f"{hwr:.1%}", "Hard Win %", colour, hwr)}</div>
   <div class="col-6 col-md-2">{stat_card(f"{(hwr-hard_base):+.1%}", "vs Hard Baseline",
                                           "#198754" if hwr >= hard_base else "#dc3545")}</div>
@@ -698,7 +922,8 @@ def _page_bot(bot, rank, players, final_infos, metrics, bot_colour,
 
 # ── Site generator ─────────────────────────────────────────────────────────────
 
-def generate_html_site(final_infos: dict, config: dict, output_dir: str = 'report_site/') -> None:
+def generate_html_site(final_infos: dict, config: dict, output_dir: str = 'report_site/',
+                       run: dict | None = None, ratings: Ratings | None = None) -> None:
     ap        = config.get('available_players', [5])
     avg_n     = sum(ap) / len(ap)
     hard_base  = 1.0 / avg_n
@@ -725,11 +950,12 @@ def generate_html_site(final_infos: dict, config: dict, output_dir: str = 'repor
         with open(os.path.join(output_dir, path), 'w', encoding='utf-8') as f:
             f.write(content)
 
-    _write('index.html',    _page_index(players, final_infos, metrics, colours, baselines, config, generated))
+    _write('index.html',    _page_index(players, final_infos, metrics, colours, baselines, config, generated, run))
     _write('strategy.html', _page_strategy(players, final_infos, metrics, colours, baselines, config, generated))
-    _write('compare.html',  _page_compare(players, metrics, colours, generated))
+    _write('compare.html',  _page_compare(players, metrics, colours, generated, _significance(players, final_infos)))
+    _write('ratings.html',  _page_ratings(players, colours, ratings, generated))
 
     for i, bot in enumerate(players):
         _write(f'bots/{bot}.html', _page_bot(bot, i + 1, players, final_infos, metrics, colours, baselines, generated))
 
-    print(f'Site written to {output_dir}  ({len(players) + 3} files)')
+    print(f'Site written to {output_dir}  ({len(players) + 4} files)')
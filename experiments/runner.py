@@ -1,27 +1,79 @@
+from __future__ import annotations
 import random
-import yaml
 from dataclasses import asdict
-from tqdm import tqdm
+from itertools import combinations
+from typing import TYPE_CHECKING
 
-from dubito.core_game import dubito
-from dubito.player import Player
-import bots  # noqa: F401 — side-effect import: registers all subclasses in BotBase.registry
+import numpy as np
+
+from dubito.core_game import dubito, initialize
+from dubito.handlers import StatsHandler
+from dubito.player import Player, PlayerPool
 from bots.base import BotBase
+from bots.search import SEARCH_BOTS
+
+from .cache import ResultCache, block_key, bot_hash, engine_hash
+from .stats import (
+    BotStats, BucketStats, PairedStats, make_bot_stats, merge_stats, paired_diff, hard_win_rate, soft_win_rate, safe_div,
+    score_interval, hard_win_interval, record_block,
+)
 
-from .stats import BotStats, BucketStats, make_bot_stats, hard_win_rate, soft_win_rate, safe_div
+if TYPE_CHECKING:                               # options imported by the runs that use them
+    from .archive import ArchiveWriter
+    from .ratings import Ratings
+    from .scheduler import LineupScheduler
+    from .telemetry import Telemetry            # http.server: only needed when a run publishes
+    from dubito.lockstep import LockstepResult
+    from dubito.sandbox import Sandbox
 
 
 ALL_BOTS = BotBase.registry
+# Played when experiment.yaml has no `bots:` list; search bots must be listed explicitly.
+DEFAULT_BOTS = [name for name in ALL_BOTS if name not in SEARCH_BOTS]
+# Deck config of block-based runs (cached and farm modes); part of every block's cache key.
+BLOCK_DEAL = {'deck_size': 14, 'n_jollies': 2, 'max_turns': 1_000, 'stall_turns': None}
+
+MODES = ('random', 'adaptive', 'duplicate', 'cached', 'farm', 'lockstep')
+
+# Options of experiment.yaml and the modes that honour them; check_config refuses them
+# elsewhere. Block and batch modes (cached, farm, lockstep) never see single games.
+MODE_OPTIONS = {
+    'ratings_file':   {'random', 'adaptive', 'duplicate'},
+    'schedule':       {'random', 'adaptive'},
+    'archive':        {'random', 'adaptive'},
+    'telemetry':      {'random', 'adaptive'},
+    'telemetry_port': {'random', 'adaptive'},
+    'sandbox':        {'random', 'adaptive'},
+}
 
 
 def load_config(path: str = 'experiment.yaml') -> dict:
+    import yaml                           # deferred, like tqdm: block workers never need them
     with open(path) as f:
         return yaml.safe_load(f)
 
 
-def save_stats(stats: dict, path: str) -> None:
+def check_config(config: dict) -> None:
+    """Refuse unknown modes and options that the chosen mode would silently ignore."""
+    mode = config.get('mode', 'random')
+    if mode not in MODES:
+        raise ValueError(f"unknown mode {mode!r} (expected one of {', '.join(MODES)})")
+    unsupported = [key for key, modes in MODE_OPTIONS.items() if config.get(key) and mode not in modes]
+    if unsupported:
+        raise ValueError(f"{', '.join(unsupported)} not supported in {mode} mode")
+
+
+def save_stats(stats: dict, path: str, run: dict | None = None) -> None:
+    """Write the BotStats; run metadata (e.g. duplicate-mode paired differences) goes
+    under the `_run` key, which load_stats skips."""
+    import yaml
+    data = {k: asdict(v) for k, v in stats.items()}
+    if run is not None:
+        data['_run'] = dict(run)
+        if 'paired' in run:
+            data['_run']['paired'] = {a: {b: asdict(ps) for b, ps in row.items()} for a, row in run['paired'].items()}
     with open(path, 'w') as f:
-        yaml.dump({k: asdict(v) for k, v in stats.items()}, f, allow_unicode=True)
+        yaml.dump(data, f, allow_unicode=True)
 
 
 def print_summary(final_infos: dict) -> None:
@@ -50,68 +102,493 @@ def print_summary(final_infos: dict) -> None:
             reverse=True,
         )
         for win_pct, bot, total, cards_per_turn in rows:
-            print(f"{bot:<{col}} {total:>8} {win_pct:>7.1f}% {cards_per_turn:>11.2f}")
+            print(f"{bot:<{col}} {total:>8.0f} {win_pct:>7.1f}% {cards_per_turn:>11.2f}")
         print(sep)
 
     _section('Hard Wins (1st place)',  'hard_wins', hard_win_rate)
     _section('Soft Wins (2nd to n-1)', 'soft_wins', soft_win_rate)
 
+    faulty = {b: info.total for b, info in final_infos.items()
+              if info.total.decision_timeouts or info.total.exceptions or info.total.illegal_moves}
+    if faulty:
+        header = f"{'Bot':<{col}} {'Timeouts':>9} {'Exceptions':>11} {'Illegal':>8}"
+        sep = '=' * len(header)
+        print(f'\n{sep}\nSandbox faults (decisions replaced by the fallback)\n{sep}\n{header}\n' + '-' * len(header))
+        for bot, t in sorted(faulty.items()):
+            print(f"{bot:<{col}} {t.decision_timeouts:>9.0f} {t.exceptions:>11.0f} {t.illegal_moves:>8.0f}")
+        print(sep)
 
-def play_games(algorithms: list, available_players: list, n_experiments: int) -> dict:
-    players_alg = {a.__name__ for a in algorithms}
-    final_infos: dict[str, BotStats] = {alg: make_bot_stats(players_alg) for alg in players_alg}
 
-    for _ in tqdm(range(n_experiments), desc='Playing Games', unit='game'):
-        player_number = random.choice(available_players)
-        all_players: list[Player] = [
-            random.choice(algorithms)(i)
-            for i in range(1, player_number + 1)
-        ]
-
-        results, game_infos = dubito(all_players)
-        stats = game_infos['stats'].data
-        n = len(all_players)
-        winners = results['winners']
-        n_winners = len(winners)
-
-        for idx, p in enumerate(all_players):
-            name = p.__class__.__name__
-            if winners and p is winners[0]:
-                outcome = 'hard_wins'
-            elif p in winners:
-                outcome = 'soft_wins'
-            else:
-                outcome = 'losses'
-            prev_name = all_players[(idx - 1) % n].__class__.__name__
-            next_name = all_players[(idx + 1) % n].__class__.__name__
-            s = stats[p.id]
-
-            if p in winners:
-                raw_pos = winners.index(p) + 1
-            else:
-                raw_pos = n_winners + 1
-            rel_pos = (n - raw_pos) / (n - 1) if n > 1 else 0.5
-
-            for bucket in ('total', outcome):
-                b: BucketStats = getattr(final_infos[name], bucket)
-                b.games += 1
-                b.prev[prev_name] += 1
-                b.next[next_name] += 1
-                b.avg_cards += len(p.cards)
-                b.bluffs += s['bluffs']
-                b.bluff_caught += s['dishonest_times']
-                b.doubts += s['doubts']
-                b.successful_doubts += s['successful_doubts']
-                b.cards_played += s['total_cards_played']
-                b.play_turns += s['play_turns']
-                b.not_first_turns += s['not_first_turns']
-                b.total_position += rel_pos
-
-    for alg in players_alg:
+def print_paired(final_infos: dict, run: dict) -> None:
+    """Duplicate mode: paired Score difference of each bot against the next one in the
+    ranking, with its 95% CI. '*' marks gaps the CI resolves (excludes 0)."""
+    ranked = sorted(
+        (b for b, info in final_infos.items() if info.total.games > 0),
+        key=lambda b: hard_win_rate(final_infos[b]) + 0.5 * soft_win_rate(final_infos[b]),
+        reverse=True,
+    )
+    header = f"{'Bot':<20} {'vs':<20} {'Deals':>7} {'ΔScore':>9} {'95% CI':>9}"
+    sep = '=' * len(header)
+    print(f'\n{sep}')
+    print(f"Paired differences ({run['deals']:,} duplicate deals)")
+    print(sep)
+    print(header)
+    print('-' * len(header))
+    for a, b in zip(ranked, ranked[1:]):
+        ps = paired_diff(run['paired'], a, b)
+        if ps is None or ps.deals == 0:
+            print(f"{a:<20} {b:<20} {0:>7} {'—':>9} {'—':>9}")
+            continue
+        hw = ps.half_width()
+        mark = '*' if abs(ps.mean) > hw else ''
+        print(f"{a:<20} {b:<20} {ps.deals:>7} {ps.mean:>+9.4f} {'±' + format(hw, '.4f'):>9}{mark}")
+    print(sep)
+
+
+def print_stopping(final_infos: dict, run: dict) -> None:
+    """Adaptive mode: why the run stopped, and each bot's Score / hard-win CI."""
+    ci = intervals(final_infos, run['z'])
+    header = f"{'Bot':<20} {'Score':>16} {'Hard Win %':>18}"
+    sep = '=' * len(header)
+    reason = ('ranking resolved' if run['stopped'] == 'resolved'
+              else f"max games reached, {len(run['unresolved'])} bots unresolved")
+    print(f'\n{sep}')
+    print(f"Stopped after {run['games']:,} games: {reason} (precision ±{run['precision']})")
+    print(sep)
+    print(header)
+    print('-' * len(header))
+    for bot in sorted(ci, key=lambda b: sum(ci[b]['score']), reverse=True):
+        (s_lo, s_hi), (h_lo, h_hi) = ci[bot]['score'], ci[bot]['hard_win_rate']
+        mark = '?' if bot in run['unresolved'] else ''
+        print(f"{bot:<20} {s_lo:>7.4f}–{s_hi:<7.4f} {h_lo * 100:>8.2f}–{h_hi * 100:<6.2f}%{mark}")
+    print(sep)
+
+
+def record_game(final_infos: dict, all_players: list[Player], results: dict, stats: dict,
+                weight: float = 1, faults: dict | None = None) -> None:
+    """Add one finished game to the per-bot BotStats (raw sums — see finalize_stats).
+    `weight` is the lineup's importance weight when a LineupScheduler picked it; `faults`
+    the game's Sandbox counts (game_infos['sandbox']) when it was sandboxed."""
+    n = len(all_players)
+    winners = results['winners']
+    n_winners = len(winners)
+
+    for idx, p in enumerate(all_players):
+        name = p.__class__.__name__
+        if winners and p is winners[0]:
+            outcome = 'hard_wins'
+        elif p in winners:
+            outcome = 'soft_wins'
+        else:
+            outcome = 'losses'
+        prev_name = all_players[(idx - 1) % n].__class__.__name__
+        next_name = all_players[(idx + 1) % n].__class__.__name__
+        s = stats[p.id]
+
+        if p in winners:
+            raw_pos = winners.index(p) + 1
+        else:
+            raw_pos = n_winners + 1
+        rel_pos = (n - raw_pos) / (n - 1) if n > 1 else 0.5
+
+        for bucket in ('total', outcome):
+            b: BucketStats = getattr(final_infos[name], bucket)
+            b.games += weight
+            b.prev[prev_name] += weight
+            b.next[next_name] += weight
+            b.avg_cards += weight * len(p.cards)
+            b.bluffs += weight * s['bluffs']
+            b.bluff_caught += weight * s['dishonest_times']
+            b.doubts += weight * s['doubts']
+            b.successful_doubts += weight * s['successful_doubts']
+            b.cards_played += weight * s['total_cards_played']
+            b.play_turns += weight * s['play_turns']
+            b.not_first_turns += weight * s['not_first_turns']
+            b.total_position += weight * rel_pos
+            b.weight_sq += weight * weight
+            b.avg_cards_sq += weight * len(p.cards) ** 2
+            b.position_sq += weight * rel_pos ** 2
+            b.cards_played_sq += weight * s['total_cards_played'] ** 2
+            b.play_turns_sq += weight * s['play_turns'] ** 2
+            b.cards_turns += weight * s['total_cards_played'] * s['play_turns']
+            if faults is not None:
+                b.decision_timeouts += weight * faults[p.id]['decision_timeouts']
+                b.exceptions += weight * faults[p.id]['exceptions']
+                b.illegal_moves += weight * faults[p.id]['illegal_moves']
+
+
+def finalize_stats(final_infos: dict) -> dict:
+    """Turn the per-game sums of avg_cards, total_position and their squares into averages."""
+    for info in final_infos.values():
         for bucket in ('total', 'hard_wins', 'soft_wins', 'losses'):
-            b: BucketStats = getattr(final_infos[alg], bucket)
+            b: BucketStats = getattr(info, bucket)
             if b.games > 0:
                 b.avg_cards /= b.games
                 b.total_position /= b.games
-
+                b.avg_cards_sq /= b.games
+                b.position_sq /= b.games
     return final_infos
+
+
+def game_score(player: Player, results: dict) -> float:
+    """1 for a hard win, 0.5 for a soft win, 0 for a loss — the per-game Score."""
+    winners = results['winners']
+    if winners and player is winners[0]:
+        return 1.0
+    return 0.5 if player in winners else 0.0
+
+
+def _play_random(final_infos: dict, algorithms: list, available_players: list, n_games: int, bar,
+                 scheduler: LineupScheduler | None = None, ratings: Ratings | None = None,
+                 archive: ArchiveWriter | None = None, telemetry: Telemetry | None = None,
+                 sandbox: Sandbox | None = None) -> None:
+    pool = PlayerPool()
+    for _ in range(n_games):
+        player_number = random.choice(available_players)
+        if scheduler is None:
+            lineup, weight = [random.choice(algorithms) for _ in range(player_number)], 1
+        else:
+            lineup, weight = scheduler.next_lineup(final_infos, player_number)
+        all_players: list[Player] = pool.seat(lineup)
+
+        observers = [StatsHandler()]
+        if archive is not None:
+            from .archive import ArchiveRecorder
+            seed = archive.next_seed()
+            random.seed(seed)
+            observers.append(ArchiveRecorder())
+        results, game_infos = dubito(all_players, observers=observers, sandbox=sandbox)
+        record_game(final_infos, all_players, results, game_infos['stats'].data, weight, game_infos.get('sandbox'))
+        if ratings is not None:
+            ratings.record(results)
+        if archive is not None:
+            archive.add(seed, [alg.__name__ for alg in lineup], *game_infos['archive'])
+        if telemetry is not None:
+            telemetry.record(results, [alg.__name__ for alg in lineup])
+            telemetry.tick(final_infos)
+        bar.update(1)
+
+
+def play_games(algorithms: list, available_players: list, n_experiments: int,
+               scheduler: LineupScheduler | None = None, ratings: Ratings | None = None,
+               archive: ArchiveWriter | None = None, telemetry: Telemetry | None = None,
+               sandbox: Sandbox | None = None) -> dict:
+    """Random-lineup games. With a LineupScheduler, lineups favour the uncertain bots and
+    pairings and every game is importance-weighted so the stats stay unbiased. With
+    Ratings, every game also updates the bots' Elo ratings; with an ArchiveWriter, every
+    game is seeded and archived; with Telemetry, live snapshots are published; with a
+    Sandbox, every decision runs under its deadline and faults are counted."""
+    players_alg = {a.__name__ for a in algorithms}
+    final_infos: dict[str, BotStats] = {alg: make_bot_stats(players_alg) for alg in players_alg}
+
+    from tqdm import tqdm
+    with tqdm(total=n_experiments, desc='Playing Games', unit='game') as bar:
+        _play_random(final_infos, algorithms, available_players, n_experiments, bar, scheduler, ratings, archive,
+                     telemetry, sandbox)
+    if telemetry is not None:
+        telemetry.publish(final_infos, done=True)
+
+    return finalize_stats(final_infos)
+
+
+def intervals(final_infos: dict, z: float = 1.96) -> dict[str, dict]:
+    """Per-bot CIs: {'score': (lo, hi), 'hard_win_rate': (lo, hi)} (Wilson for the rate)."""
+    return {
+        bot: {
+            'score': score_interval(info, z),
+            'hard_win_rate': hard_win_interval(info, z),
+        }
+        for bot, info in final_infos.items()
+    }
+
+
+def unresolved_bots(final_infos: dict, precision: float, z: float = 1.96) -> list[str]:
+    """
+    Bots whose place in the Score ranking is not settled yet.
+
+    A bot is settled when both its Score and hard-win-rate CIs are at most `precision`
+    wide on each side, or when its Score CI no longer overlaps those of its neighbours
+    in the ranking (its place is known even if the value is not that precise).
+    """
+    ci = intervals(final_infos, z)
+    ranked = sorted(ci, key=lambda b: sum(ci[b]['score']), reverse=True)
+    out = []
+    for i, bot in enumerate(ranked):
+        precise = all((hi - lo) / 2 <= precision for lo, hi in ci[bot].values())
+        lo, hi = ci[bot]['score']
+        above = i == 0 or ci[ranked[i - 1]]['score'][0] > hi
+        below = i == len(ranked) - 1 or ci[ranked[i + 1]]['score'][1] < lo
+        if not (precise or (above and below)):
+            out.append(bot)
+    return out
+
+
+def play_adaptive(algorithms: list, available_players: list, max_games: int,
+                  precision: float = 0.005, check_every: int = 10_000, z: float = 1.96,
+                  scheduler: LineupScheduler | None = None, ratings: Ratings | None = None,
+                  archive: ArchiveWriter | None = None, telemetry: Telemetry | None = None,
+                  sandbox: Sandbox | None = None) -> tuple[dict, dict]:
+    """
+    Random-lineup games with a sequential stopping rule.
+
+    Every `check_every` games the per-bot CIs are recomputed (see unresolved_bots); the run
+    stops as soon as every bot is settled, or at `max_games`.
+
+    Returns:
+        (final_infos, run): the usual BotStats, plus run metadata recording the stopping
+        decision: 'stopped' ('resolved' or 'max_games'), the games played and every check.
+    """
+    players_alg = {a.__name__ for a in algorithms}
+    final_infos: dict[str, BotStats] = {alg: make_bot_stats(players_alg) for alg in players_alg}
+    games, checks, stopped = 0, [], 'max_games'
+    pending = sorted(players_alg)
+
+    from tqdm import tqdm
+    with tqdm(total=max_games, desc='Playing Games (adaptive)', unit='game') as bar:
+        while games < max_games:
+            n = min(check_every, max_games - games)
+            _play_random(final_infos, algorithms, available_players, n, bar, scheduler, ratings, archive, telemetry,
+                         sandbox)
+            games += n
+            pending = unresolved_bots(final_infos, precision, z)
+            checks.append({'games': games, 'unresolved': len(pending)})
+            bar.set_postfix(unresolved=len(pending))
+            if not pending:
+                stopped = 'resolved'
+                break
+    if telemetry is not None:
+        telemetry.publish(final_infos, done=True)
+
+    run = {
+        'mode': 'adaptive', 'games': games, 'max_games': max_games, 'precision': precision,
+        'check_every': check_every, 'z': z, 'stopped': stopped, 'unresolved': pending, 'checks': checks,
+    }
+    return finalize_stats(final_infos), run
+
+
+def play_duplicate(algorithms: list, available_players: list, n_experiments: int,
+                   seed: int | None = None, ratings: Ratings | None = None) -> tuple[dict, dict]:
+    """
+    Duplicate-deal tournament: every deal is replayed once per seat rotation.
+
+    Each deal fixes a player count, a lineup (distinct bots when the pool is large
+    enough), the dealt hands and the RNG seed. The lineup is then rotated through the
+    seats, so every bot plays every hand from every seat position against the same
+    opponents. Luck of the deal cancels out of the comparison between two bots of the
+    same deal, which is what the paired differences measure.
+
+    Args:
+        n_experiments: Game budget; each deal costs as many games as it has seats.
+        seed: Seeds the deal sequence for a reproducible run.
+        ratings: Updated with every game when given.
+
+    Returns:
+        (final_infos, run): the usual BotStats, plus run metadata with the paired
+        score differences {bot_a: {bot_b: PairedStats}} (a listed before b).
+    """
+    rng = random.Random(seed)
+    players_alg = {a.__name__ for a in algorithms}
+    final_infos: dict[str, BotStats] = {alg: make_bot_stats(players_alg) for alg in players_alg}
+    paired: dict[str, dict[str, PairedStats]] = {}
+    games = deals = 0
+
+    from tqdm import tqdm
+    with tqdm(total=n_experiments, desc='Playing Duplicate Deals', unit='game') as bar:
+        while games < n_experiments:
+            n = rng.choice(available_players)
+            lineup = rng.sample(algorithms, n) if len(algorithms) >= n else rng.choices(algorithms, k=n)
+            deal_seed = rng.getrandbits(32)
+            random.seed(deal_seed)
+            dealer = [lineup[i](i + 1) for i in range(n)]
+            initialize(dealer, n_jollies=2)
+            hands = [list(p.cards.hand) for p in dealer]
+
+            scores: dict[str, list[float]] = {}
+            for shift in range(n):
+                all_players = [lineup[(i + shift) % n](i + 1) for i in range(n)]
+                for p, hand in zip(all_players, hands):
+                    p.add_cards(list(hand))
+                random.seed(deal_seed)
+                results, game_infos = dubito(all_players, shuffle_players=False, deal=False,
+                                             observers=[StatsHandler()])
+                record_game(final_infos, all_players, results, game_infos['stats'].data)
+                if ratings is not None:
+                    ratings.record(results)
+                for p in all_players:
+                    scores.setdefault(p.__class__.__name__, []).append(game_score(p, results))
+
+            means = {bot: sum(v) / len(v) for bot, v in scores.items()}
+            for a, b in combinations(sorted(means), 2):
+                paired.setdefault(a, {}).setdefault(b, PairedStats()).add(means[a] - means[b])
+            games += n
+            deals += 1
+            bar.update(n)
+
+    run = {'mode': 'duplicate', 'games': games, 'deals': deals, 'seed': seed, 'paired': paired}
+    return finalize_stats(final_infos), run
+
+
+def block_lineup(algorithms: list, available_players: list, seed: int, block: int) -> list:
+    """Lineup of block `block`: one seat count and per-seat uniform draws from its own seed.
+    `algorithms` must be sorted by name, so the draw does not depend on the config order."""
+    rng = random.Random(f'{seed}:{block}')
+    n = rng.choice(available_players)
+    return [rng.choice(algorithms) for _ in range(n)]
+
+
+def play_block(lineup: list, players_alg: set, seed: int, block: int, size: int, deal: dict) -> dict:
+    """Raw BotStats (before finalize_stats) of the `size` seeded games of one block."""
+    block_stats = {alg: make_bot_stats(players_alg) for alg in {a.__name__ for a in lineup}}
+    random.seed(f'{seed}:{block}:games')
+    pool = PlayerPool()
+    for _ in range(size):
+        all_players: list[Player] = pool.seat(lineup)
+        results, game_infos = dubito(all_players, observers=[StatsHandler()], **deal)
+        record_game(block_stats, all_players, results, game_infos['stats'].data)
+    record_block(block_stats)
+    return block_stats
+
+
+def play_cached(algorithms: list, available_players: list, n_experiments: int, seed: int = 0,
+                block_size: int = 100, cache: ResultCache | None = None) -> tuple[dict, dict]:
+    """
+    Random-lineup games played as cacheable blocks (see experiments/cache.py).
+
+    Block i draws one lineup and seat count from its own seed and plays `block_size`
+    games with it (seats reshuffled every game). A block whose key is already in the
+    cache is merged from disk; only blocks whose bots, engine or config changed are
+    simulated. Lineups are drawn with the same per-seat uniform law as play_games.
+
+    Returns:
+        (final_infos, run): the usual BotStats, plus run metadata with the number of
+        blocks read from the cache and simulated.
+    """
+    cache = cache or ResultCache()
+    algorithms = sorted(algorithms, key=lambda a: a.__name__)
+    players_alg = {a.__name__ for a in algorithms}
+    hashes = {a.__name__: bot_hash(a) for a in algorithms}
+    engine = engine_hash()
+    deal = BLOCK_DEAL
+    final_infos: dict[str, BotStats] = {alg: make_bot_stats(players_alg) for alg in players_alg}
+    n_blocks = -(-n_experiments // block_size)
+
+    from tqdm import tqdm
+    for block in tqdm(range(n_blocks), desc='Playing Blocks', unit='block'):
+        size = min(block_size, n_experiments - block * block_size)
+        lineup = block_lineup(algorithms, available_players, seed, block)
+        key = block_key(engine, [(a.__name__, hashes[a.__name__]) for a in lineup], deal, seed, block, size)
+
+        block_stats = cache.get(key)
+        if block_stats is None:
+            block_stats = play_block(lineup, players_alg, seed, block, size, deal)
+            cache.put(key, block_stats)
+        merge_stats(final_infos, block_stats)
+
+    run = {'mode': 'cached', 'games': n_experiments, 'seed': seed, 'block_size': block_size,
+           'blocks': n_blocks, 'cached_blocks': cache.hits, 'simulated_blocks': cache.misses}
+    return finalize_stats(final_infos), run
+
+
+# BucketStats field ← per-seat quantity of a lockstep batch (see record_lockstep)
+_LOCKSTEP_FIELDS = {
+    'bluffs': 'bluffs', 'bluff_caught': 'dishonest_times', 'doubts': 'doubts',
+    'successful_doubts': 'successful_doubts', 'cards_played': 'total_cards_played',
+    'play_turns': 'play_turns', 'not_first_turns': 'not_first_turns',
+}
+
+
+def record_lockstep(final_infos: dict, names: list[str], result: LockstepResult) -> None:
+    """Add every game of a lockstep batch to the per-bot BotStats, as record_game would
+    one game at a time. `names[r]` is the bot of rules index r."""
+    seats, place = result.seats, result.place
+    G, P = seats.shape
+    present = seats >= 0
+    n = present.sum(1, keepdims=True)
+    idx = np.arange(P)
+    rows = np.arange(G)[:, None]
+    prev_kind = seats[rows, (idx - 1) % n]
+    next_kind = seats[rows, (idx + 1) % n]
+    raw_pos = np.where(place > 0, place, (place > 0).sum(1, keepdims=True) + 1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        rel_pos = np.where(n > 1, (n - raw_pos) / (n - 1), 0.5)
+    outcome = np.where(place == 1, 1, np.where(place > 0, 2, 3))   # index into the buckets below
+
+    R = len(names)
+    key = (seats * 4 + outcome)[present]
+    cards = result.cards[present].astype(np.int64)
+    s = {k: v[present].astype(np.int64) for k, v in result.stats.items()}
+    ones = np.ones_like(cards)
+    counts = {                                                     # integer sums
+        'games': ones, 'avg_cards': cards, 'avg_cards_sq': cards ** 2,
+        'cards_played_sq': s['total_cards_played'] ** 2, 'play_turns_sq': s['play_turns'] ** 2,
+        'cards_turns': s['total_cards_played'] * s['play_turns'],
+        **{field: s[stat] for field, stat in _LOCKSTEP_FIELDS.items()},
+    }
+    moments = {'total_position': rel_pos[present], 'weight_sq': ones, 'position_sq': rel_pos[present] ** 2}
+
+    def per_bucket(sums: np.ndarray) -> np.ndarray:
+        sums = sums.reshape(R, 4, *sums.shape[1:])
+        sums[:, 0] = sums[:, 1:].sum(1)                            # total = every outcome
+        return sums
+
+    def by_key(values: np.ndarray) -> np.ndarray:
+        return per_bucket(np.bincount(key, values, minlength=R * 4))
+
+    counts = {f: by_key(v).round().astype(np.int64) for f, v in counts.items()}
+    moments = {f: by_key(v) for f, v in moments.items()}
+    prev = per_bucket(np.bincount(key * R + prev_kind[present], minlength=R * 4 * R).reshape(R * 4, R))
+    nxt = per_bucket(np.bincount(key * R + next_kind[present], minlength=R * 4 * R).reshape(R * 4, R))
+
+    for r, name in enumerate(names):
+        if not counts['games'][r, 0]:
+            continue
+        for i, bucket in enumerate(('total', 'hard_wins', 'soft_wins', 'losses')):
+            b: BucketStats = getattr(final_infos[name], bucket)
+            for f, sums in counts.items():
+                setattr(b, f, getattr(b, f) + int(sums[r, i]))
+            for f, sums in moments.items():
+                setattr(b, f, getattr(b, f) + float(sums[r, i]))
+            for q, other in enumerate(names):
+                b.prev[other] += int(prev[r, i, q])
+                b.next[other] += int(nxt[r, i, q])
+
+
+def play_lockstep(algorithms: list, available_players: list, n_experiments: int, seed: int = 0,
+                  batch_size: int = 10_000) -> tuple[dict, dict]:
+    """
+    Random-lineup games played in lockstep batches (see dubito/lockstep.py), for bots with
+    vectorized rules (bots/manual/vectorized.py). Lineups are drawn with the same
+    per-seat uniform law as play_games, and games use BLOCK_DEAL.
+
+    Returns:
+        (final_infos, run): the usual BotStats, plus run metadata.
+    """
+    from bots.manual.vectorized import rules_for
+    from dubito.lockstep import simulate
+
+    rules = [rules_for(a) for a in algorithms]
+    missing = [a.__name__ for a, r in zip(algorithms, rules) if r is None]
+    if missing:
+        raise ValueError(f"no lockstep rules for {', '.join(missing)}: see bots/manual/vectorized.py")
+    names = [a.__name__ for a in algorithms]
+    players_alg = set(names)
+    final_infos: dict[str, BotStats] = {alg: make_bot_stats(players_alg) for alg in players_alg}
+    rng = np.random.default_rng(seed)
+    P = max(available_players)
+    timeouts = 0
+
+    from tqdm import tqdm
+    with tqdm(total=n_experiments, desc='Playing Games', unit='game') as bar:
+        for start in range(0, n_experiments, batch_size):
+            size = min(batch_size, n_experiments - start)
+            n = rng.choice(available_players, size)
+            seats = rng.integers(0, len(algorithms), (size, P))
+            seats[np.arange(P) >= n[:, None]] = -1
+            result = simulate(seats, rules, **BLOCK_DEAL, seed=int(rng.integers(2 ** 63)))
+            record_lockstep(final_infos, names, result)
+            timeouts += int(result.timeout.sum())
+            bar.update(size)
+
+    run = {'mode': 'lockstep', 'games': n_experiments, 'seed': seed, 'batch_size': batch_size,
+           'timeouts': timeouts}
+    return finalize_stats(final_infos), run
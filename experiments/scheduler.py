@@ -0,0 +1,76 @@
+"""
+LineupScheduler — uncertainty-driven lineup sampling for the tournament runner.
+
+Uniform lineups (`random.choice(algorithms)` per seat) keep spending games on bots whose
+place is already certain. The scheduler draws each seat from a proposal that favours
+bots with a wide Score CI, doubly so when it overlaps a neighbour's in the ranking.
+Seating is left to dubito(), which shuffles the lineup, so the proposal does not try to
+steer who sits next to whom.
+
+The proposal is mixed with the uniform draw (`explore`), so every lineup stays possible.
+Each game then carries the importance weight P_uniform(lineup) / P_proposal(lineup) and
+record_game adds weighted counts: the marginal stats estimate the same quantities as a
+uniform run. Weights inflate variance, which the CIs account for through the effective
+sample size (stats.effective_games). Player counts are still drawn uniformly.
+"""
+from __future__ import annotations
+import random
+
+from .stats import BotStats, score_interval
+
+
+class LineupScheduler:
+
+    def __init__(self, algorithms: list, explore: float = 0.5, refresh: int = 1_000,
+                 z: float = 1.96, rng: random.Random | None = None) -> None:
+        """
+        Args:
+            algorithms (list): Bot classes to draw from.
+            explore (float): Share of the uniform draw in each seat's proposal. Caps each
+                seat's weight at 1 / explore. Defaults to 0.5.
+            refresh (int): Games between two priority updates. Defaults to 1_000.
+            z (float): CI quantile used for the priorities. Defaults to 1.96.
+        """
+        self.algorithms = list(algorithms)
+        self.explore = explore
+        self.refresh = refresh
+        self.z = z
+        self.rng = rng or random
+        self.priority = {a.__name__: 1.0 for a in self.algorithms}
+        self._seen = 0
+
+    # ── Priorities ────────────────────────────────────────────────────────────
+
+    def update(self, final_infos: dict[str, BotStats]) -> None:
+        """Recompute bot priorities from the running (un-normalized) stats."""
+        ci = {b: score_interval(info, self.z) for b, info in final_infos.items()}
+        ranked = sorted(ci, key=lambda b: sum(ci[b]), reverse=True)
+        for i, bot in enumerate(ranked):
+            lo, hi = ci[bot]
+            overlaps = sum(
+                1 for j in (i - 1, i + 1)
+                if 0 <= j < len(ranked) and ci[ranked[j]][0] <= hi and ci[ranked[j]][1] >= lo
+            )
+            self.priority[bot] = max((hi - lo) / 2, 1e-6) * (1 + overlaps)
+
+    def _proposal(self) -> list[float]:
+        weights = [self.priority[a.__name__] for a in self.algorithms]
+        total = sum(weights)
+        k = len(self.algorithms)
+        return [(1 - self.explore) * w / total + self.explore / k for w in weights]
+
+    # ── Sampling ──────────────────────────────────────────────────────────────
+
+    def next_lineup(self, final_infos: dict[str, BotStats], n_players: int) -> tuple[list, float]:
+        """Draw a lineup of `n_players` bot classes and its importance weight."""
+        if self._seen % self.refresh == 0:
+            self.update(final_infos)
+        self._seen += 1
+
+        k = len(self.algorithms)
+        q = self._proposal()
+        lineup, weight = [], 1.0
+        for i in self.rng.choices(range(k), weights=q, k=n_players):
+            lineup.append(self.algorithms[i])
+            weight *= (1 / k) / q[i]
+        return lineup, weight
@@ -1,5 +1,8 @@
+import math
 from dataclasses import dataclass, field
 
+import numpy as np
+
 
 @dataclass
 class BucketStats:
@@ -15,6 +18,22 @@ class BucketStats:
     play_turns: int = 0
     not_first_turns: int = 0
     total_position: float = 0.0
+    weight_sq: float = 0.0                     # Σ weight² of the games (== games when unweighted)
+    # Second moments for the confidence intervals (see metric_errors)
+    avg_cards_sq: float = 0.0                  # mean of cards_left², like avg_cards
+    position_sq: float = 0.0                   # mean of rel_pos², like total_position
+    cards_played_sq: float = 0.0               # Σ per-game cards_played²
+    play_turns_sq: float = 0.0                 # Σ per-game play_turns²
+    cards_turns: float = 0.0                   # Σ per-game cards_played × play_turns
+    # Per-block moments of block-based runs (cached and farm modes, see record_block)
+    blocks: int = 0
+    block_games_sq: float = 0.0                # Σ over blocks of the bot's games²
+    block_score_sq: float = 0.0                # Σ over blocks of the bot's Score sum²
+    block_score_games: float = 0.0             # Σ over blocks of Score sum × games
+    # Sandbox faults (dubito/sandbox.py): decisions replaced by the fallback action
+    decision_timeouts: int = 0
+    exceptions: int = 0
+    illegal_moves: int = 0
 
 
 @dataclass
@@ -25,6 +44,40 @@ class BotStats:
     losses:    BucketStats = field(default_factory=BucketStats)  # finished last
 
 
+@dataclass
+class PairedStats:
+    """Running sums of per-deal score differences (bot_a − bot_b) in duplicate mode."""
+    deals: int = 0
+    total: float = 0.0
+    total_sq: float = 0.0
+
+    def add(self, diff: float) -> None:
+        self.deals += 1
+        self.total += diff
+        self.total_sq += diff * diff
+
+    @property
+    def mean(self) -> float:
+        return safe_div(self.total, self.deals)
+
+    def half_width(self, z: float = 1.96) -> float:
+        """Normal-approximation CI half-width of the mean difference (inf below 2 deals)."""
+        if self.deals < 2:
+            return float('inf')
+        var = (self.total_sq - self.deals * self.mean ** 2) / (self.deals - 1)
+        return z * (max(var, 0.0) / self.deals) ** 0.5
+
+
+def paired_diff(paired: dict, a: str, b: str) -> PairedStats | None:
+    """PairedStats of a − b, whichever order the pair was stored in."""
+    if b in paired.get(a, {}):
+        return paired[a][b]
+    ps = paired.get(b, {}).get(a)
+    if ps is None:
+        return None
+    return PairedStats(deals=ps.deals, total=-ps.total, total_sq=ps.total_sq)
+
+
 def make_bot_stats(players_alg: set) -> BotStats:
     def _bucket():
         return BucketStats(
@@ -34,6 +87,23 @@ def make_bot_stats(players_alg: set) -> BotStats:
     return BotStats(total=_bucket(), hard_wins=_bucket(), soft_wins=_bucket(), losses=_bucket())
 
 
+def merge_stats(into: dict[str, BotStats], other: dict[str, BotStats]) -> dict[str, BotStats]:
+    """Add the raw (not yet finalized) sums of `other` into `into`, in place."""
+    for bot, info in other.items():
+        if bot not in into:
+            into[bot] = make_bot_stats(set())
+        for bucket in ('total', 'hard_wins', 'soft_wins', 'losses'):
+            dst, src = getattr(into[bot], bucket), getattr(info, bucket)
+            for name, value in vars(src).items():
+                if isinstance(value, dict):
+                    counts = getattr(dst, name)
+                    for k, v in value.items():
+                        counts[k] = counts.get(k, 0) + v
+                else:
+                    setattr(dst, name, getattr(dst, name) + value)
+    return into
+
+
 def safe_div(num: float, den: float, fallback: float = 0.0) -> float:
     return num / den if den > 0 else fallback
 
@@ -50,3 +120,177 @@ def hard_win_rate(info: BotStats) -> float:
 
 def soft_win_rate(info: BotStats) -> float:
     return info.soft_wins.games / info.total.games if info.total.games > 0 else 0.0
+
+
+def wilson_interval(k: float, n: float, z: float = 1.96) -> tuple[float, float]:
+    """Wilson score interval of a proportion k/n; (0, 1) when n is 0."""
+    if n <= 0:
+        return 0.0, 1.0
+    p = k / n
+    den = 1 + z * z / n
+    centre = (p + z * z / (2 * n)) / den
+    half = z * (p * (1 - p) / n + z * z / (4 * n * n)) ** 0.5 / den
+    return max(0.0, centre - half), min(1.0, centre + half)
+
+
+def record_block(block_stats: dict[str, BotStats]) -> None:
+    """Add the block-level moments of one block's raw BotStats, in place. Games of a
+    block share their lineup, so block-based runs count blocks, not games, as the
+    independent units (see effective_games)."""
+    for info in block_stats.values():
+        t = info.total
+        score = info.hard_wins.games + 0.5 * info.soft_wins.games
+        t.blocks += 1
+        t.block_games_sq += t.games * t.games
+        t.block_score_sq += score * score
+        t.block_score_games += score * t.games
+
+
+def design_effect(info: BotStats) -> float:
+    """Variance of the mean Score with blocks as the units, over its value for
+    independent games; at least 1. 1 for runs that are not block-based."""
+    t = info.total
+    if t.blocks == 0 or t.games == 0:
+        return 1.0
+    if t.blocks < 2:
+        return max(t.games, 1.0)                 # one lineup: as good as one game
+    hwr, swr = hard_win_rate(info), soft_win_rate(info)
+    mean = hwr + 0.5 * swr
+    per_game = hwr + 0.25 * swr - mean * mean
+    between = (t.block_score_sq - 2 * mean * t.block_score_games + mean * mean * t.block_games_sq)
+    between *= t.blocks / (t.blocks - 1)
+    if per_game <= 0:
+        return 1.0
+    return max(between / (per_game * t.games), 1.0)
+
+
+def effective_games(info: BotStats) -> float:
+    """Kish effective sample size (Σw)² / Σw²: the games count for unweighted runs,
+    smaller when lineups were importance-weighted (see experiments/scheduler.py).
+    Block-based runs divide it by the design effect of their blocks."""
+    t = info.total
+    n = t.games * t.games / t.weight_sq if t.weight_sq > 0 else t.games
+    return n / design_effect(info)
+
+
+def hard_win_interval(info: BotStats, z: float = 1.96) -> tuple[float, float]:
+    """Wilson CI of the hard win rate."""
+    n = effective_games(info)
+    return wilson_interval(hard_win_rate(info) * n, n, z)
+
+
+def score_interval(info: BotStats, z: float = 1.96) -> tuple[float, float]:
+    """Normal-approximation CI of the mean per-game Score (1 hard, 0.5 soft, 0 loss)."""
+    n = effective_games(info)
+    if n < 2:
+        return 0.0, 1.0
+    hwr, swr = hard_win_rate(info), soft_win_rate(info)
+    mean = hwr + 0.5 * swr
+    var = (hwr + 0.25 * swr - mean * mean) * n / (n - 1)
+    half = z * (max(var, 0.0) / n) ** 0.5
+    return mean - half, mean + half
+
+
+# ── Standard errors and significance ─────────────────────────────────────────
+
+PROPORTIONS = {
+    # metric: (successes, trials) on BucketStats — per game for the rates, per turn for the rest
+    'win_rate':       (lambda t, i: i.hard_wins.games + i.soft_wins.games, lambda t, i: t.games),
+    'hard_win_rate':  (lambda t, i: i.hard_wins.games, lambda t, i: t.games),
+    'soft_win_rate':  (lambda t, i: i.soft_wins.games, lambda t, i: t.games),
+    'loss_rate':      (lambda t, i: i.losses.games, lambda t, i: t.games),
+    'bluff_rate':     (lambda t, i: t.bluffs, lambda t, i: t.play_turns),
+    'bluff_stealth':  (lambda t, i: t.bluffs - t.bluff_caught, lambda t, i: t.bluffs),
+    'doubt_rate':     (lambda t, i: t.doubts, lambda t, i: t.not_first_turns),
+    'doubt_accuracy': (lambda t, i: t.successful_doubts, lambda t, i: t.doubts),
+}
+
+
+def metric_errors(info: BotStats) -> dict[str, tuple[float, float]]:
+    """
+    (estimate, standard error) of every report metric, from a finalized BotStats.
+
+    Proportions use the binomial SE (trials scaled to the effective sample size);
+    Score and Avg Position the per-game variance; Cards/Turn, a ratio of per-game sums,
+    the delta method. Per-turn proportions treat turns as independent, which is
+    optimistic when a bot's turns within a game are correlated.
+    """
+    t = info.total
+    games = t.games
+    scale = safe_div(effective_games(info), games)
+    n = effective_games(info)
+    out = {}
+    for metric, (k_fn, n_fn) in PROPORTIONS.items():
+        trials = n_fn(t, info)
+        p = safe_div(k_fn(t, info), trials)
+        out[metric] = (p, math.sqrt(p * (1 - p) / (trials * scale)) if trials * scale > 0 else 0.0)
+
+    hwr, swr = out['hard_win_rate'][0], out['soft_win_rate'][0]
+    score = hwr + 0.5 * swr
+    out['score'] = (score, math.sqrt(max(hwr + 0.25 * swr - score * score, 0.0) / n) if n > 0 else 0.0)
+    pos = t.total_position
+    if games > 0 and t.position_sq == 0 and pos > 0:
+        out['avg_position'] = (pos, math.nan)
+    else:
+        out['avg_position'] = (pos, math.sqrt(max(t.position_sq - pos * pos, 0.0) / n) if n > 0 else 0.0)
+
+    ratio = safe_div(t.cards_played, t.play_turns)
+    if t.play_turns > 0 and t.play_turns_sq == 0:
+        out['cards_per_turn'] = (ratio, math.nan)
+    elif games > 0 and t.play_turns > 0:
+        mean_t = t.play_turns / games
+        var = (t.cards_played_sq - 2 * ratio * t.cards_turns + ratio * ratio * t.play_turns_sq) / games
+        out['cards_per_turn'] = (ratio, math.sqrt(max(var, 0.0) / n) / mean_t)
+    else:
+        out['cards_per_turn'] = (ratio, 0.0)
+    return out
+
+
+def metric_intervals(info: BotStats, z: float = 1.96) -> dict[str, tuple[float, float]]:
+    """CI of every report metric: Wilson for proportions, normal for the rest. Metrics
+    without a known error (see metric_errors) are left out."""
+    t = info.total
+    scale = safe_div(effective_games(info), t.games)
+    out = {}
+    for metric, (est, se) in metric_errors(info).items():
+        if metric in PROPORTIONS:
+            k_fn, n_fn = PROPORTIONS[metric]
+            trials = n_fn(t, info) * scale
+            out[metric] = wilson_interval(est * trials, trials, z)
+        elif not math.isnan(se):
+            out[metric] = (est - z * se, est + z * se)
+    return out
+
+
+_erfc = np.frompyfunc(math.erfc, 1, 1)
+
+
+def significance_matrix(estimates: np.ndarray, errors: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Pairwise z-tests between bots for one metric.
+
+    Args:
+        estimates, errors: (n_bots,) arrays of estimates and standard errors.
+
+    Returns:
+        (diff, p): (n_bots, n_bots) matrices of estimate[i] − estimate[j] and the two-sided
+        p-values, Holm-adjusted over the n(n−1)/2 pairs. The diagonal p is 1.
+    """
+    diff = estimates[:, None] - estimates[None, :]
+    se = np.sqrt(errors[:, None] ** 2 + errors[None, :] ** 2)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        z = np.where(se > 0, np.abs(diff) / se, np.where(diff != 0, np.inf, 0.0))
+    raw = _erfc(z / math.sqrt(2)).astype(float)
+
+    iu = np.triu_indices(len(estimates), k=1)
+    pairs = raw[iu]
+    order = np.argsort(pairs)
+    m = len(pairs)
+    adjusted = np.maximum.accumulate(pairs[order] * (m - np.arange(m)))
+    holm = np.empty(m)
+    holm[order] = np.minimum(adjusted, 1.0)
+
+    p = np.ones_like(raw)
+    p[iu] = holm
+    p.T[iu] = holm
+    return diff, p
@@ -0,0 +1,223 @@
+"""
+Sweep — tune a bot's class-level constants with successive halving.
+
+Bots expose their tunables as upper-case class attributes (ClaudeFableBot.REPLAY_BONUS,
+RiskAwareBot.BOARD_SCALE, ChatGPTBot.DOUBT_THRESHOLD, ...). A variant is a subclass that
+overrides some of them; variants stay out of BotBase.registry. Every variant plays the
+same seeded games, one seat against opponents drawn from a fixed pool, so configurations
+are compared on common random numbers.
+
+Successive halving spends the games where they matter:
+
+    rung 0   every configuration plays `min_games` games
+    rung k   the best 1/eta by the first objective play on, up to min_games · eta^k
+
+until at most `keep` remain. The survivors, which played the most games, are then
+compared on every objective, and their Pareto front is reported. A full grid at the
+survivors' precision would have cost (configurations × final games).
+
+    python -m experiments.sweep sweep.yaml
+
+    bot: ClaudeFableBot
+    params:
+      REPLAY_BONUS: [1.2, 1.9, 2.6]
+      REACH3_BONUS: [2.0, 2.8, 3.6]
+    opponents: [HonestBot, ChatGPTBot, RiskAwareBot]   # default: DEFAULT_BOTS
+    available_players: [3, 4, 5]
+    objectives: [score, hard_win_rate] # metric_errors keys, '-' prefix to minimize
+    min_games: 200
+    eta: 3
+    keep: 4
+    samples: 20                        # optional: random configurations instead of the full grid
+    workers: 4
+"""
+from __future__ import annotations
+import copy
+import itertools
+import math
+import random
+import sys
+import types
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+
+from dubito.core_game import dubito
+from dubito.handlers import StatsHandler
+from dubito.player import Player, PlayerPool
+from bots.base import BotBase
+from .runner import DEFAULT_BOTS, finalize_stats, load_config, record_game
+from .stats import BotStats, make_bot_stats, merge_stats, metric_errors
+
+
+def variant_name(bot: str, params: dict) -> str:
+    return f"{bot}[{','.join(f'{k}={v}' for k, v in params.items())}]"
+
+
+def make_variant(bot: str, params: dict) -> type:
+    """Unregistered subclass of registry bot `bot` with the given class attributes."""
+    base = BotBase.registry[bot]
+    for name in params:
+        if not name.isupper() or not hasattr(base, name):
+            raise ValueError(f'{bot} has no tunable {name!r}')
+    return types.new_class(variant_name(bot, params), (base,), {'register': False},
+                           lambda ns: ns.update(params))
+
+
+def grid(params: dict[str, list], samples: int | None = None, seed: int = 0) -> list[dict]:
+    """Every combination of the parameter values, or `samples` of them drawn at random."""
+    names = list(params)
+    combos = [dict(zip(names, values)) for values in itertools.product(*(params[n] for n in names))]
+    if samples is not None and samples < len(combos):
+        combos = random.Random(seed).sample(combos, samples)
+    return combos
+
+
+def evaluate(bot: str, params: dict, opponents: list[str], available_players: list,
+             seed: int, start: int, stop: int) -> BotStats:
+    """Raw BotStats of the variant over games [start, stop) of the seeded schedule. Game i
+    draws its size and opponents from `{seed}:{i}`, whatever the variant."""
+    variant = make_variant(bot, params)
+    pool = [BotBase.registry[name] for name in opponents]
+    final_infos: dict[str, BotStats] = {}
+    players = PlayerPool()
+    for i in range(start, stop):
+        rng = random.Random(f'{seed}:{i}')
+        n = rng.choice(available_players)
+        lineup = [variant] + [rng.choice(pool) for _ in range(n - 1)]
+        all_players: list[Player] = players.seat(lineup)
+        for alg in lineup:
+            if alg.__name__ not in final_infos:
+                final_infos[alg.__name__] = make_bot_stats({a.__name__ for a in [variant] + pool})
+        random.seed(f'{seed}:{i}:game')
+        results, game_infos = dubito(all_players, observers=[StatsHandler()])
+        record_game(final_infos, all_players, results, game_infos['stats'].data)
+    return final_infos[variant.__name__]
+
+
+def _objective(name: str) -> tuple[str, float]:
+    return (name[1:], -1.0) if name.startswith('-') else (name, 1.0)
+
+
+@dataclass
+class Trial:
+    params: dict
+    stats: BotStats = field(default_factory=lambda: make_bot_stats(set()))
+    rung: int = 0
+    pareto: bool = False
+
+    @property
+    def games(self) -> int:
+        return int(self.stats.total.games)
+
+    def metrics(self) -> dict[str, tuple[float, float]]:
+        """(estimate, standard error) of every metric (see stats.metric_errors)."""
+        return metric_errors(finalize_stats({'_': copy.deepcopy(self.stats)})['_'])
+
+    def value(self, objective: str) -> float:
+        name, sign = _objective(objective)
+        return sign * self.metrics()[name][0]
+
+
+def pareto_front(points: list[tuple[float, ...]]) -> list[int]:
+    """Indices of the points no other point dominates (every coordinate maximized)."""
+    return [
+        i for i, p in enumerate(points)
+        if not any(all(a >= b for a, b in zip(q, p)) and q != p for q in points)
+    ]
+
+
+def successive_halving(bot: str, configs: list[dict], opponents: list[str], available_players: list,
+                       objectives: list[str] = ('score',), min_games: int = 200, eta: int = 3,
+                       keep: int = 4, seed: int = 0, workers: int = 1) -> list[Trial]:
+    """
+    Args:
+        bot (str): Registry name of the bot to tune.
+        configs (list[dict]): Parameter overrides to try (see grid).
+        opponents (list[str]): Registry names of the fixed opponent pool.
+        available_players (list): Player counts to draw from.
+        objectives (list[str]): metric_errors keys, '-' prefix to minimize. The first one
+            ranks the configurations between rungs. Defaults to ('score',).
+        min_games (int): Games per configuration in rung 0. Defaults to 200.
+        eta (int): Keep the best 1/eta per rung, with eta times the games. Defaults to 3.
+        keep (int): Stop halving at this many configurations. Defaults to 4.
+        seed (int): Seed of the shared game schedule. Defaults to 0.
+        workers (int): Processes the configurations are spread across. Defaults to 1.
+
+    Returns:
+        Every Trial, the final rung's Pareto front flagged.
+    """
+    if eta < 2:
+        raise ValueError('eta must be at least 2')
+    trials = [Trial(params=dict(c)) for c in configs]
+    alive = list(trials)
+    if workers > 1:
+        for name in {bot, *opponents}:
+            BotBase.registry[name].preload()
+    pool = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+    try:
+        rung, done = 0, 0
+        while True:
+            target = min_games * eta ** rung
+            jobs = [(bot, t.params, list(opponents), list(available_players), seed, done, target) for t in alive]
+            if pool is not None:
+                results = list(pool.map(evaluate, *zip(*jobs)))
+            else:
+                results = [evaluate(*job) for job in jobs]
+            for trial, stats in zip(alive, results):
+                merge_stats({'_': trial.stats}, {'_': stats})
+                trial.rung = rung
+            if len(alive) <= keep:
+                break
+            alive.sort(key=lambda t: t.value(objectives[0]), reverse=True)
+            alive = alive[:max(keep, math.ceil(len(alive) / eta))]
+            rung, done = rung + 1, target
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
+    points = [tuple(t.value(o) for o in objectives) for t in alive]
+    for i in pareto_front(points):
+        alive[i].pareto = True
+    return trials
+
+
+def main(config_path: str) -> None:
+    import yaml
+    config = load_config(config_path)
+    bot = config['bot']
+    opponents = config.get('opponents') or [b for b in DEFAULT_BOTS if b != bot]
+    objectives = config.get('objectives', ['score'])
+    configs = grid(config['params'], config.get('samples'), config.get('seed', 0))
+    min_games, eta = config.get('min_games', 200), config.get('eta', 3)
+
+    print(f'Sweeping {len(configs)} configurations of {bot} against {len(opponents)} opponents.')
+    trials = successive_halving(
+        bot, configs, opponents, config['available_players'], objectives, min_games, eta,
+        config.get('keep', 4), config.get('seed', 0), config.get('workers', 1),
+    )
+
+    played = sum(t.games for t in trials)
+    final = max(t.games for t in trials)
+    print(f'\n{played:,} games played; a full grid at {final:,} games each would need {len(trials) * final:,}.')
+    survivors = sorted((t for t in trials if t.games == final), key=lambda t: t.value(objectives[0]), reverse=True)
+    names = [_objective(o)[0] for o in objectives]
+    print(f"\n{'':<3}" + ''.join(f'{n:>22}' for n in names) + '  params')
+    for trial in survivors:
+        metrics = trial.metrics()
+        cells = ''.join(f'{metrics[n][0]:>14.4f} ± {metrics[n][1]:<5.3f}' for n in names)
+        print(f"{'*' if trial.pareto else '':<3}{cells}  {trial.params}")
+    print('\n* Pareto front')
+
+    output_file = config.get('output_file', 'sweep_results.yaml')
+    rows = [
+        {'params': t.params, 'games': t.games, 'rung': t.rung, 'pareto': t.pareto,
+         'metrics': {n: list(t.metrics()[n]) for n in names}}
+        for t in sorted(trials, key=lambda t: (-t.games, -t.value(objectives[0])))
+    ]
+    with open(output_file, 'w') as f:
+        yaml.safe_dump({'bot': bot, 'objectives': list(objectives), 'trials': rows}, f, sort_keys=False)
+    print(f'Results saved to {output_file}')
+
+
+if __name__ == '__main__':
+    main(sys.argv[1] if len(sys.argv) > 1 else 'sweep.yaml')
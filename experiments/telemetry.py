@@ -0,0 +1,193 @@
+"""
+Telemetry — live snapshots of a long run, as a JSON file and an optional local page.
+
+With `telemetry: telemetry.json` in experiment.yaml, the random and adaptive modes
+rewrite that file every `telemetry_every` seconds with
+
+    games, elapsed, games_per_sec
+    turns           mean, max and a histogram of turns per game (bins of `bin_width`)
+    timeouts        games cut short by max_turns or the stall rule: rate, how many
+                    stalled, and per bot seated in them
+    bots            running Score per bot with its CI (stats.score_interval)
+
+`telemetry_port: 8765` also serves the snapshot at http://localhost:8765/telemetry.json
+and a page at http://localhost:8765/ that re-renders it every few seconds. The snapshot
+only covers the games of the current process; the final stats still come from
+all_games.yaml.
+"""
+from __future__ import annotations
+import json
+import os
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from .report._common import head
+from .stats import BotStats, hard_win_rate, soft_win_rate, score_interval
+
+
+class Telemetry:
+
+    def __init__(self, path: str | None = 'telemetry.json', every: float = 5.0, port: int | None = None,
+                 bin_width: int = 25, z: float = 1.96) -> None:
+        """
+        Args:
+            path (str | None): Snapshot file, rewritten atomically. None: HTTP only.
+            every (float): Seconds between two snapshots. Defaults to 5.
+            port (int | None): Serve the snapshot and a live page on localhost. Defaults to None.
+            bin_width (int): Width of the turns-per-game histogram bins. Defaults to 25.
+            z (float): CI quantile of the per-bot Score. Defaults to 1.96.
+        """
+        self.path = path
+        self.every = every
+        self.bin_width = bin_width
+        self.z = z
+        self.games = 0
+        self.turns = 0
+        self.max_turns = 0
+        self.bins: Counter = Counter()
+        self.timeouts = 0
+        self.stalled = 0
+        self.timeouts_by_bot: Counter = Counter()
+        self.snapshot: dict = {}
+        self._start = time.monotonic()
+        self._last = self._start
+        self._server = None
+        if port is not None:
+            self._server = ThreadingHTTPServer(('127.0.0.1', port), _handler(self))
+            threading.Thread(target=self._server.serve_forever, daemon=True).start()
+
+    @property
+    def url(self) -> str | None:
+        if self._server is None:
+            return None
+        return f'http://localhost:{self._server.server_address[1]}/'
+
+    def record(self, results: dict, lineup: list[str]) -> None:
+        """Count one finished game (a dubito() game_result and its bot names)."""
+        self.games += 1
+        self.turns += results['turns']
+        self.max_turns = max(self.max_turns, results['turns'])
+        self.bins[results['turns'] // self.bin_width] += 1
+        if results['timeout']:
+            self.timeouts += 1
+            self.stalled += results['stalled']
+            self.timeouts_by_bot.update(set(lineup))
+
+    def tick(self, final_infos: dict[str, BotStats]) -> None:
+        """Publish a snapshot if `every` seconds have passed since the last one."""
+        if time.monotonic() - self._last >= self.every:
+            self.publish(final_infos)
+
+    def publish(self, final_infos: dict[str, BotStats], done: bool = False) -> dict:
+        """Build a snapshot from the running (un-normalized) stats and write it out."""
+        now = time.monotonic()
+        self._last = now
+        elapsed = now - self._start
+        bots = {}
+        for bot, info in sorted(final_infos.items()):
+            lo, hi = score_interval(info, self.z)
+            bots[bot] = {
+                'games': info.total.games,
+                'score': hard_win_rate(info) + 0.5 * soft_win_rate(info),
+                'ci': [lo, hi],
+                'timeouts': self.timeouts_by_bot.get(bot, 0),
+            }
+        self.snapshot = {
+            'done': done,
+            'games': self.games,
+            'elapsed': round(elapsed, 2),
+            'games_per_sec': self.games / elapsed if elapsed > 0 else 0.0,
+            'turns': {
+                'mean': self.turns / self.games if self.games else 0.0,
+                'max': self.max_turns,
+                'bin_width': self.bin_width,
+                'histogram': {str(b * self.bin_width): n for b, n in sorted(self.bins.items())},
+            },
+            'timeouts': {'games': self.timeouts, 'stalled': self.stalled,
+                         'rate': self.timeouts / self.games if self.games else 0.0},
+            'bots': bots,
+        }
+        if self.path is not None:
+            tmp = f'{self.path}.tmp'
+            with open(tmp, 'w') as f:
+                json.dump(self.snapshot, f)
+            os.replace(tmp, self.path)
+        return self.snapshot
+
+    def close(self, final_infos: dict[str, BotStats] | None = None) -> None:
+        """Publish the final snapshot (when given the stats) and stop the server."""
+        if final_infos is not None:
+            self.publish(final_infos, done=True)
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+
+def _handler(telemetry: Telemetry) -> type:
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.startswith('/telemetry.json'):
+                body, kind = json.dumps(telemetry.snapshot).encode(), 'application/json'
+            elif self.path in ('/', '/index.html'):
+                body, kind = PAGE.encode(), 'text/html; charset=utf-8'
+            else:
+                self.send_error(404)
+                return
+            self.send_response(200)
+            self.send_header('Content-Type', kind)
+            self.send_header('Cache-Control', 'no-store')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):      # keep the tqdm bar clean
+            pass
+    return Handler
+
+
+PAGE = head('Live run') + '''
+<div class="container py-4">
+  <div class="section-title">Live run <span id="status" class="badge bg-success ms-2">running</span></div>
+  <div class="row g-3 my-2" id="cards"></div>
+  <div class="row g-3">
+    <div class="col-lg-7"><div class="chart-card">
+      <table class="table table-sm mb-0"><thead><tr>
+        <th>Bot</th><th class="text-end">Games</th><th class="text-end">Score</th><th>95% CI</th><th class="text-end">Timeouts</th>
+      </tr></thead><tbody id="bots"></tbody></table>
+    </div></div>
+    <div class="col-lg-5"><div class="chart-card"><div id="turns" style="height:360px"></div></div></div>
+  </div>
+</div>
+<script>
+function card(label, value) {
+  return `<div class="col-6 col-md-3"><div class="stat-card"><div class="stat-value">${value}</div>` +
+         `<div class="stat-label">${label}</div></div></div>`;
+}
+async function refresh() {
+  let s;
+  try { s = await (await fetch('telemetry.json', {cache: 'no-store'})).json(); } catch (e) { return; }
+  if (!s.games) return;
+  document.getElementById('status').textContent = s.done ? 'finished' : 'running';
+  document.getElementById('status').className = 'badge ms-2 ' + (s.done ? 'bg-secondary' : 'bg-success');
+  document.getElementById('cards').innerHTML =
+    card('Games', s.games.toLocaleString()) + card('Games / sec', s.games_per_sec.toFixed(1)) +
+    card('Turns / game', s.turns.mean.toFixed(1)) + card('Timeout rate', (100 * s.timeouts.rate).toFixed(2) + '%');
+  const rows = Object.entries(s.bots).sort((a, b) => b[1].score - a[1].score);
+  document.getElementById('bots').innerHTML = rows.map(([bot, b]) =>
+    `<tr><td>${bot}</td><td class="text-end">${Math.round(b.games).toLocaleString()}</td>` +
+    `<td class="text-end">${b.score.toFixed(3)}</td><td>${b.ci[0].toFixed(3)} – ${b.ci[1].toFixed(3)}</td>` +
+    `<td class="text-end">${b.timeouts}</td></tr>`).join('');
+  const h = s.turns.histogram;
+  Plotly.react('turns', [{type: 'bar', x: Object.keys(h).map(Number), y: Object.values(h), marker: {color: '#4C78A8'}}],
+    {title: 'Turns per game', bargap: 0.05, margin: {t: 40, r: 10, b: 40, l: 50},
+     xaxis: {title: 'turns'}, yaxis: {title: 'games'}}, {responsive: true});
+  if (s.done) clearInterval(timer);
+}
+const timer = setInterval(refresh, 2000);
+refresh();
+</script>
+</body>
+</html>'''
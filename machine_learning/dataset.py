@@ -1,7 +1,12 @@
 from dubito.game_data import honest_times, dishonest_times, doubts_count, turns_count
+from dubito.observers import GameObserver
 
 
-class DubitoDataset:
+class DubitoDataset(GameObserver):
+    """dubito() observer recording one row per decision (game_infos['decisions'])."""
+
+    key = 'decisions'
+
     def __init__(self) -> None:
         self.who = []
         self.data = []
@@ -47,3 +52,14 @@ class DubitoDataset:
 
     def get_dataset(self) -> list:
         return self.data
+
+    # ── GameObserver hooks ────────────────────────────────────────────────────
+
+    def on_turn(self, game_handler, player, turn_data, output) -> None:
+        self.add_data(turn_data.my_cards, player.id, turn_data, output)
+
+    def on_game_end(self, game_handler) -> None:
+        self.add_result(game_handler.get_winners(), game_handler.playing_players())
+
+    def result(self) -> list:
+        return self.get_dataset()
@@ -1,12 +1,13 @@
 from dubito.core_game import dubito
+from machine_learning.dataset import DubitoDataset
 from tqdm import tqdm
 import random
-import bots  # noqa: F401 — populates BotBase.registry
 from bots.base import BotBase
+from bots.search import SEARCH_BOTS
 import csv
 
 _LLM_BOTS = {'ClaudeBot', 'ChatGPTBot', 'ChatGPTThinkingBot', 'GeminiBot'}
-ALGORITHMS = [cls for name, cls in BotBase.registry.items() if name not in _LLM_BOTS]
+ALGORITHMS = [cls for name, cls in BotBase.registry.items() if name not in _LLM_BOTS | SEARCH_BOTS]
 PLAYERS_NUMBER = 6
 N_EXPERIMENTS = 10_000
 
@@ -30,7 +31,7 @@ with open(csv_path, 'w', newline='') as csvfile:
             random_algorithm = random.choice(ALGORITHMS)
             all_players.append(random_algorithm(i))
         
-        _, info = dubito(all_players)
+        _, info = dubito(all_players, observers=[DubitoDataset()])
         for move in info['decisions']:
             writer.writerow(move)
 
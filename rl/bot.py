@@ -5,40 +5,68 @@ Usage:
     from rl.bot import RLBot
     bot = RLBot.load("rl/models/ppo_dubito.zip")
     # add to experiments.py ALL_BOTS dict like any other bot
+
+A model is loaded once per process and shared by every RLBot seated with it. Multi-process
+runs call BotBase.preload on their bots before starting workers: the parent then loads the
+model once, with its weights in shared memory, and forked workers use those pages read-only
+instead of each deserialising a copy.
 """
 
+from __future__ import annotations
 import os
-import numpy as np
-from stable_baselines3 import PPO
-from stable_baselines3.common.vec_env import VecNormalize, DummyVecEnv
+from typing import TYPE_CHECKING
 
 from bots.base import BotBase
 from dubito.game_data import TurnData
-from rl.env import build_obs, action_to_output, DubitoEnv
+from rl.features import build_obs, action_to_output
+
+if TYPE_CHECKING:
+    from stable_baselines3 import PPO
+    from stable_baselines3.common.vec_env import VecNormalize
 
 _DEFAULT_MODEL = "rl/models/ppo_dubito.zip"
 _DEFAULT_STATS = "rl/models/vecnormalize.pkl"
 
+_MODELS: dict[tuple[str, str], tuple[PPO, VecNormalize | None]] = {}
+
+
+def _load(model_path: str, stats_path: str) -> tuple[PPO, VecNormalize | None]:
+    """The (model, normaliser) pair for these files, loaded on first use in this process."""
+    key = (os.path.abspath(model_path), os.path.abspath(stats_path))
+    if key not in _MODELS:
+        # stable-baselines3 (torch) and gymnasium load with the first model, not on import
+        from stable_baselines3 import PPO
+        model = PPO.load(model_path, device="cpu")
+        model.policy.share_memory()     # forked workers map these tensors instead of copying them
+        vec_norm = None
+        if os.path.exists(stats_path):
+            from stable_baselines3.common.vec_env import VecNormalize, DummyVecEnv
+            from rl.env import DubitoEnv
+            dummy = DummyVecEnv([lambda: DubitoEnv()])
+            vec_norm = VecNormalize.load(stats_path, dummy)
+            vec_norm.training = False   # freeze stats at inference time
+        _MODELS[key] = (model, vec_norm)
+    return _MODELS[key]
+
 
 class RLBot(BotBase):
     """BotBase subclass that delegates all decisions to a trained PPO model."""
 
-    _model:    PPO         | None = None
-    _vec_norm: VecNormalize | None = None
+    model_path: str = _DEFAULT_MODEL
+    stats_path: str = _DEFAULT_STATS
 
     def __init__(
         self,
         player_id: int,
-        model_path: str = _DEFAULT_MODEL,
-        stats_path: str = _DEFAULT_STATS,
+        model_path: str | None = None,
+        stats_path: str | None = None,
     ):
         super().__init__(player_id)
-        if RLBot._model is None:
-            RLBot._model = PPO.load(model_path)
-            if os.path.exists(stats_path):
-                dummy = DummyVecEnv([lambda: DubitoEnv()])
-                RLBot._vec_norm = VecNormalize.load(stats_path, dummy)
-                RLBot._vec_norm.training = False   # freeze stats at inference time
+        self._model, self._vec_norm = _load(model_path or self.model_path, stats_path or self.stats_path)
+
+    @classmethod
+    def preload(cls) -> None:
+        _load(cls.model_path, cls.stats_path)
 
     @classmethod
     def load(cls, model_path: str, stats_path: str | None = None) -> type:
@@ -46,9 +74,10 @@ class RLBot(BotBase):
         sp = stats_path or model_path.replace(".zip", "_vecnormalize.pkl").replace(
             "ppo_dubito", "vecnormalize"
         )
-        class _Loaded(cls):
-            def __init__(self, pid):
-                super().__init__(pid, model_path=model_path, stats_path=sp)
+        class _Loaded(cls, register=False):
+            pass
+        _Loaded.model_path   = model_path
+        _Loaded.stats_path   = sp
         _Loaded.__name__     = "RLBot"
         _Loaded.__qualname__ = "RLBot"
         return _Loaded
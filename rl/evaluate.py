@@ -16,20 +16,20 @@ from tqdm import tqdm
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from stable_baselines3 import PPO
 from rl.bot import RLBot
-import bots  # noqa: F401 — populates BotBase.registry
 from bots.base import BotBase
+from bots.search import SEARCH_BOTS
 from dubito.core_game import dubito
 
 # LLM bots are excluded: they require API access and are too slow for evaluation.
+# Search bots are excluded: they run their own rollouts on every decision.
 _LLM_BOTS = {'ClaudeBot', 'ChatGPTBot', 'ChatGPTThinkingBot', 'GeminiBot'}
-ALL_OPPONENTS = {name: cls for name, cls in BotBase.registry.items() if name not in _LLM_BOTS}
+ALL_OPPONENTS = {name: cls for name, cls in BotBase.registry.items() if name not in _LLM_BOTS | SEARCH_BOTS}
 
 
 def evaluate(model_path: str, n_games: int) -> None:
-    # pre-load the model into RLBot class cache
-    RLBot._model = PPO.load(model_path)
+    agent = RLBot.load(model_path)
+    agent.preload()
 
     results: dict[str, dict] = {}   # opponent → {wins, games}
 
@@ -41,14 +41,14 @@ def evaluate(model_path: str, n_games: int) -> None:
 
     for _ in tqdm(range(n_games), desc="Evaluating", unit="game"):
         n_players = random.choice(available_players)
-        rl_agent  = RLBot(1)
+        rl_agent  = agent(1)
         opponents = [random.choice(opponent_list)(i + 2) for i in range(n_players - 1)]
         all_players = [rl_agent] + opponents
         random.shuffle(all_players)
         for i, p in enumerate(all_players, 1):
             p.id = i
 
-        results_game, _ = dubito(all_players)
+        results_game, _ = dubito(all_players, observers=())
         rl_won = rl_agent in results_game["winners"]
         wins  += int(rl_won)
         total += 1
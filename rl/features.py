@@ -0,0 +1,171 @@
+"""
+Observation and action encoding shared by DubitoEnv (rl/env.py) and RLBot (rl/bot.py).
+
+Only numpy is needed here, so a tournament that seats an RLBot never imports gymnasium.
+The layout of both spaces is documented in rl/env.py.
+"""
+
+import random
+import numpy as np
+from collections import Counter
+
+from dubito.player import PlayerAI
+from dubito.game_data import (
+    TurnOutput, TurnData,
+    honest_times, dishonest_times, doubts_count, turns_count,
+)
+
+N_ACTIONS = 7
+OBS_DIM   = 60
+
+_PLAYER_STATS_HIGH = [30.0, 200.0, 1.0, 1.0, 1.0]  # n_cards, turns, doubt_r, honest_r, caught_r
+
+_OBS_HIGH = np.array(
+    [4.0] * 14 +
+    [3.0, 2.0,
+     1.0,
+     30.0, 30.0, 3.0,
+     1.0, 30.0, 8.0] +
+    [1.0] * 14 +
+    [1.0] * 13 +
+    _PLAYER_STATS_HIGH * 2,
+    dtype=np.float32,
+)
+
+
+# ── observation helpers ───────────────────────────────────────────────────────
+
+def _player_stats_vec(player_id: int, n_cards: int, history: list) -> np.ndarray:
+    """5-dim stats for a neighbouring player, derived from event history."""
+    t = turns_count(player_id, history)
+    d = doubts_count(player_id, history)
+    h = honest_times(player_id, history)
+    c = dishonest_times(player_id, history)
+    t_safe = max(t, 1)
+    plays_safe = max(t - d, 1)
+    return np.array([
+        float(n_cards),
+        float(t),
+        d / t_safe,     # doubt rate       ∈ [0, 1]
+        h / t_safe,     # honesty rate     ∈ [0, 1]
+        c / plays_safe, # caught-bluff rate ∈ [0, 1]
+    ], dtype=np.float32)
+
+
+def build_obs(
+    turn_data: TurnData,
+    hand: list[int],
+    jokers_in_last_play: bool = False,
+) -> np.ndarray:
+    obs = np.zeros(OBS_DIM, dtype=np.float32)
+
+    current_num = int(turn_data.current_number)
+
+    for card in hand:
+        if 0 <= card <= 13:
+            obs[card] += 1.0
+
+    n_jokers   = sum(1 for c in hand if c == 0)
+    n_matching = sum(1 for c in hand if c == current_num) if current_num > 0 else 0
+
+    obs[14] = float(n_matching)
+    obs[15] = float(n_jokers)
+    obs[16] = float(turn_data.board_cards == 0)
+    obs[17] = float(len(turn_data.my_cards))
+    obs[18] = float(turn_data.board_cards)
+    obs[19] = float(turn_data.n_cards_played)
+    obs[20] = float(jokers_in_last_play)
+    obs[21] = float(turn_data.streak)
+    obs[22] = float(turn_data.n_players)
+
+    if 0 <= current_num <= 13:
+        obs[23 + current_num] = 1.0
+
+    for n in turn_data.playing_cards:
+        if 1 <= n <= 13:
+            obs[36 + n] = 1.0
+
+    obs[50:55] = _player_stats_vec(
+        turn_data.prev_player_id,
+        turn_data.player_card_counts.get(turn_data.prev_player_id, 0),
+        turn_data.history,
+    )
+    obs[55:60] = _player_stats_vec(
+        turn_data.next_player_id,
+        turn_data.player_card_counts.get(turn_data.next_player_id, 0),
+        turn_data.history,
+    )
+
+    return obs
+
+
+# ── action → TurnOutput ───────────────────────────────────────────────────────
+
+def action_to_output(action: int, player: PlayerAI, turn_data: TurnData, is_first: bool) -> TurnOutput:
+    """
+    Map a discrete action (0-6) to a TurnOutput.
+    Handles jokers, forced bluffs, and first-hand specifics.
+    """
+    hand        = list(player.cards.hand)
+    current_num = int(turn_data.current_number)
+    jokers      = [c for c in hand if c == 0]
+    non_jokers  = [c for c in hand if c != 0]
+
+    if action == 0 and is_first:
+        action = 1
+
+    if action == 0:
+        return TurnOutput(doubt=True, number=None, cards=None)
+
+    is_bluff = action >= 4
+    qty      = action if not is_bluff else action - 3
+
+    if is_first:
+        if not is_bluff:
+            counts = Counter(non_jokers)
+            if counts:
+                best_val, best_cnt = counts.most_common(1)[0]
+                n_face = min(qty, 3, best_cnt)
+                cards  = player.cards.pick(best_val, n_face)
+                n_need = min(qty, 3) - len(cards)
+                if n_need > 0 and jokers:
+                    cards += player.cards.pick(0, min(n_need, len(jokers)))
+                return TurnOutput(doubt=False, number=best_val, cards=cards)
+            else:
+                cards  = player.cards.pick(0, min(qty, len(jokers)))
+                pool   = turn_data.playing_cards or list(range(1, 14))
+                number = random.choice(pool)
+                return TurnOutput(doubt=False, number=number, cards=cards)
+        else:
+            n     = min(qty, len(hand))
+            cards = player.cards.pick_random(n)
+            pool  = turn_data.playing_cards or list(range(1, 14))
+            played_vals  = set(cards)
+            mismatches   = [v for v in pool if v not in played_vals]
+            number       = random.choice(mismatches) if mismatches else random.choice(pool)
+            return TurnOutput(doubt=False, number=number, cards=cards)
+
+    matching = [c for c in hand if c == current_num]
+
+    if not is_bluff:
+        if not matching and not jokers:
+            n     = min(qty, 3, len(hand))
+            cards = player.cards.pick_random(n)
+        else:
+            n_face = min(qty, 3, len(matching))
+            cards  = player.cards.pick(current_num, n_face)
+            n_need = min(qty, 3) - len(cards)
+            if n_need > 0 and jokers:
+                cards += player.cards.pick(0, min(n_need, len(jokers)))
+        return TurnOutput(doubt=False, number=None, cards=cards)
+    else:
+        bluff_pool = [c for c in hand if c != current_num and c != 0]
+        if bluff_pool:
+            n     = min(qty, len(bluff_pool))
+            cards = random.sample(bluff_pool, n)
+            for c in cards:
+                player.cards.pick(c, 1)
+        else:
+            n     = min(qty, len(hand))
+            cards = player.cards.pick_random(n)
+        return TurnOutput(doubt=False, number=None, cards=cards)
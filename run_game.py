@@ -10,7 +10,7 @@ Usage:
 
 import argparse
 from dubito.core_game import dubito
-import bots  # noqa: F401 — side-effect import: registers all subclasses in BotBase.registry
+from dubito.observers import GameLogger
 from bots.base import BotBase
 
 BOTS = BotBase.registry
@@ -46,6 +46,7 @@ def main():
         all_players=players,
         shuffle_players=not args.no_shuffle,
         n_jollies=args.jollies,
+        observers=[GameLogger()] if args.logs else (),
     )
 
     if args.logs:
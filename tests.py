@@ -1,17 +1,70 @@
+import copy
+import json
+import math
+import multiprocessing
+import os
+import pickle
+import random
+import subprocess
+import sys
+import tempfile
+import time
 import unittest
+from unittest import mock
+from urllib.request import urlopen
+from concurrent.futures import ProcessPoolExecutor
 from collections import Counter
+import numpy as np
 from dubito.hand import Hand
 from dubito.handlers import GameHandler, StatsHandler, generate_player_data
 from dubito.core_game import (
-    create_deck, assign_cards, initialize, dubito,
+    create_deck, assign_cards, initialize, dubito, DubitoGame,
     has_n_equal_elements,
     _resolve_doubt, _handle_play, _process_end_of_turn,
 )
+from dubito.state import GameState
+from dubito.game_data import TurnData, TurnOutput
 from dubito.game_data import DoubtResolvedEvent, CardsPlayedEvent, DiscardEvent, PlayerWonEvent
+from dubito.game_data import honest_times, dishonest_times, doubts_count, turns_count
+from dubito.observers import GameObserver, GameLogger
 from bots.manual.honest_bot import HonestBot
 from bots.manual.trusting_bot import TrustingBot
 from bots.manual.always_doubt_bot import AlwaysDoubtBot
 from bots.manual.random_bot import RandomBot
+from bots.manual.suspicion_bot import SuspicionBot
+from bots.search.monte_carlo import MonteCarloBot
+from bots.search.determinize import CardTracker
+from bots.search.endgame import EndgameSolver, canonical
+from bots.search.rollout import rollout, heuristic_policy
+from bots.search.opening_book import OpeningBook, features, openers, realize
+from bots.search.build_opening_book import simulate_openers
+from experiments.runner import (
+    play_games, play_duplicate, play_adaptive, play_cached, play_lockstep, unresolved_bots, save_stats, check_config,
+    record_game, record_lockstep,
+)
+from experiments.cache import ResultCache, bot_hash
+from experiments.farm import create_job, play_farm, run_worker
+from experiments.telemetry import Telemetry
+from dubito.sandbox import Sandbox, is_legal
+from experiments.archive import ArchiveRecorder, ArchiveReader, ArchiveWriter
+from dubito.packing import PackedHistory, pack_game, unpack_game, KIND, FLAG, PLAY
+from experiments.query import aggregate, group_sums
+from experiments.counterfactual import decisions, restore, fork
+from rl import bot as rl_bot
+from bots import MANIFEST
+from bots.base import BotBase
+from bots.search import SEARCH_BOTS
+from dubito.player import PlayerPool
+from dubito.lockstep import simulate
+from bots.manual.vectorized import rules_for
+from experiments.sweep import make_variant, grid, pareto_front, successive_halving
+from experiments.scheduler import LineupScheduler
+from experiments.ratings import Ratings, finishing_order, rate_newcomer
+from experiments.stats import (
+    PairedStats, paired_diff, make_bot_stats, wilson_interval, score_interval, effective_games,
+    metric_errors, metric_intervals, significance_matrix, record_block, design_effect, merge_stats,
+)
+from experiments.report.__main__ import load_stats, load_run
 
 
 # ---------------------------------------------------------------------------
@@ -252,7 +305,15 @@ class TestFullGame(unittest.TestCase):
         result, infos = dubito(all_players=list(players), max_turns=1)
         total = len(result['winners']) + len(result['losers'])
         self.assertEqual(total, len(players))
-        self.assertIn('Turn limit', infos['logs'])
+        self.assertIn('Turn limit (1) reached', infos['logs'])
+
+    def test_stalled_game_logs_the_stall_rule(self):
+        players = [HonestBot(1), TrustingBot(2), AlwaysDoubtBot(3), RandomBot(4)]
+        random.seed(0)
+        result, infos = dubito(all_players=list(players), stall_turns=2)
+        self.assertTrue(result['stalled'])
+        self.assertIn('no progress in 2 turns', infos['logs'])
+        self.assertNotIn('Turn limit', infos['logs'])
 
     def test_player_sizes_vary(self):
         for n in range(3, 8):
@@ -770,7 +831,7 @@ class TestResolveDoubt(unittest.TestCase):
         gh, stats, players = _setup_game_for_doubt([5, 5])
         doubter, bluffer = players[1], players[0]
         cards_before = len(doubter.cards)
-        replay, log = _resolve_doubt(gh, doubter, bluffer, stats)
+        replay = _resolve_doubt(gh, doubter, bluffer, [stats])
         self.assertFalse(replay)
         self.assertEqual(len(doubter.cards), cards_before + 2)
         self.assertEqual(gh.get_board(), [])
@@ -779,7 +840,7 @@ class TestResolveDoubt(unittest.TestCase):
         gh, stats, players = _setup_game_for_doubt([5, 3])
         doubter, bluffer = players[1], players[0]
         cards_before = len(bluffer.cards)
-        replay, log = _resolve_doubt(gh, doubter, bluffer, stats)
+        replay = _resolve_doubt(gh, doubter, bluffer, [stats])
         self.assertTrue(replay)
         self.assertEqual(len(bluffer.cards), cards_before + 2)
         self.assertEqual(gh.get_board(), [])
@@ -787,36 +848,37 @@ class TestResolveDoubt(unittest.TestCase):
     def test_joker_honest_discards_joker_doubter_gets_rest(self):
         gh, stats, players = _setup_game_for_doubt([0, 5])
         doubter, bluffer = players[1], players[0]
+        logger = GameLogger()
         cards_before = len(doubter.cards)
-        replay, log = _resolve_doubt(gh, doubter, bluffer, stats)
+        replay = _resolve_doubt(gh, doubter, bluffer, [stats, logger])
         self.assertFalse(replay)
         self.assertEqual(len(doubter.cards), cards_before + 1)  # joker discarded, gets 1 card
-        self.assertIn('Joker revealed', log)
+        self.assertIn('Joker revealed', logger.result())
 
     def test_board_reset_after_doubt(self):
         gh, stats, players = _setup_game_for_doubt([5, 5])
-        _resolve_doubt(gh, players[1], players[0], stats)
+        _resolve_doubt(gh, players[1], players[0], [stats])
         self.assertEqual(gh.get_board(), [])
         self.assertEqual(gh.get_current_number(), 0)
 
     def test_doubt_event_appended(self):
         gh, stats, players = _setup_game_for_doubt([5, 3])
-        _resolve_doubt(gh, players[1], players[0], stats)
+        _resolve_doubt(gh, players[1], players[0], [stats])
         self.assertTrue(any(isinstance(e, DoubtResolvedEvent) for e in gh.history))
 
     def test_stats_doubts_incremented(self):
         gh, stats, players = _setup_game_for_doubt([5, 5])
-        _resolve_doubt(gh, players[1], players[0], stats)
+        _resolve_doubt(gh, players[1], players[0], [stats])
         self.assertEqual(stats.data[players[1].id]['doubts'], 1)
 
     def test_stats_honesty_incremented_on_honest_play(self):
         gh, stats, players = _setup_game_for_doubt([5, 5])
-        _resolve_doubt(gh, players[1], players[0], stats)
+        _resolve_doubt(gh, players[1], players[0], [stats])
         self.assertEqual(stats.data[players[0].id]['honest_times'], 1)
 
     def test_stats_dishonesty_and_successful_doubt_incremented(self):
         gh, stats, players = _setup_game_for_doubt([5, 3])
-        _resolve_doubt(gh, players[1], players[0], stats)
+        _resolve_doubt(gh, players[1], players[0], [stats])
         self.assertEqual(stats.data[players[0].id]['dishonest_times'], 1)
         self.assertEqual(stats.data[players[1].id]['successful_doubts'], 1)
 
@@ -840,7 +902,7 @@ class TestHandlePlay(unittest.TestCase):
         from dubito.game_data import TurnOutput
         gh, stats, players = _setup_game_for_play()
         output = TurnOutput(doubt=False, number=7, cards=[7])
-        _handle_play(gh, players[1], output, stats)
+        _handle_play(gh, players[1], output, [stats])
         self.assertEqual(gh.get_current_number(), 7)
 
     def test_cards_placed_on_board(self):
@@ -849,7 +911,7 @@ class TestHandlePlay(unittest.TestCase):
         gh.set_current_number(3)
         gh.set_board_cards([3])  # simulate non-first-hand
         output = TurnOutput(doubt=False, number=None, cards=[3, 3])
-        _handle_play(gh, players[1], output, stats)
+        _handle_play(gh, players[1], output, [stats])
         self.assertIn(3, gh.get_board())
         self.assertEqual(gh.n_cards_board(), 3)
 
@@ -857,14 +919,14 @@ class TestHandlePlay(unittest.TestCase):
         from dubito.game_data import TurnOutput
         gh, stats, players = _setup_game_for_play()
         output = TurnOutput(doubt=False, number=5, cards=[5])
-        _handle_play(gh, players[1], output, stats)
+        _handle_play(gh, players[1], output, [stats])
         self.assertTrue(any(isinstance(e, CardsPlayedEvent) for e in gh.history))
 
     def test_stats_cards_played_tracked(self):
         from dubito.game_data import TurnOutput
         gh, stats, players = _setup_game_for_play()
         output = TurnOutput(doubt=False, number=5, cards=[5, 5])
-        _handle_play(gh, players[1], output, stats)
+        _handle_play(gh, players[1], output, [stats])
         self.assertEqual(stats.data[players[1].id]['total_cards_played'], 2)
         self.assertEqual(stats.data[players[1].id]['play_turns'], 1)
 
@@ -874,7 +936,7 @@ class TestHandlePlay(unittest.TestCase):
         gh.set_current_number(5)
         gh.set_board_cards([5])  # move past first hand
         output = TurnOutput(doubt=False, number=None, cards=[3])  # 3 ≠ 5 → bluff
-        _handle_play(gh, players[1], output, stats)
+        _handle_play(gh, players[1], output, [stats])
         self.assertEqual(stats.data[players[1].id]['bluffs'], 1)
 
 
@@ -890,7 +952,7 @@ class TestProcessEndOfTurn(unittest.TestCase):
         gh.next_turn()
         gh.players.this = players[1]
         # give player[0] no cards (hand is already empty from GameHandler init)
-        log = _process_end_of_turn(gh)
+        _process_end_of_turn(gh)
         # players[0] starts with empty hand so they should be detected as winners
         self.assertIn(players[0], gh.get_winners())
 
@@ -930,7 +992,7 @@ class TestProcessEndOfTurn(unittest.TestCase):
         players[2].add_cards([3, 4])
 
         # Wrong doubt: the doubter picks up the whole pile, completing four 7s and four 9s.
-        _resolve_doubt(gh, doubter, players[0], stats)
+        _resolve_doubt(gh, doubter, players[0], [stats])
         self.assertEqual(doubter.cards.hand, [5, 5, 7, 7, 7, 7, 9, 9, 9, 9])
 
         _process_end_of_turn(gh)
@@ -944,5 +1006,1260 @@ class TestProcessEndOfTurn(unittest.TestCase):
         self.assertNotIn(9, gh.board.availables)
 
 
+# ---------------------------------------------------------------------------
+# Observers
+# ---------------------------------------------------------------------------
+
+class _HookCounter(GameObserver):
+    key = 'hooks'
+
+    def __init__(self):
+        self.calls = Counter()
+
+    def on_game_start(self, gh):                    self.calls['start'] += 1
+    def on_turn(self, gh, player, turn_data, out):  self.calls['turn'] += 1
+    def on_play(self, gh, player, event):           self.calls['play'] += 1
+    def on_doubt(self, gh, doubter, target, event): self.calls['doubt'] += 1
+    def on_discard(self, gh, player, event):        self.calls['discard'] += 1
+    def on_win(self, gh, player, event):            self.calls['win'] += 1
+    def on_game_end(self, gh):                      self.calls['end'] += 1
+
+    def result(self):
+        return self.calls
+
+
+class TestObservers(unittest.TestCase):
+
+    def test_default_observers_publish_stats_and_logs(self):
+        _, infos = dubito(all_players=[HonestBot(1), TrustingBot(2), RandomBot(3)])
+        self.assertIsInstance(infos['stats'], StatsHandler)
+        self.assertIn('Game Start!', infos['logs'])
+        self.assertNotIn('decisions', infos)
+
+    def test_no_observers_returns_empty_infos(self):
+        result, infos = dubito(all_players=[HonestBot(1), TrustingBot(2), RandomBot(3)], observers=())
+        self.assertEqual(infos, {})
+        self.assertEqual(len(result['losers']), 2)
+
+    def test_hooks_match_event_history(self):
+        counter = _HookCounter()
+        players = [AlwaysDoubtBot(1), RandomBot(2), HonestBot(3), RandomBot(4)]
+        _, infos = dubito(all_players=players, observers=[counter])
+        calls = infos['hooks']
+        self.assertEqual(calls['start'], 1)
+        self.assertEqual(calls['end'], 1)
+        self.assertEqual(calls['turn'], calls['play'] + calls['doubt'])
+        self.assertEqual(calls['win'], 2)
+
+    def test_custom_collector_sees_every_event(self):
+        class Collector(GameObserver):
+            key = 'events'
+            def __init__(self):
+                self.kinds = []
+            def on_doubt(self, gh, doubter, target, event):
+                self.kinds.append(type(event))
+            def on_discard(self, gh, player, event):
+                self.kinds.append(type(event))
+            def result(self):
+                return self.kinds
+
+        for _ in range(20):
+            _, infos = dubito(
+                all_players=[AlwaysDoubtBot(1), RandomBot(2), AlwaysDoubtBot(3), RandomBot(4)],
+                observers=[Collector()],
+            )
+            self.assertTrue(all(k in (DoubtResolvedEvent, DiscardEvent) for k in infos['events']))
+
+    def test_dataset_observer_records_every_turn(self):
+        from machine_learning.dataset import DubitoDataset
+        counter = _HookCounter()
+        _, infos = dubito(
+            all_players=[HonestBot(1), TrustingBot(2), RandomBot(3)],
+            observers=[DubitoDataset(), counter],
+        )
+        self.assertEqual(len(infos['decisions']), infos['hooks']['turn'])
+        self.assertTrue(all(row[-1] in (0, 1) for row in infos['decisions']))
+
+
+# ---------------------------------------------------------------------------
+# DubitoGame / GameState
+# ---------------------------------------------------------------------------
+
+def _assert_same_position(test, game, state):
+    gh = game.game_handler
+    seat = {p.id: i for i, p in enumerate(gh.players.all)}
+    for p in gh.players.all:
+        test.assertEqual(sorted(p.cards.hand), state.hand(seat[p.id]))
+    test.assertEqual(sorted(gh.get_board()), [c for c in range(14) for _ in range(state.board[c])])
+    test.assertEqual(gh.get_current_number(), state.number)
+    test.assertEqual(gh.board.availables, state.availables())
+    test.assertEqual([seat[p.id] for p in gh.playing_players()], state.playing)
+    test.assertEqual([seat[p.id] for p in gh.get_winners()], state.winners)
+    test.assertEqual(game.is_over(), state.is_over())
+
+
+class TestDubitoGame(unittest.TestCase):
+
+    def test_step_api_plays_full_game(self):
+        players = [HonestBot(1), TrustingBot(2), AlwaysDoubtBot(3), RandomBot(4)]
+        initialize(players)
+        game = DubitoGame(players)
+        while not game.is_over():
+            player, turn_data = game.next_turn()
+            self.assertEqual(turn_data.my_player_id, player.id)
+            game.apply(player.play(turn_data))
+        result, _ = game.finish()
+        self.assertEqual(len(result['losers']), 2)
+
+    def test_turn_data_is_a_lazy_snapshot(self):
+        players = [HonestBot(1), TrustingBot(2), AlwaysDoubtBot(3), RandomBot(4)]
+        initialize(players)
+        game = DubitoGame(players)
+        for _ in range(6):
+            game.play_turn()
+        player, turn_data = game.next_turn()
+        self.assertNotIn('history', vars(turn_data))
+        hand = list(player.cards.hand)
+        counts = {p.id: len(p.cards) for p in game.game_handler.playing_players()}
+        n_events = len(game.game_handler.history)
+        game.apply(player.play(turn_data))                 # the bot takes its cards, events follow
+        for _ in range(3):
+            game.play_turn()
+        self.assertEqual(turn_data.my_cards, hand)
+        self.assertEqual(turn_data.player_card_counts, counts)
+        self.assertEqual(len(turn_data.history), n_events)
+        self.assertIn('history', vars(turn_data))
+        for clone in (copy.deepcopy(turn_data), pickle.loads(pickle.dumps(turn_data))):
+            self.assertIs(type(clone), TurnData)
+            self.assertEqual(clone, turn_data)
+            self.assertEqual(turn_data, clone)
+
+    def test_doubt_on_first_hand_raises(self):
+        players = [HonestBot(1), TrustingBot(2), RandomBot(3)]
+        initialize(players)
+        game = DubitoGame(players)
+        game.next_turn()
+        with self.assertRaises(Exception):
+            game.apply(TurnOutput(doubt=True, number=None, cards=None))
+
+
+class TestGameState(unittest.TestCase):
+
+    def test_mirrors_object_engine(self):
+        # Feed every action of real games into a GameState: both engines must agree
+        # on hands, board, discards, winners and turn order after every single turn.
+        for _ in range(30):
+            players = [AlwaysDoubtBot(1), RandomBot(2), HonestBot(3), RandomBot(4), TrustingBot(5)]
+            initialize(players)
+            game = DubitoGame(players)
+            state = GameState([p.id for p in players], [list(p.cards.hand) for p in players])
+            while not game.is_over():
+                player, turn_data = game.next_turn()
+                self.assertEqual(state.ids[state.to_move], player.id)
+                self.assertEqual(state.turn_data().player_card_counts, turn_data.player_card_counts)
+                output = player.play(turn_data)
+                game.apply(output)
+                number = game.game_handler.get_current_number() if not output.doubt else None
+                state.apply(TurnOutput(doubt=output.doubt, number=number, cards=output.cards))
+                _assert_same_position(self, game, state)
+
+    def test_stall_rule_matches_object_engine(self):
+        stalled = 0
+        for _ in range(30):
+            players = [AlwaysDoubtBot(1), RandomBot(2), HonestBot(3), RandomBot(4), TrustingBot(5)]
+            initialize(players)
+            game = DubitoGame(players, stall_turns=12)
+            state = GameState([p.id for p in players], [list(p.cards.hand) for p in players], stall_turns=12)
+            while not game.is_over():
+                player, turn_data = game.next_turn()
+                output = player.play(turn_data)
+                game.apply(output)
+                number = game.game_handler.get_current_number() if not output.doubt else None
+                state.apply(TurnOutput(doubt=output.doubt, number=number, cards=output.cards))
+                self.assertEqual(state.is_over(), game.is_over())
+                self.assertEqual(state.progress_turn, game.progress_turn)
+            stalled += game.is_stalled()
+        self.assertGreater(stalled, 0)
+
+    def test_from_game_snapshot_matches(self):
+        players = [RandomBot(1), RandomBot(2), RandomBot(3), RandomBot(4)]
+        initialize(players)
+        game = DubitoGame(players)
+        for _ in range(15):
+            game.play_turn()
+        player, _ = game.next_turn()
+        state = GameState.from_game(game)
+        self.assertEqual(state.ids[state.to_move], player.id)
+        _assert_same_position(self, game, state)
+
+    def test_clone_is_independent(self):
+        state = GameState.deal(4)
+        copy = state.clone()
+        copy.apply(copy.legal_actions()[0])
+        self.assertNotEqual(state.key(), copy.key())
+        self.assertEqual(state.key(), GameState.key(state))
+        self.assertEqual(sum(state.sizes), 54)
+
+    def test_legal_actions_first_hand(self):
+        state = GameState([1, 2, 3], [[1, 1, 2], [3, 4, 5], [6, 7, 8]])
+        actions = state.legal_actions()
+        self.assertFalse(any(a.doubt for a in actions))
+        # multisets of {1,1,2}: [1] [2] [1,1] [1,2] [1,1,2] — each with 13 declarable numbers
+        self.assertEqual(len(actions), 5 * 13)
+
+    def test_legal_actions_include_doubt_after_play(self):
+        state = GameState([1, 2, 3], [[1, 1, 2], [3, 4, 5], [6, 7, 8]])
+        state.apply(TurnOutput(doubt=False, number=1, cards=[1, 1]))
+        self.assertTrue(state.legal_actions()[0].doubt)
+
+    def test_cannot_play_cards_not_in_hand(self):
+        state = GameState([1, 2, 3], [[1, 1, 2], [3, 4, 5], [6, 7, 8]])
+        with self.assertRaises(ValueError):
+            state.apply(TurnOutput(doubt=False, number=9, cards=[9]))
+        self.assertEqual(state.hand(0), [1, 1, 2])
+
+    def test_random_games_terminate(self):
+        for _ in range(20):
+            state = GameState.deal(5)
+            while not state.is_over():
+                state.apply(random.choice(state.legal_actions()))
+            self.assertEqual(len(state.winners) + len(state.playing), 5)
+
+
+class TestMonteCarloBot(unittest.TestCase):
+
+    def test_determinizations_match_the_table(self):
+        # Every sampled deal must agree with what the seat can see: its own hand, every
+        # card count, the pile size, and the total number of cards still in play.
+        rng = random.Random(0)
+        for _ in range(10):
+            players = [RandomBot(1), AlwaysDoubtBot(2), RandomBot(3), HonestBot(4)]
+            initialize(players)
+            game = DubitoGame(players)
+            tracker = CardTracker(1)
+            while not game.is_over():
+                player, turn_data = game.next_turn()
+                if player.id == 1:
+                    tracker.ingest(turn_data.history)
+                    state = tracker.sample(turn_data, rng)
+                    self.assertIsNotNone(state)
+                    self.assertEqual(state.hand(state.to_move), sorted(turn_data.my_cards))
+                    self.assertEqual(state.turn_data().player_card_counts, turn_data.player_card_counts)
+                    self.assertEqual(sum(state.board), turn_data.board_cards)
+                    in_play = sum(len(p.cards) for p in players) + turn_data.board_cards
+                    self.assertEqual(sum(map(sum, state.hands)) + sum(state.board), in_play)
+                    output = player.play(turn_data)
+                    if not output.doubt:
+                        tracker.record_play(output.cards)
+                else:
+                    output = player.play(turn_data)
+                game.apply(output)
+
+    def test_plays_legal_games(self):
+        for seed in range(3):
+            players = [MonteCarloBot(1, rollouts=8, seed=seed), RandomBot(2), HonestBot(3), TrustingBot(4)]
+            game_result, _ = dubito(players, observers=())
+            self.assertEqual(len(game_result['winners']) + len(game_result['losers']), 4)
+
+    def test_zero_budgets_still_decide(self):
+        for bot in (MonteCarloBot(1, rollouts=8, time_budget=0, seed=0), MonteCarloBot(1, rollouts=0, seed=0)):
+            players = [bot, RandomBot(2), HonestBot(3), TrustingBot(4)]
+            game_result, _ = dubito(players, observers=())
+            self.assertEqual(len(game_result['winners']) + len(game_result['losers']), 4)
+
+    def test_opener_without_available_numbers(self):
+        bot = MonteCarloBot(1, seed=0)
+        bot.cards = Hand([0, 0])
+        turn_data = TurnData(
+            my_cards=[0, 0], current_number=0, board_cards=0, n_cards_played=0,
+            playing_cards=[], n_players=3, player_card_counts={1: 2, 2: 9, 3: 9},
+            streak=1, my_player_id=1, prev_player_id=3, next_player_id=2, history=[],
+        )
+        output = bot.play(turn_data)
+        self.assertEqual(sorted(output.cards), [0, 0])
+        self.assertEqual(output.number, 0)
+
+    def test_candidates_regular_turn(self):
+        bot = MonteCarloBot(1)
+        bot.cards = Hand([0, 3, 3, 5, 7, 9])
+        turn_data = TurnData(
+            my_cards=list(bot.cards.hand), current_number=3, board_cards=2, n_cards_played=2,
+            playing_cards=list(range(1, 14)), n_players=3, player_card_counts={1: 6, 2: 9, 3: 9},
+            streak=1, my_player_id=1, prev_player_id=3, next_player_id=2, history=[],
+        )
+        actions = bot.candidates(turn_data)
+        self.assertTrue(actions[0].doubt)
+        plays = [sorted(a.cards) for a in actions[1:]]
+        self.assertEqual(plays[:3], [[3, 3], [0, 3, 3], [0]])   # honest max, + joker, lone joker
+        self.assertTrue(all(3 not in cards and 0 not in cards for cards in plays[3:]))   # bluffs
+        self.assertEqual(len(plays[3:]), 3)
+
+class TestEndgameSolver(unittest.TestCase):
+
+    def _endgame(self) -> GameState:
+        # Mover holds 4 cards and cannot win before Player2 (3 cards) dumps, unless
+        # Player2 is handed cards by a doubt.
+        return GameState([1, 2, 3], [[1, 2, 5, 6], [3, 3, 4], [7, 8, 9, 9, 10]])
+
+    def test_canonical_ignores_number_labels(self):
+        state = self._endgame()
+        relabeled = GameState([1, 2, 3], [[11, 12, 2, 6], [4, 4, 3], [7, 8, 13, 13, 10]])
+        self.assertEqual(canonical(state)[0], canonical(relabeled)[0])
+        self.assertNotEqual(canonical(state)[0], canonical(GameState.deal(3))[0])
+
+    def test_winner_is_consistent_with_children(self):
+        solver = EndgameSolver()
+        for seed in range(5):
+            random.seed(seed)
+            state = GameState.deal(3, max_turns=10**9)
+            while max(state.sizes) > 5:
+                state.apply(random.choice(state.legal_actions()))
+                if state.is_over():
+                    break
+            if state.is_over():
+                continue
+            winner = solver.solve(state)
+            if winner is None:
+                continue
+            children = []
+            for action in solver._actions(state):
+                child = state.clone()
+                child.apply(action)
+                children.append(solver._winner(child))
+            # The mover wins iff some move wins for them.
+            self.assertEqual(winner == state.this, state.this in children)
+            if winner == state.this:
+                self.assertIsNotNone(solver.best_action(state))
+
+    def test_dump_is_a_win(self):
+        solver = EndgameSolver()
+        state = GameState([1, 2, 3], [[1, 2, 3], [4, 5, 6, 7], [8, 9, 10, 11]])
+        self.assertEqual(solver.solve(state), 0)
+        self.assertEqual(solver.lookup(state), 0)
+
+    def test_table_persists(self):
+        solver = EndgameSolver()
+        state = self._endgame()
+        winner = solver.solve(state)
+        self.assertIsNotNone(winner)
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'endgame.pkl')
+            solver.save(path)
+            warm = EndgameSolver.load(path)
+        self.assertEqual(warm.lookup(state), winner)
+        self.assertEqual(len(warm.table), len(solver.table))
+
+    def test_rollouts_stop_at_solved_endgames(self):
+        solver = EndgameSolver()
+        state = self._endgame()
+        winner = solver.solve(state)
+        turn = state.turn
+        score = rollout(state, winner, heuristic_policy, random.Random(0), solver)
+        self.assertEqual(score, 1.0)
+        self.assertEqual(state.turn, turn)      # answered from the table, nothing played
+
+
+    def test_heuristic_policy_counts_the_jokers_in_play(self):
+        # no jokers dealt: three 5s in hand make a two-card claim of 5 impossible
+        state = GameState([1, 2, 3], [[6, 7, 8, 9, 10, 12, 13], [5, 5, 5, 2, 3], [1, 2, 3, 4, 11]])
+        state.apply(TurnOutput(doubt=False, number=5, cards=[6, 7]))
+        self.assertEqual(state.this, 1)
+        for seed in range(20):
+            self.assertTrue(heuristic_policy(state, random.Random(seed)).doubt)
+
+class TestOpeningBook(unittest.TestCase):
+
+    def test_openers_and_realize(self):
+        counts = Counter([2, 2, 2, 5, 5, 7, 9, 0])
+        options = openers(counts)
+        self.assertIn((3, 3, False), options)      # all three 2s
+        self.assertIn((0, 3, True), options)       # bluff a number I do not hold
+        self.assertNotIn((1, 2, False), options)   # cannot play two copies of a singleton
+        self.assertEqual(realize((3, 2, False), counts, list(range(1, 14))), (2, [2, 2]))
+        number, cards = realize((2, 2, True), counts, list(range(1, 14)))
+        self.assertEqual(number, 5)
+        self.assertEqual(sorted(cards), [7, 9])     # singletons first, no jokers, no 5s
+
+    def test_features_bucket_positions(self):
+        counts = Counter([1, 1, 1, 3, 3, 4, 6, 8, 0])
+        self.assertEqual(features(counts, 5, 12), '1,1,1,1|5|3')
+        self.assertEqual(features(counts, 5, 12), features(Counter([4, 4, 4, 6, 6, 7, 9, 11, 0]), 5, 11))
+
+    def test_best_opener_needs_samples(self):
+        book = OpeningBook(min_samples=10)
+        book.record('f', '3,3,0', 9.0, 10)
+        book.record('f', '0,3,1', 2.0, 5)
+        book.record('f', '0,3,1', 4.0, 5)
+        book.record('f', '1,1,0', 3.0, 3)          # best mean, too few samples
+        book.finalize()
+        self.assertEqual(book.entries['f']['best'], '3,3,0')
+        self.assertEqual(book.entries['f']['values']['0,3,1'], [0.6, 10])
+
+    def test_book_round_trip_and_play(self):
+        sums = simulate_openers(n_games=3, rollouts=1, seats=[4], seed=0)
+        self.assertTrue(sums)
+        book = OpeningBook(min_samples=1)
+        for feats, cells in sums.items():
+            for opener, (total, n) in cells.items():
+                book.record(feats, opener, total, n)
+        book.finalize()
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'book.json')
+            book.save(path)
+            loaded = OpeningBook.load(path, min_samples=1)
+        self.assertEqual(loaded.entries, book.entries)
+
+        bot = HonestBot(1)
+        bot.cards = Hand([2, 2, 2, 5, 5, 7, 9, 11])
+        counts = bot.cards.count_all()
+        feats = features(counts, 4, 8)
+        loaded.entries[feats] = {'best': '3,3,0', 'values': {'3,3,0': [0.6, 40]}}
+        turn_data = TurnData(
+            my_cards=list(bot.cards.hand), current_number=0, board_cards=0, n_cards_played=0,
+            playing_cards=list(range(1, 14)), n_players=4, player_card_counts={1: 8, 2: 8, 3: 8, 4: 8},
+            streak=0, my_player_id=1, prev_player_id=4, next_player_id=2, history=[],
+        )
+        output = loaded.play(bot, turn_data)
+        self.assertEqual((output.number, output.cards), (2, [2, 2, 2]))
+        self.assertEqual(bot.cards.hand, [5, 5, 7, 9, 11])
+
+
+class TestDuplicateMode(unittest.TestCase):
+
+    def test_every_bot_plays_every_seat(self):
+        algorithms = [HonestBot, TrustingBot, AlwaysDoubtBot]
+        final_infos, run = play_duplicate(algorithms, [3], 30, seed=1)
+        self.assertEqual((run['games'], run['deals']), (30, 10))
+        for info in final_infos.values():
+            self.assertEqual(info.total.games, 10 * 3)
+        self.assertEqual(sorted(run['paired']), ['AlwaysDoubtBot', 'HonestBot'])
+        self.assertEqual(paired_diff(run['paired'], 'HonestBot', 'TrustingBot').deals, 10)
+
+    def test_seed_replays_run(self):
+        algorithms = [HonestBot, RandomBot, TrustingBot]
+        a = play_duplicate(algorithms, [3, 4], 40, seed=7)
+        b = play_duplicate(algorithms, [3, 4], 40, seed=7)
+        self.assertEqual(a, b)
+
+    def test_paired_stats(self):
+        ps = PairedStats()
+        for d in (0.5, 0.0, 0.25, 0.25):
+            ps.add(d)
+        self.assertAlmostEqual(ps.mean, 0.25)
+        self.assertAlmostEqual(ps.half_width(), 1.96 * (1 / 24) ** 0.5 / 2)
+        self.assertEqual(PairedStats(deals=1, total=1.0, total_sq=1.0).half_width(), float('inf'))
+        flipped = paired_diff({'A': {'B': ps}}, 'B', 'A')
+        self.assertAlmostEqual(flipped.mean, -0.25)
+        self.assertIsNone(paired_diff({'A': {'B': ps}}, 'A', 'C'))
+
+    def test_run_round_trip(self):
+        final_infos, run = play_duplicate([HonestBot, TrustingBot], [3], 6, seed=3)
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'all_games.yaml')
+            save_stats(final_infos, path, run)
+            self.assertEqual(load_stats(path), final_infos)
+            self.assertEqual(load_run(path), run)
+
+
+class TestSequentialStopping(unittest.TestCase):
+
+    def _stats(self, games, hard, soft):
+        info = make_bot_stats(set())
+        info.total.games, info.hard_wins.games, info.soft_wins.games = games, hard, soft
+        return info
+
+    def test_intervals(self):
+        lo, hi = wilson_interval(0, 10)
+        self.assertEqual(lo, 0.0)
+        self.assertGreater(hi, 0.0)
+        lo, hi = wilson_interval(500, 1000)
+        self.assertAlmostEqual((lo + hi) / 2, 0.5)
+        self.assertAlmostEqual((hi - lo) / 2, 1.96 * 0.5 / 1000 ** 0.5, places=3)
+        lo, hi = score_interval(self._stats(4, 2, 0))           # scores 1, 1, 0, 0
+        self.assertAlmostEqual((lo + hi) / 2, 0.5)
+        self.assertAlmostEqual((hi - lo) / 2, 1.96 * (1 / 3 / 4) ** 0.5)
+
+    def test_unresolved_bots(self):
+        infos = {'A': self._stats(10_000, 6000, 0), 'B': self._stats(10_000, 3000, 0),
+                 'C': self._stats(10_000, 3020, 0)}
+        self.assertEqual(sorted(unresolved_bots(infos, precision=0.001)), ['B', 'C'])
+        self.assertEqual(unresolved_bots(infos, precision=0.05), [])
+
+    def test_adaptive_run_records_decision(self):
+        final_infos, run = play_adaptive([HonestBot, AlwaysDoubtBot], [3], 300, precision=0.5, check_every=100)
+        self.assertEqual((run['stopped'], run['games'], run['unresolved']), ('resolved', 100, []))
+        self.assertEqual(sum(info.total.games for info in final_infos.values()), 300)
+        random.seed(0)                                          # close bots, too few games to separate
+        _, run = play_adaptive([RandomBot, AlwaysDoubtBot, HonestBot], [3], 120, precision=0.0001, check_every=60)
+        self.assertEqual((run['stopped'], run['games']), ('max_games', 120))
+        self.assertEqual([c['games'] for c in run['checks']], [60, 120])
+
+
+class TestLineupScheduler(unittest.TestCase):
+
+    def test_weighted_draws_match_uniform(self):
+        algorithms = [HonestBot, TrustingBot, AlwaysDoubtBot]
+        names = {a.__name__ for a in algorithms}
+        infos = {n: make_bot_stats(names) for n in names}
+        scheduler = LineupScheduler(algorithms, refresh=10**9, rng=random.Random(0))
+        scheduler.priority.update({'HonestBot': 10.0, 'TrustingBot': 1.0, 'AlwaysDoubtBot': 0.1})
+        scheduler._seen = 1                                    # keep the skewed priorities
+        raw, weighted, total = Counter(), Counter(), 0.0
+        for _ in range(20_000):
+            lineup, w = scheduler.next_lineup(infos, 3)
+            for alg in lineup:
+                raw[alg.__name__] += 1
+                weighted[alg.__name__] += w
+            total += 3 * w
+        self.assertGreater(raw['HonestBot'], 2 * raw['AlwaysDoubtBot'])
+        for n in names:
+            self.assertAlmostEqual(weighted[n] / total, 1 / 3, delta=0.03)
+
+    def test_weighted_run(self):
+        algorithms = [HonestBot, TrustingBot, AlwaysDoubtBot]
+        final_infos = play_games(algorithms, [3, 4], 200, LineupScheduler(algorithms, refresh=50))
+        for info in final_infos.values():
+            self.assertGreater(info.total.games, 0)
+            self.assertGreater(info.total.weight_sq, 0)
+            self.assertLess(effective_games(info), 200 * 4)
+        unweighted = play_games(algorithms, [3], 20)
+        for info in unweighted.values():
+            self.assertEqual(effective_games(info), info.total.games)
+
+
+class TestSignificance(unittest.TestCase):
+
+    def test_metric_errors_from_moments(self):
+        info = make_bot_stats(set())
+        t = info.total
+        for cards, turns, pos in ((2, 1, 0.0), (4, 2, 1.0)):   # Cards/Turn is exactly 2 in both games
+            t.games += 1
+            t.cards_played += cards
+            t.play_turns += turns
+            t.cards_played_sq += cards ** 2
+            t.play_turns_sq += turns ** 2
+            t.cards_turns += cards * turns
+            t.total_position += pos
+            t.position_sq += pos ** 2
+            t.weight_sq += 1
+        t.total_position /= 2
+        t.position_sq /= 2
+        errors = metric_errors(info)
+        self.assertEqual(errors['cards_per_turn'], (2.0, 0.0))
+        self.assertAlmostEqual(errors['avg_position'][1], (0.25 / 2) ** 0.5)
+        self.assertIn('avg_position', metric_intervals(info))
+
+        t.position_sq = t.play_turns_sq = 0.0                # results saved without moments
+        self.assertNotIn('avg_position', metric_intervals(info))
+        self.assertNotIn('cards_per_turn', metric_intervals(info))
+
+    def test_significance_matrix(self):
+        est = np.array([0.60, 0.50, 0.499])
+        se = np.array([0.01, 0.01, 0.01])
+        diff, p = significance_matrix(est, se)
+        self.assertTrue(np.allclose(diff, -diff.T))
+        self.assertTrue(np.allclose(p, p.T))
+        self.assertTrue(np.all(np.diag(p) == 1))
+        self.assertLess(p[0, 1], 0.001)
+        self.assertGreater(p[1, 2], 0.5)
+        raw = math.erfc(0.1 / (0.01 * 2 ** 0.5) / 2 ** 0.5)
+        self.assertGreaterEqual(p[0, 1], raw)                 # Holm never lowers a p-value
+
+
+class TestRatings(unittest.TestCase):
+
+    def test_update_from_finishing_order(self):
+        ratings = Ratings(provisional=0)
+        ratings.update([['A'], ['B'], ['C', 'D']])
+        r = ratings.ratings
+        self.assertGreater(r['A'], r['B'])
+        self.assertGreater(r['B'], 1500)
+        self.assertAlmostEqual(r['C'], r['D'])
+        self.assertAlmostEqual(sum(r.values()), 4 * 1500)         # zero-sum at equal K
+        self.assertAlmostEqual(r['A'] - 1500, 16 / 3 * 1.5)      # 3 wins − 3 × 0.5 expected
+
+    def test_same_bot_seats_and_frozen_anchors(self):
+        ratings = Ratings({'A': 1600.0, 'B': 1400.0}, {'A': 100, 'B': 100})
+        ratings.update([['B'], ['B'], ['A', 'A']], frozen={'A'})
+        self.assertEqual(ratings.rating('A'), 1600.0)
+        self.assertGreater(ratings.rating('B'), 1400.0)
+        self.assertEqual(ratings.games, {'A': 102, 'B': 102})
+
+    def test_round_trip_and_newcomer(self):
+        players = [HonestBot(1), TrustingBot(2), AlwaysDoubtBot(3)]
+        results = {'winners': [players[1]], 'losers': [players[0], players[2]]}
+        self.assertEqual(finishing_order(results), [['TrustingBot'], ['HonestBot', 'AlwaysDoubtBot']])
+
+        ratings = Ratings({'HonestBot': 1550.0, 'TrustingBot': 1450.0}, {'HonestBot': 50, 'TrustingBot': 50})
+        rate_newcomer(ratings, RandomBot, [HonestBot, TrustingBot], [3, 4], 30)
+        self.assertEqual((ratings.rating('HonestBot'), ratings.rating('TrustingBot')), (1550.0, 1450.0))
+        self.assertEqual(ratings.games['RandomBot'], 30)
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'ratings.json')
+            ratings.save(path)
+            loaded = Ratings.load(path)
+        self.assertEqual((loaded.ratings, loaded.games), (ratings.ratings, ratings.games))
+
+
+class TestCheckConfig(unittest.TestCase):
+
+    def test_modes_without_single_games_refuse_ratings(self):
+        for mode in ('random', 'adaptive', 'duplicate'):
+            check_config({'mode': mode, 'ratings_file': 'ratings.json'})
+        for mode in ('cached', 'farm', 'lockstep'):
+            with self.assertRaises(ValueError):
+                check_config({'mode': mode, 'ratings_file': 'ratings.json'})
+        check_config({'mode': 'cached'})
+
+    def test_options_outside_their_modes_are_config_errors(self):
+        for option in ('schedule', 'archive', 'telemetry', 'telemetry_port', 'sandbox'):
+            for mode in ('random', 'adaptive'):
+                check_config({'mode': mode, option: 'x'})
+            check_config({option: 'x'})                              # mode defaults to random
+            for mode in ('duplicate', 'cached', 'farm', 'lockstep'):
+                with self.assertRaisesRegex(ValueError, f'{option} not supported in {mode} mode'):
+                    check_config({'mode': mode, option: 'x'})
+
+    def test_unknown_modes_are_config_errors(self):
+        for mode in ('random', 'adaptive', 'duplicate', 'cached', 'farm', 'lockstep'):
+            check_config({'mode': mode})
+        for mode in ('lockstpe', 'Random', None):
+            with self.assertRaisesRegex(ValueError, 'unknown mode'):
+                check_config({'mode': mode})
+
+
+class TestResultCache(unittest.TestCase):
+
+    def test_bot_hash_follows_source(self):
+        self.assertNotEqual(bot_hash(HonestBot), bot_hash(TrustingBot))
+        self.assertEqual(bot_hash(MonteCarloBot), bot_hash(MonteCarloBot))
+
+    def test_only_changed_bot_blocks_are_replayed(self):
+        algorithms = [HonestBot, TrustingBot, AlwaysDoubtBot, RandomBot]
+        with tempfile.TemporaryDirectory() as tmp:
+            first, run = play_cached(algorithms, [3], 400, block_size=20, cache=ResultCache(tmp))
+            self.assertEqual((run['cached_blocks'], run['simulated_blocks']), (0, 20))
+
+            again, run = play_cached(algorithms, [3], 400, block_size=20, cache=ResultCache(tmp))
+            self.assertEqual((run['cached_blocks'], run['simulated_blocks']), (20, 0))
+            self.assertEqual(again, first)
+
+            changed = lambda cls: bot_hash(cls) + ('v2' if cls is RandomBot else '')
+            with mock.patch('experiments.runner.bot_hash', changed):
+                edited, run = play_cached(algorithms, [3], 400, block_size=20, cache=ResultCache(tmp))
+            ordered = sorted(algorithms, key=lambda a: a.__name__)
+            lineups = []
+            for block in range(20):                                # the blocks' draws, as play_cached makes them
+                rng = random.Random(f'0:{block}')
+                n = rng.choice([3])
+                lineups.append([rng.choice(ordered) for _ in range(n)])
+            self.assertEqual(run['simulated_blocks'], sum(RandomBot in lineup for lineup in lineups))
+            self.assertEqual(run['cached_blocks'], sum(RandomBot not in lineup for lineup in lineups))
+            self.assertEqual(edited['HonestBot'].total.games + edited['TrustingBot'].total.games
+                             + edited['AlwaysDoubtBot'].total.games + edited['RandomBot'].total.games, 400 * 3)
+
+    def test_blocks_are_the_independent_units(self):
+        blocks = []
+        for won in (True, False):                                  # one lineup that always wins, one that never does
+            stats = {'HonestBot': make_bot_stats({'HonestBot'})}
+            stats['HonestBot'].total.games = 10
+            (stats['HonestBot'].hard_wins if won else stats['HonestBot'].losses).games = 10
+            record_block(stats)
+            blocks.append(stats)
+        info = merge_stats(*blocks)['HonestBot']
+        self.assertEqual((info.total.games, info.total.blocks), (20, 2))
+        self.assertAlmostEqual(design_effect(info), 20.0)
+        self.assertAlmostEqual(effective_games(info), 1.0)
+
+        with tempfile.TemporaryDirectory() as tmp:
+            cached, _ = play_cached([HonestBot, TrustingBot, AlwaysDoubtBot], [3], 600, block_size=50,
+                                    cache=ResultCache(tmp))
+        for info in cached.values():
+            self.assertGreaterEqual(design_effect(info), 1.0)
+            self.assertLessEqual(effective_games(info), info.total.games)
+
+
+# ---------------------------------------------------------------------------
+# Game archive
+# ---------------------------------------------------------------------------
+
+class _History(GameObserver):
+    key = 'history'
+
+    def on_game_end(self, game_handler):
+        self.history = list(game_handler.history)
+
+    def result(self):
+        return self.history
+
+
+class TestGameArchive(unittest.TestCase):
+
+    def test_pack_round_trip(self):
+        random.seed(3)
+        players = [RandomBot(1), HonestBot(2), AlwaysDoubtBot(3), TrustingBot(4)]
+        _, infos = dubito(players, observers=[_History(), ArchiveRecorder()])
+        records, cards = infos['archive']
+        history, played = unpack_game(records, cards)
+        self.assertEqual(history, infos['history'])
+        plays = [e for e in history if isinstance(e, CardsPlayedEvent)]
+        self.assertEqual([len(p) for p in played], [e.n_cards for e in plays])
+        self.assertTrue((records[records[:, KIND] == PLAY, FLAG] >= 0).all())
+
+        bare, bare_cards = pack_game(infos['history'])            # without the hidden plays
+        self.assertEqual(unpack_game(bare, bare_cards), (infos['history'], []))
+
+    def test_write_find_and_replay(self):
+        algorithms = [HonestBot, RandomBot, TrustingBot]
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'archive')
+            with ArchiveWriter(path, chunk_size=7, seed=0) as writer:
+                play_games(algorithms, [3, 4], 20, archive=writer)
+            with ArchiveWriter(path, chunk_size=7, seed=1) as writer:  # appends
+                play_games(algorithms, [3, 4], 5, archive=writer)
+
+            reader = ArchiveReader(path)
+            self.assertEqual(len(reader), 25)
+            self.assertEqual([c['games'] for c in reader.meta['chunks']], [7, 7, 6, 5])
+            self.assertEqual(sum(1 for _ in reader.games()), 25)
+
+            with_random = reader.find(bot='RandomBot')
+            self.assertTrue(all('RandomBot' in reader.game(int(i)).bots for i in with_random))
+            self.assertEqual(len(reader.find(bot='NoSuchBot')), 0)
+            game = reader.game(12)
+            self.assertEqual(list(reader.find(seed=game.seed)), [12])
+            self.assertEqual(len(reader.find(n_players=3)) + len(reader.find(n_players=4)), 25)
+
+            history, _ = game.unpack()
+            _, infos = reader.replay(12, [_History()])
+            self.assertEqual(infos['history'], history)
+
+    def test_packed_history_reads_like_the_events(self):
+        random.seed(5)
+        _, infos = dubito([RandomBot(1), HonestBot(2), AlwaysDoubtBot(3)], observers=[_History()])
+        events = infos['history']
+        with self.assertRaises(AttributeError):
+            events[1].n_cards = 3                                   # frozen
+
+        packed = PackedHistory(events[:10], capacity=4)
+        for event in events[10:]:
+            packed.append(event)
+        self.assertEqual((len(packed), list(packed), packed[-1], packed[7]), (len(events), events, events[-1], events[7]))
+        self.assertEqual(packed, events)
+        self.assertEqual(list(packed[3:20]), events[3:20])
+        self.assertEqual(packed[::5], events[::5])
+        records, cards = pack_game(events)
+        self.assertTrue(all((a == b).all() for a, b in zip(packed.arrays(), (records, cards))))
+
+        view = packed[:12]                                          # shares the buffers...
+        view.append(events[-1])                                     # ...until it is appended to
+        self.assertEqual(list(view), events[:12] + [events[-1]])
+        self.assertEqual(list(packed), events)
+        self.assertEqual(pickle.loads(pickle.dumps(packed[5:])), events[5:])
+
+        for pid in (1, 2, 3):
+            for helper in (honest_times, dishonest_times, doubts_count, turns_count):
+                self.assertEqual(helper(pid, packed), helper(pid, events))
+
+    def test_packed_history_games_match_list_games(self):
+        algorithms = [BotBase.registry[n] for n in ('ClaudeFableBot', 'AdaptiveBot', 'ChatGPTBot', 'HonestBot')]
+        for packed in (False, True):
+            random.seed(11)
+            games = []
+            for _ in range(20):
+                players = [random.choice(algorithms)(i) for i in range(1, 5)]
+                results, infos = dubito(players, observers=[StatsHandler(), _History()], packed_history=packed)
+                games.append(([p.id for p in results['winners']], results['turns'], infos['history']))
+            if packed:
+                self.assertEqual(games, plain)
+            plain = games
+
+
+class TestArchiveQuery(unittest.TestCase):
+
+    def test_group_sums(self):
+        sums = group_sums([np.array([1, 1, 2, 1]), np.array([0, 0, 0, 1])], np.array([1, 3, 5, 7]))
+        self.assertEqual(sums, {(1, 0): (4.0, 10.0, 2), (1, 1): (7.0, 49.0, 1), (2, 0): (5.0, 25.0, 1)})
+        self.assertEqual(group_sums([np.array([])], np.array([])), {})
+
+    def test_metrics_match_the_games(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'archive')
+            with ArchiveWriter(path, chunk_size=10, seed=4) as writer:
+                play_games([HonestBot, RandomBot, AlwaysDoubtBot], [3, 4, 5], 30, archive=writer)
+
+            bluffs, doubts, seats = Counter(), Counter(), Counter()
+            for game in ArchiveReader(path).games():
+                history, played = game.unpack()
+                order = history[0].player_ids
+                plays = iter(played)
+                for event in history[1:]:
+                    if isinstance(event, CardsPlayedEvent):
+                        bot = game.bots[event.player_id - 1]
+                        honest = all(c in (0, event.declared_number) for c in next(plays))
+                        bluffs[bot, not honest] += 1
+                        seats[order.index(event.player_id)] += 1
+                    elif isinstance(event, DoubtResolvedEvent):
+                        doubts[game.bots[event.doubter_id - 1], event.correct] += 1
+
+            bluff_rate = aggregate(path, 'bluff_rate')
+            for (bot,), (mean, _, n) in bluff_rate.items():
+                self.assertEqual(n, bluffs[bot, True] + bluffs[bot, False])
+                self.assertAlmostEqual(mean, bluffs[bot, True] / n)
+            self.assertEqual(bluff_rate[('HonestBot',)][0], 0.0)
+            for (bot,), (mean, _, n) in aggregate(path, 'doubt_accuracy').items():
+                self.assertAlmostEqual(mean, doubts[bot, True] / (doubts[bot, True] + doubts[bot, False]))
+            by_seat = aggregate(path, 'cards_per_play', by=('seat',))
+            self.assertEqual({seat: n for (seat,), (_, _, n) in by_seat.items()}, dict(seats))
+
+            by_streak = aggregate(path, 'bluff_rate', by=('bot', 'streak'), workers=2)
+            self.assertEqual(by_streak, aggregate(path, 'bluff_rate', by=('bot', 'streak')))
+            self.assertEqual(sum(n for _, _, n in by_streak.values()), sum(bluffs.values()))
+
+
+class TestCounterfactual(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, 'archive')
+        with ArchiveWriter(self.path, seed=5) as writer:
+            play_games([HonestBot, RandomBot, TrustingBot], [3, 4], 6, archive=writer)
+        self.reader = ArchiveReader(self.path)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_restore_reaches_every_decision(self):
+        for game in self.reader.games():
+            steps = decisions(game)
+            for step, player_id, _, _ in steps[::7] + steps[-1:]:
+                state = restore(game, step)
+                self.assertEqual(state.this_player.id, player_id)
+                self.assertEqual(len(state.turn_data.my_cards), len(state.this_player.cards))
+            with self.assertRaises(ValueError):
+                restore(game, len(steps))
+
+    def test_restore_detects_changed_bots(self):
+        game = next(g for g in self.reader.games() if 'HonestBot' in g.bots)
+        with mock.patch.dict(BotBase.registry, {'HonestBot': AlwaysDoubtBot}):
+            with self.assertRaises(ValueError):
+                restore(game, len(decisions(game)) - 1)
+
+    def test_fork_deltas_are_paired(self):
+        game = self.reader.game(0)
+        step, _, bot, _ = decisions(game)[5]
+        same = fork(self.path, 0, step, bot=bot, n=20)                  # same bot, same seeds
+        self.assertEqual((same.delta.deals, same.delta.total, same.delta.total_sq), (20, 0.0, 0.0))
+        self.assertEqual(same.baseline, same.counterfactual)
+        self.assertEqual(same.bot, bot)
+
+        doubt = fork(self.path, 0, step, action=TurnOutput(doubt=True, number=None, cards=None), n=20)
+        self.assertAlmostEqual(doubt.counterfactual - doubt.baseline, doubt.delta.mean)
+        self.assertEqual(doubt.baseline, same.baseline)
+        with self.assertRaises(ValueError):
+            fork(self.path, 0, step)
+
+
+def _rl_loads_in_worker(model_path):
+    rl_bot.RLBot(1, model_path, 'missing.pkl')
+    return sys.modules['stable_baselines3'].PPO.load.call_count
+
+
+class TestRLBotPreload(unittest.TestCase):
+
+    def setUp(self):
+        sb3 = mock.MagicMock()
+        sb3.PPO.load.return_value.predict.return_value = (1, None)        # honest, 1 card
+        patches = [
+            mock.patch.dict(sys.modules, {'stable_baselines3': sb3}),
+            mock.patch.dict(rl_bot._MODELS, clear=True),
+        ]
+        for p in patches:
+            p.start()
+            self.addCleanup(p.stop)
+        self.load = sb3.PPO.load
+
+    def test_instances_share_one_model(self):
+        agent = rl_bot.RLBot.load('m.zip', 'missing.pkl')
+        self.assertNotIn(agent, BotBase.registry.values())
+        agent.preload()
+        random.seed(0)
+        results, _ = dubito([agent(1), agent(2), HonestBot(3)], observers=[])
+        self.assertEqual(len(results['winners']) + len(results['losers']), 3)
+        self.load.assert_called_once_with('m.zip', device='cpu')
+        self.load.return_value.policy.share_memory.assert_called_once()
+
+    def test_forked_workers_reuse_the_preloaded_model(self):
+        rl_bot.RLBot.load('m.zip', 'missing.pkl').preload()
+        context = multiprocessing.get_context('fork')
+        with ProcessPoolExecutor(max_workers=1, mp_context=context) as pool:
+            self.assertEqual(pool.submit(_rl_loads_in_worker, 'm.zip').result(), 1)
+            self.assertEqual(pool.submit(_rl_loads_in_worker, 'other.zip').result(), 2)
+
+
+class TestBotRegistry(unittest.TestCase):
+
+    def test_manifest_matches_the_bots(self):
+        for name, module in MANIFEST.items():
+            cls = BotBase.registry[name]
+            self.assertEqual((cls.__name__, cls.__module__), (name, module))
+        listed = [n for n, cls in BotBase.registry.items() if cls.__module__.startswith('bots.')]
+        self.assertEqual(listed, list(MANIFEST))
+
+    def test_startup_imports_only_what_it_uses(self):
+        code = (
+            "import sys\n"
+            "import run_game, experiments.runner\n"
+            "from bots.base import BotBase\n"
+            "assert 'MonteCarloBot' in BotBase.registry and len(experiments.runner.DEFAULT_BOTS) > 1\n"
+            "BotBase.registry['HonestBot']\n"
+            "heavy = ['plotly', 'tqdm', 'yaml', 'gymnasium', 'http.server', 'bots.manual.random_bot',\n"
+            "         'bots.llms.claude', 'bots.search.monte_carlo']\n"
+            "print([m for m in heavy if m in sys.modules])\n"
+        )
+        out = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True,
+                             cwd=os.path.dirname(os.path.abspath(__file__)))
+        self.assertEqual(out.stdout.strip(), '[]')
+
+    def test_patching_restores_the_registry(self):
+        names = list(BotBase.registry)
+        with mock.patch.dict(BotBase.registry, {'HonestBot': AlwaysDoubtBot}):
+            self.assertIs(BotBase.registry['HonestBot'], AlwaysDoubtBot)
+        self.assertEqual(list(BotBase.registry), names)
+        self.assertIs(BotBase.registry['HonestBot'], HonestBot)
+
+
+class TestPlayerPool(unittest.TestCase):
+
+    def test_seats_reuse_reset_instances(self):
+        pool = PlayerPool()
+        first = pool.seat([HonestBot, HonestBot, TrustingBot])
+        dubito(list(first), observers=())
+        hands = [p.cards for p in first]
+        again = pool.seat([HonestBot, HonestBot, TrustingBot, HonestBot])
+        self.assertEqual([p.id for p in again], [1, 2, 3, 4])
+        self.assertTrue(all(a is b for a, b in zip(first, again)))
+        self.assertTrue(all(p.cards is h and p.cards.hand == [] for p, h in zip(again, hands)))
+        self.assertEqual(len(pool), 4)
+        self.assertIsNot(pool.seat([TrustingBot])[0], first[0])
+
+    def test_pooled_players_play_like_fresh_ones(self):
+        # search bots draw from their own unseeded generators
+        algorithms = [BotBase.registry[n] for n in BotBase.registry if n not in SEARCH_BOTS and n in MANIFEST]
+
+        def play(pool: PlayerPool | None) -> list:
+            rng, games = random.Random(5), []
+            for g in range(150):
+                lineup = [rng.choice(algorithms) for _ in range(rng.choice([3, 4, 5, 6]))]
+                players = pool.seat(lineup) if pool else [a(i) for i, a in enumerate(lineup, start=1)]
+                random.seed(g)
+                results, _ = dubito(players, observers=())
+                games.append(([p.id for p in results['winners']], results['turns']))
+            return games
+
+        self.assertEqual(play(PlayerPool()), play(None))
+
+
+class TestLockstep(unittest.TestCase):
+    NAMES = ['HonestBot', 'AlwaysBluffBot', 'RandomBot', 'RiskAwareBot']
+
+    def _batch(self, games: int, seed: int = 0, **deal):
+        rng = np.random.default_rng(seed)
+        n = rng.integers(3, 7, games)
+        seats = rng.integers(0, len(self.NAMES), (games, 6))
+        seats[np.arange(6) >= n[:, None]] = -1
+        rules = [rules_for(BotBase.registry[name]) for name in self.NAMES]
+        return n, simulate(seats, rules, seed=seed, **deal)
+
+    def test_games_end_by_the_rules(self):
+        n, result = self._batch(500)
+        present = result.seats >= 0
+        finished = ~result.timeout
+        self.assertGreater(finished.mean(), 0.9)
+        self.assertTrue((((result.place == 0) & present).sum(1)[finished] == 2).all())
+        self.assertTrue(((result.place > 0) == (present & (result.cards == 0)))[finished].all())
+        for g in np.flatnonzero(finished):
+            places = sorted(result.place[g][result.place[g] > 0])
+            self.assertEqual(places, list(range(1, n[g] - 1)))
+        self.assertTrue((result.cards[~present] == 0).all())
+        self.assertTrue((result.stats['turns'].sum(1) >= result.turns).all())
+
+    def test_outcomes_match_dubito(self):
+        lineup = [HonestBot, BotBase.registry['AlwaysBluffBot'], TrustingBot, RandomBot]
+        wins, turns = Counter(), 0
+        random.seed(0)
+        for _ in range(600):
+            results, _ = dubito([a(i) for i, a in enumerate(lineup, start=1)], observers=())
+            wins[type(results['winners'][0]).__name__] += 1
+            turns += results['turns']
+
+        rng = np.random.default_rng(0)
+        seats = rng.permuted(np.tile(np.arange(4), (6000, 1)), axis=1)
+        result = simulate(seats, [rules_for(a) for a in lineup], seed=0)
+        first = seats[result.place == 1]
+        for r, alg in enumerate(lineup):
+            self.assertAlmostEqual((first == r).mean(), wins[alg.__name__] / 600, delta=0.07)
+        self.assertAlmostEqual(result.turns.mean(), turns / 600, delta=0.1 * turns / 600)
+
+    def test_record_lockstep_matches_record_game(self):
+        n, result = self._batch(200, seed=1, max_turns=80)
+        batch = {name: make_bot_stats(set(self.NAMES)) for name in self.NAMES}
+        looped = copy.deepcopy(batch)
+        record_lockstep(batch, self.NAMES, result)
+        for g in range(len(n)):
+            players = []
+            for i in range(n[g]):
+                p = BotBase.registry[self.NAMES[result.seats[g, i]]](i)
+                p.cards.hand = [1] * int(result.cards[g, i])
+                players.append(p)
+            winners = sorted((p for p in players if result.place[g, p.id]), key=lambda p: result.place[g, p.id])
+            stats = {p.id: {k: int(v[g, p.id]) for k, v in result.stats.items()} for p in players}
+            record_game(looped, players, {'winners': winners}, stats)
+        for name in self.NAMES:
+            for bucket in ('total', 'hard_wins', 'soft_wins', 'losses'):
+                a, b = vars(getattr(batch[name], bucket)), vars(getattr(looped[name], bucket))
+                for field in a:
+                    if isinstance(a[field], float):
+                        self.assertAlmostEqual(a[field], b[field], places=6)
+                    else:
+                        self.assertEqual(a[field], b[field], (name, bucket, field))
+
+    def test_play_lockstep_needs_vectorized_rules(self):
+        final_infos, run = play_lockstep([HonestBot, TrustingBot], [3, 4], 300, batch_size=128)
+        self.assertEqual(run['mode'], 'lockstep')
+        seated = sum(info.total.games for info in final_infos.values())
+        self.assertTrue(3 * 300 <= seated <= 4 * 300)
+        hard_wins = sum(info.hard_wins.games for info in final_infos.values())
+        self.assertTrue(300 - run['timeouts'] <= hard_wins <= 300)      # a timed-out game may have a winner
+        with self.assertRaises(ValueError):
+            play_lockstep([HonestBot, SuspicionBot], [3], 10)
+
+
+class TestSweep(unittest.TestCase):
+
+    def test_variants_override_class_constants(self):
+        from bots.manual.risk_aware_bot import RiskAwareBot
+        variant = make_variant('RiskAwareBot', {'BOARD_SCALE': 10})
+        self.assertTrue(issubclass(variant, RiskAwareBot))
+        self.assertEqual((variant(1).BOARD_SCALE, RiskAwareBot(1).BOARD_SCALE), (10, 40))
+        self.assertNotIn(variant.__name__, BotBase.registry)
+        with self.assertRaises(ValueError):
+            make_variant('RiskAwareBot', {'board_scale': 10})
+
+    def test_grid_and_pareto_front(self):
+        self.assertEqual(len(grid({'A': [1, 2, 3], 'B': [0, 1]})), 6)
+        self.assertEqual(len(grid({'A': [1, 2, 3], 'B': [0, 1]}, samples=4)), 4)
+        self.assertEqual(pareto_front([(1, 1), (2, 0), (0, 2), (1, 0), (2, 0)]), [0, 1, 2, 4])
+
+    def test_successive_halving_prunes_to_keep(self):
+        configs = grid({'DOUBT_THRESHOLD': [0.3, 0.72, 1.5], 'BLUFF_IF_ONE': [0.0, 0.6]})
+        trials = successive_halving('ChatGPTBot', configs, ['HonestBot', 'RandomBot'], [3],
+                                    objectives=['score', 'bluff_stealth'], min_games=20, eta=2, keep=2)
+        games = sorted((t.games for t in trials), reverse=True)
+        self.assertEqual(games, [80, 80, 40, 20, 20, 20])
+        survivors = [t for t in trials if t.games == 80]
+        self.assertTrue(all(t.rung == 2 for t in survivors))
+        self.assertTrue(any(t.pareto for t in survivors))
+        self.assertFalse(any(t.pareto for t in trials if t.games < 80))
+        self.assertEqual(sum(t.stats.total.games for t in trials), 260)
+
+
+class TestFarm(unittest.TestCase):
+
+    algorithms = [HonestBot, TrustingBot, AlwaysDoubtBot, RandomBot]
+
+    def assertSameStats(self, a, b):
+        self.assertEqual(a.keys(), b.keys())
+        for bot in a:
+            for bucket in ('total', 'hard_wins', 'soft_wins', 'losses'):
+                x, y = getattr(a[bot], bucket), getattr(b[bot], bucket)
+                self.assertEqual((x.games, x.bluffs, x.doubts, x.prev), (y.games, y.bluffs, y.doubts, y.prev))
+                self.assertAlmostEqual(x.total_position, y.total_position)
+
+    def test_local_workers_match_cached_mode(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            cached, _ = play_cached(self.algorithms, [3, 4], 300, seed=1, block_size=25,
+                                    cache=ResultCache(os.path.join(tmp, 'cache')))
+            farmed, run = play_farm(self.algorithms, [3, 4], 300, os.path.join(tmp, 'farm'), seed=1,
+                                    block_size=25, poll=0.02, local_workers=2)
+            self.assertEqual((run['shards'], run['reissued']), (12, 0))
+            self.assertSameStats(farmed, cached)
+            self.assertEqual(len(os.listdir(os.path.join(tmp, 'farm', 'done'))), 12)
+            self.assertEqual(os.listdir(os.path.join(tmp, 'farm', 'claimed')), [])
+
+    def test_lost_shards_are_reissued(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            farm = os.path.join(tmp, 'farm')
+            create_job(farm, self.algorithms, [3], 100, block_size=20)
+            for shard in ('00000001', '00000003'):                 # claimed by a worker that died
+                os.rename(os.path.join(farm, 'todo', shard), os.path.join(farm, 'claimed', shard))
+            farmed, run = play_farm(self.algorithms, [3], 100, farm, block_size=20,
+                                    lease=0.2, poll=0.02, local_workers=1)
+            self.assertEqual(run['reissued'], 2)
+            self.assertEqual(sum(info.total.games for info in farmed.values()), 300)
+            with self.assertRaises(ValueError):                    # same dir, different job
+                create_job(farm, self.algorithms, [3], 200, block_size=20)
+            self.assertEqual(run_worker(farm, poll=0.01), 0)        # stop was written
+
+    def test_coordinator_stops_when_local_workers_die(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            with mock.patch('experiments.farm.play_shard', side_effect=RuntimeError('boom')):
+                with self.assertRaisesRegex(RuntimeError, 'boom'):
+                    play_farm(self.algorithms, [3], 100, os.path.join(tmp, 'farm'), block_size=20,
+                              poll=0.02, local_workers=2)
+
+
+class TestTelemetry(unittest.TestCase):
+
+    def test_game_result_reports_turns_and_timeouts(self):
+        random.seed(0)
+        results, _ = dubito([HonestBot(1), RandomBot(2), TrustingBot(3), AlwaysDoubtBot(4)], observers=[])
+        self.assertGreater(results['turns'], 0)
+        self.assertFalse(results['timeout'])
+        cut, _ = dubito([HonestBot(1), RandomBot(2), TrustingBot(3), AlwaysDoubtBot(4)], observers=[], max_turns=5)
+        self.assertEqual((cut['turns'], cut['timeout'], cut['stalled']), (5, True, False))
+        self.assertEqual(len(cut['losers']), 4 - len(cut['winners']))
+
+    def test_stalled_games_end_early_as_timeouts(self):
+        # A lineup that passes the pile around without a discard from turn ~25 to max_turns.
+        lineup = [HonestBot, HonestBot, SuspicionBot]
+        random.seed(886)
+        full, _ = dubito([bot(i) for i, bot in enumerate(lineup, start=1)], observers=[], stall_turns=None)
+        self.assertEqual((full['turns'], full['timeout']), (1_000, True))
+        random.seed(886)
+        cut, _ = dubito([bot(i) for i, bot in enumerate(lineup, start=1)], observers=[], stall_turns=300)
+        self.assertLess(cut['turns'], 400)
+        self.assertTrue(cut['timeout'] and cut['stalled'])
+        self.assertEqual([p.id for p in cut['winners']], [p.id for p in full['winners']])
+
+    def test_snapshots_file_and_endpoint(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'telemetry.json')
+            telemetry = Telemetry(path, every=0, port=0, bin_width=50)
+            try:
+                final_infos = play_games([HonestBot, RandomBot, TrustingBot], [3, 4], 40, telemetry=telemetry)
+                with open(path) as f:
+                    snapshot = json.load(f)
+                self.assertTrue(snapshot['done'])
+                self.assertEqual(snapshot['games'], 40)
+                self.assertEqual(sum(snapshot['turns']['histogram'].values()), 40)
+                self.assertEqual(snapshot['bots'].keys(), final_infos.keys())
+                for bot, row in snapshot['bots'].items():
+                    self.assertLessEqual(row['ci'][0], row['score'])
+                    self.assertLessEqual(row['score'], row['ci'][1])
+                    self.assertEqual(row['games'], final_infos[bot].total.games)
+                with urlopen(telemetry.url + 'telemetry.json') as r:
+                    self.assertEqual(json.load(r), snapshot)
+                with urlopen(telemetry.url) as r:
+                    self.assertIn(b'telemetry.json', r.read())
+            finally:
+                telemetry.close()
+            self.assertIsNone(telemetry.url)
+
+
+class CrashingBot(HonestBot, register=False):
+    def play(self, input_player):
+        raise RuntimeError('boom')
+
+
+class CheatingBot(HonestBot, register=False):
+    def play(self, input_player):
+        if input_player.board_cards == 0:
+            return TurnOutput(doubt=True, number=None, cards=None)
+        return TurnOutput(doubt=False, number=None, cards=[0, 0, 0])    # never removed from the hand
+
+
+class SlowBot(HonestBot, register=False):
+    def play(self, input_player):
+        time.sleep(0.2)
+        return super().play(input_player)
+
+
+class SlowLoadingBot(HonestBot, register=False):
+    loaded = False
+
+    @classmethod
+    def preload(cls):
+        time.sleep(0.5)
+        cls.loaded = True
+
+    def play(self, input_player):
+        if not self.loaded:
+            raise RuntimeError('played before preload()')
+        return super().play(input_player)
+
+
+class TestSandbox(unittest.TestCase):
+
+    def _turn(self, board_cards):
+        return TurnData(
+            my_cards=[], current_number=3, board_cards=board_cards, n_cards_played=0, playing_cards=[1, 2, 3],
+            n_players=2, player_card_counts={1: 5, 2: 5}, streak=0, my_player_id=1, prev_player_id=2,
+            next_player_id=2, history=[],
+        )
+
+    def test_is_legal(self):
+        first, later = self._turn(0), self._turn(4)
+        play = TurnOutput(doubt=False, number=3, cards=[3, 3])
+        self.assertTrue(is_legal(play, first, [1, 3, 3], [1]))
+        self.assertFalse(is_legal(play, first, [1, 3, 3], [1, 3, 3]))     # cards kept in hand
+        self.assertFalse(is_legal(play, first, [1, 3], []))                # cards never held
+        self.assertFalse(is_legal(TurnOutput(doubt=False, number=14, cards=[3]), first, [3], []))
+        self.assertFalse(is_legal(TurnOutput(doubt=False, number=None, cards=[]), later, [3], [3]))
+        self.assertFalse(is_legal(TurnOutput(doubt=False, number=None, cards=[1, 1, 1, 1]), later, [1] * 4, []))
+        self.assertTrue(is_legal(TurnOutput(doubt=True, number=None, cards=None), later, [3], [3]))
+        self.assertFalse(is_legal(TurnOutput(doubt=True, number=None, cards=None), first, [3], [3]))
+        self.assertFalse(is_legal({'doubt': True}, later, [3], [3]))
+
+    def _check_faults(self, bot, fault, sandbox):
+        random.seed(0)
+        results, game_infos = dubito([bot(1), HonestBot(2), RandomBot(3)], observers=[], sandbox=sandbox)
+        faults = game_infos['sandbox']
+        self.assertGreater(faults[1][fault], 0)
+        self.assertEqual(sum(faults[1].values()), faults[1][fault])
+        for pid in (2, 3):
+            self.assertEqual(sum(faults[pid].values()), 0)
+        self.assertEqual(len(results['winners']) + len(results['losers']), 3)
+        return faults
+
+    def test_exceptions_are_replaced_by_the_fallback(self):
+        self._check_faults(CrashingBot, 'exceptions', Sandbox(deadline=None))
+
+    def test_illegal_moves_are_replaced_by_the_fallback(self):
+        self._check_faults(CheatingBot, 'illegal_moves', Sandbox(deadline=None, fallback='doubt'))
+
+    def test_slow_decisions_time_out(self):
+        self._check_faults(SlowBot, 'decision_timeouts', Sandbox(deadline=0.05, fallback='honest'))
+
+    def test_isolated_bots_play_in_workers(self):
+        sandbox = Sandbox(deadline=5, isolate={'HonestBot', 'CrashingBot'})
+        try:
+            random.seed(0)
+            trusted, _ = dubito([HonestBot(1), RandomBot(2), TrustingBot(3)], observers=[])
+            random.seed(0)
+            isolated, game_infos = dubito([HonestBot(1), RandomBot(2), TrustingBot(3)], observers=[],
+                                          sandbox=sandbox)
+            self.assertEqual([p.id for p in isolated['winners']], [p.id for p in trusted['winners']])
+            self.assertEqual(sum(sum(f.values()) for f in game_infos['sandbox'].values()), 0)
+            self._check_faults(CrashingBot, 'exceptions', sandbox)
+        finally:
+            sandbox.close()
+
+    def test_isolated_workers_preload_before_the_deadline(self):
+        sandbox = Sandbox(deadline=0.3, isolate={'SlowLoadingBot'})
+        try:
+            random.seed(0)
+            _, game_infos = dubito([SlowLoadingBot(1), HonestBot(2), RandomBot(3)], observers=[], sandbox=sandbox)
+            self.assertEqual(sum(game_infos['sandbox'][1].values()), 0)
+        finally:
+            sandbox.close()
+
+    def test_faults_reach_bot_stats(self):
+        random.seed(0)
+        final_infos = play_games([CrashingBot, HonestBot, RandomBot], [3], 10, sandbox=Sandbox(deadline=None))
+        self.assertGreater(final_infos['CrashingBot'].total.exceptions, 0)
+        self.assertEqual(final_infos['HonestBot'].total.exceptions, 0)
+
+
 if __name__ == '__main__':
     unittest.main()